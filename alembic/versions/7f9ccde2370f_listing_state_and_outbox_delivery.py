@@ -0,0 +1,73 @@
+"""listing_state_and_outbox_delivery
+
+Revision ID: 7f9ccde2370f
+Revises: a4ab2ba19a39
+Create Date: 2026-10-17 03:25:29.381125
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "7f9ccde2370f"
+down_revision: Union[str, None] = "a4ab2ba19a39"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Database.ensure_schema adds the same columns on startup, so a database
+# the bot has already run against may have some of them.
+COLUMNS = {
+    "amiibo_stock": [
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("delisted_at", sa.DateTime(), nullable=True),
+        sa.Column("first_seen_at", sa.DateTime(), nullable=True),
+    ],
+    "last_scraped": [
+        sa.Column("content_hash", sa.String(), nullable=True),
+    ],
+    "notification_outbox": [
+        sa.Column("idempotency_key", sa.String(), nullable=True),
+        sa.Column("messenger_name", sa.String(), nullable=True),
+        sa.Column("colour", sa.Integer(), nullable=True),
+        sa.Column("image", sa.String(), nullable=True),
+        sa.Column("price", sa.String(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.String(), nullable=True),
+    ],
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("notification_deliveries"):
+        op.create_table(
+            "notification_deliveries",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("idempotency_key", sa.String(), nullable=False),
+            sa.Column("website", sa.String(), nullable=False),
+            sa.Column("url", sa.String(), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("stock_status", sa.String(), nullable=False),
+            sa.Column("messenger_name", sa.String(), nullable=False),
+            sa.Column("delivery_status", sa.String(), nullable=False),
+            sa.Column("delivered_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("idempotency_key", "messenger_name"),
+        )
+    for table, columns in COLUMNS.items():
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        for column in columns:
+            if column.name not in existing:
+                op.add_column(table, column.copy())
+
+
+def downgrade() -> None:
+    for table, columns in COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in reversed(columns):
+                batch_op.drop_column(column.name)
+    op.drop_table("notification_deliveries")
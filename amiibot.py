@@ -1,16 +1,27 @@
+import argparse
 import fcntl
 import io
 import logging
 import os
+import signal
+import threading
+import time
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
+from typing import Any
 
 from config.config import load_config, redact_secrets
-from constants import LOG_FILE_NAME, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+from constants import (
+    DAEMON_INTERVAL_SECONDS,
+    LOG_FILE_NAME,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+)
 from database import Database
 from messenger.manager import MessageManager
 from result import FailureCategory, RunResult, RunStatus
 from scraper import Scraper
+from stockist.browser import close_browser_pool, configure_browser_pool
 from stockist.manager import StockistManager
 
 logs_file = Path(Path().resolve(), LOG_FILE_NAME)
@@ -64,6 +75,7 @@ _database: Database | None = None
 _messengers: MessageManager | None = None
 _lock_file: io.TextIOWrapper | None = None
 _LOCK_PATH = Path(Path().resolve(), ".amiibot.lock")
+_shutdown = threading.Event()
 
 
 def cleanup() -> None:
@@ -81,6 +93,15 @@ def cleanup() -> None:
             _LOCK_PATH.unlink(missing_ok=True)
         except Exception:
             pass
+    try:
+        close_browser_pool()
+    except Exception as e:
+        log.warning(f"Error closing browser pool: {e}")
+    if _messengers is not None:
+        try:
+            _messengers.close()
+        except Exception as e:
+            log.warning(f"Error closing messenger sessions: {e}")
     if _database is not None:
         try:
             log.info("Disposing database engine...")
@@ -90,7 +111,66 @@ def cleanup() -> None:
     log.info("Shutdown complete")
 
 
-def main() -> RunResult:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Amiibo stock checker")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="keep running and scrape on an internal schedule instead of once",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DAEMON_INTERVAL_SECONDS,
+        help="seconds between the start of each cycle in daemon mode "
+        f"(default: {DAEMON_INTERVAL_SECONDS})",
+    )
+    args = parser.parse_args(argv)
+    if args.interval <= 0:
+        parser.error("--interval must be greater than 0")
+    return args
+
+
+def _request_shutdown(signum: int, frame: Any) -> None:
+    log.info(f"Received {signal.Signals(signum).name}, stopping after this cycle")
+    _shutdown.set()
+
+
+def run_daemon(scraper: Scraper, interval: float) -> RunResult:
+    """Run scrape cycles every ``interval`` seconds until asked to stop.
+
+    The database engine, HTTP sessions and parsed configuration are reused
+    across cycles, and queued alerts are delivered by the outbox worker's
+    own thread so messengers never hold up scraping. SIGTERM lets the
+    current cycle finish, delivers what is still queued, and then returns
+    the last cycle's result so ``cleanup()`` can release resources.
+    """
+    signal.signal(signal.SIGTERM, _request_shutdown)
+    log.info(f"Running in daemon mode, cycle interval {interval}s")
+
+    result = RunResult(status=RunStatus.SUCCESS, exit_code=0)
+    cycles = 0
+    scraper.outbox.start()
+    try:
+        while not _shutdown.is_set():
+            started = time.monotonic()
+            result = scraper.scrape()
+            cycles += 1
+            elapsed = time.monotonic() - started
+            log.info(
+                f"Cycle {cycles} completed: {result.status.name} in {elapsed:.1f}s "
+                f"stockists={result.stockists_succeeded}/{result.stockists_attempted}"
+            )
+            _shutdown.wait(max(0.0, interval - elapsed))
+    finally:
+        scraper.outbox.stop()
+    scraper.outbox.drain()
+
+    log.info(f"Daemon stopped after {cycles} cycle(s)")
+    return result
+
+
+def main(daemon: bool = False, interval: float = DAEMON_INTERVAL_SECONDS) -> RunResult:
     global _lock_file
     try:
         _lock_file = open(_LOCK_PATH, "w")
@@ -107,6 +187,10 @@ def main() -> RunResult:
     config_path = Path("config", "config.json")
     config = load_config(path=config_path)
     log.info(f"{config_path} loaded")
+    configure_browser_pool(
+        size=config.scraper.browser_pool_size,
+        max_pages=config.scraper.browser_max_pages,
+    )
 
     global _database, _messengers
     _database = Database(config=config.database)
@@ -115,6 +199,9 @@ def main() -> RunResult:
     stockists = StockistManager(messengers=_messengers)
     scraper = Scraper(config=config, stockists=stockists, database=_database)
 
+    if daemon:
+        return run_daemon(scraper, interval)
+
     log.info("Starting scraper...")
     result = scraper.scrape()
     log.info(f"Scraper completed: {result.status.name}")
@@ -122,8 +209,9 @@ def main() -> RunResult:
 
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        result = main()
+        result = main(daemon=args.daemon, interval=args.interval)
     except KeyboardInterrupt:
         log.info("Interrupted by user")
         result = RunResult(
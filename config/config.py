@@ -13,6 +13,14 @@ from pydantic import (
     field_validator,
 )
 
+from constants import (
+    MESSENGER_POOL_SIZE,
+    SCRAPER_MAX_WORKERS,
+    SELENIUM_MAX_PAGES_PER_DRIVER,
+    SELENIUM_POOL_SIZE,
+    SELENIUM_STOCKIST_DEADLINE,
+)
+
 log = logging.getLogger(__name__)
 
 _SECRET_REDACT = "***"
@@ -79,6 +87,7 @@ class DiscordMessengerConfig(BaseModel, use_enum_values=True, extra="forbid"):
     messenger_type: Literal[MESSENGER.DISCORD.value]  # type: ignore
     webhook_url: str
     stockists: list[Stockist]
+    pool_size: int = Field(MESSENGER_POOL_SIZE, ge=1, le=32)
 
     @field_validator("webhook_url")
     @classmethod
@@ -125,6 +134,7 @@ class TelegramMessengerConfig(BaseModel, use_enum_values=True, extra="forbid"):
     bot_token: str
     chat_id: str
     stockists: list[Stockist]
+    pool_size: int = Field(MESSENGER_POOL_SIZE, ge=1, le=32)
 
     @field_validator("bot_token")
     @classmethod
@@ -158,8 +168,23 @@ class TelegramMessengerConfig(BaseModel, use_enum_values=True, extra="forbid"):
             self.chat_id = env_chat
 
 
+class StockistScheduleConfig(BaseModel, extra="forbid"):
+    poll_interval: Optional[int] = Field(None, ge=0)
+    priority: Optional[int] = None
+
+
+class ScraperConfig(BaseModel, use_enum_values=True, extra="forbid"):
+    max_workers: int = Field(SCRAPER_MAX_WORKERS, ge=1, le=32)
+    browser_pool_size: int = Field(SELENIUM_POOL_SIZE, ge=1, le=8)
+    browser_max_pages: int = Field(SELENIUM_MAX_PAGES_PER_DRIVER, ge=1)
+    stockist_deadline: float = Field(SELENIUM_STOCKIST_DEADLINE, gt=0)
+    conditional_requests: bool = True
+    stockists: dict[Stockist, StockistScheduleConfig] = Field(default_factory=dict)
+
+
 class Config(BaseModel, use_enum_values=True, extra="forbid"):
     database: DatabaseConfig
+    scraper: ScraperConfig = Field(default_factory=ScraperConfig)
     messengers: dict[
         str,
         Annotated[
@@ -11,14 +11,39 @@ Centralized configuration for magic numbers, timeouts, colors, and other constan
 REQUEST_TIMEOUT = 5
 """Default timeout for HTTP requests."""
 
+HTTP_POOL_CONNECTIONS = 16
+"""Number of per-host connection pools kept by the shared scraping session."""
+
+HTTP_POOL_MAXSIZE = 8
+"""Maximum keep-alive connections held open to a single host."""
+
+HTTP_ASYNC_MAX_CONNECTIONS = 100
+"""Maximum open connections across all hosts for the asyncio fetch client."""
+
 SELENIUM_WAIT_TIME = 5
 """Time to wait for JavaScript rendering in Selenium."""
 
 SELENIUM_WAIT_MAX = 20
 """Maximum wait time for Selenium WebDriver operations (page load, script, element wait)."""
 
+STREAM_CHUNK_SIZE = 64 * 1024  # 64KB
+"""Bytes read from the socket at a time when a listing page is streamed."""
+
+HTTP_CACHE_DIR = ".http_cache"
+"""Directory holding ETag/Last-Modified validators and bodies between runs."""
+
+SELENIUM_POOL_SIZE = 2
+"""Default number of headless browsers kept warm for Selenium fallbacks."""
+
+SELENIUM_MAX_PAGES_PER_DRIVER = 50
+"""Page loads a pooled browser serves before it is quit and replaced."""
+
 SELENIUM_STOCKIST_DEADLINE = 60
-"""Per-stockist total deadline in seconds for Selenium-based scrapes."""
+"""Default wall-clock budget in seconds for scraping one stockist, covering
+   retries, pagination and Selenium fallbacks."""
+
+DAEMON_INTERVAL_SECONDS = 60
+"""Default time between the start of consecutive cycles in --daemon mode."""
 
 # ============================================================================
 # LOGGING SETTINGS
@@ -37,8 +62,65 @@ LOG_BACKUP_COUNT = 5
 # MESSAGE SENDING SETTINGS
 # ============================================================================
 
-MESSAGE_SEND_DELAY = 0.5
-"""Delay between sending messages (in seconds) to avoid rate limiting."""
+DISCORD_RATE_LIMIT = 5
+"""Requests a Discord webhook is assumed to accept per period until its X-RateLimit headers say otherwise."""
+
+DISCORD_RATE_LIMIT_PERIOD = 2.0
+"""Seconds over which ``DISCORD_RATE_LIMIT`` requests are spread."""
+
+TELEGRAM_CHAT_RATE_LIMIT = 1
+"""Messages per ``TELEGRAM_CHAT_RATE_LIMIT_PERIOD`` a bot may send to one private chat."""
+
+TELEGRAM_CHAT_RATE_LIMIT_PERIOD = 1.0
+"""Seconds over which ``TELEGRAM_CHAT_RATE_LIMIT`` messages are spread."""
+
+TELEGRAM_GROUP_RATE_LIMIT = 20
+"""Messages per ``TELEGRAM_GROUP_RATE_LIMIT_PERIOD`` a bot may send to one group or channel."""
+
+TELEGRAM_GROUP_RATE_LIMIT_PERIOD = 60.0
+"""Seconds over which ``TELEGRAM_GROUP_RATE_LIMIT`` messages are spread."""
+
+TELEGRAM_BOT_RATE_LIMIT = 30
+"""Messages per second one Telegram bot may send across all of its chats."""
+
+MESSENGER_POOL_SIZE = 4
+"""Keep-alive connections each messenger holds open to its API."""
+
+DISCORD_MAX_EMBEDS = 10
+"""Most embeds Discord accepts in a single webhook message."""
+
+DISCORD_MAX_EMBED_CHARACTERS = 6000
+"""Most characters Discord accepts across all embeds of a single message."""
+
+TELEGRAM_MAX_ITEMS = 10
+"""Most products grouped into a single Telegram stock alert."""
+
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+"""Longest text Telegram accepts in a single message."""
+
+TELEGRAM_MAX_CAPTION_LENGTH = 1024
+"""Longest caption Telegram accepts on a photo."""
+
+OUTBOX_POLL_INTERVAL = 5.0
+"""Seconds the background outbox worker waits for new alerts before polling again."""
+
+OUTBOX_BATCH_SIZE = 500
+"""Most queued notifications claimed by a single outbox drain."""
+
+OUTBOX_MAX_ATTEMPTS = 8
+"""Delivery attempts for a queued notification before it is recorded as failed."""
+
+OUTBOX_RETRY_BASE_DELAY = 2.0
+"""Seconds before the first redelivery of a transient failure; doubled per attempt."""
+
+OUTBOX_RETRY_MAX_DELAY = 300.0
+"""Longest backoff (in seconds) between redeliveries, unless Retry-After asks for more."""
+
+OUTBOX_MAX_AGE_MINUTES = 30
+"""Minutes after which a queued alert is too stale to redeliver and is recorded as failed."""
+
+OUTBOX_FLUSH_TIMEOUT = 60.0
+"""Seconds a one-shot run keeps redelivering transient failures before exiting."""
 
 # ============================================================================
 # STOCK STATUS COLORS (Discord embed colors)
@@ -63,6 +145,9 @@ COLOR_DEFAULT = 0x0000FF
 # SCRAPER SETTINGS
 # ============================================================================
 
+PAGINATION_WINDOW = 4
+"""Number of listing pages a paginated stockist fetches concurrently."""
+
 MAX_RETRY_ATTEMPTS = 3
 """Maximum number of retry attempts for scraping operations."""
 
@@ -87,6 +172,23 @@ CONSECUTIVE_UNHEALTHY_THRESHOLD = 2
 NOTIFICATION_COOLDOWN_MINUTES = 60
 """Minimum minutes between sending the same notification for an item with the same status."""
 
+SCRAPER_MAX_WORKERS = 4
+"""Default number of stockists fetched and parsed concurrently in one cycle.
+   Database reconciliation and notifications still run one stockist at a time."""
+
+STOCKIST_POLL_INTERVAL = 300
+"""Default seconds between scrapes of the same stockist."""
+
+FAST_STOCKIST_POLL_INTERVAL = 60
+"""Poll interval for stockists served by a cheap JSON API."""
+
+SLOW_STOCKIST_POLL_INTERVAL = 3600
+"""Poll interval for stockists that always need a Selenium browser."""
+
+POLL_INTERVAL_TOLERANCE = 0.1
+"""Fraction of a poll interval a stockist may be scraped early, so cron or
+   daemon jitter does not push it back a whole cycle."""
+
 # ============================================================================
 # DATABASE SETTINGS
 # ============================================================================
@@ -97,6 +199,9 @@ DB_POOL_SIZE = 10
 DB_MAX_OVERFLOW = 20
 """Maximum overflow connections for database."""
 
+DB_BULK_CHUNK_SIZE = 500
+"""Maximum number of keys bound into a single IN (...) clause by bulk queries."""
+
 # ============================================================================
 # PARSING SETTINGS
 # ============================================================================
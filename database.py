@@ -2,7 +2,7 @@ import hashlib
 import logging
 import re
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Sequence
 
 import sqlalchemy as db
 from sqlalchemy import UniqueConstraint
@@ -10,16 +10,34 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
 
 from config.config import DatabaseConfig as Database_
 from constants import (
+    CONSECUTIVE_UNHEALTHY_THRESHOLD,
+    DB_BULK_CHUNK_SIZE,
     DB_MAX_OVERFLOW,
     DB_POOL_SIZE,
     NOTIFICATION_COOLDOWN_MINUTES,
+    OUTBOX_BATCH_SIZE,
     SCRAPING_FAILURE_GRACE_PERIOD,
+    STOCKIST_HEALTH_RATIO,
 )
-from result import DeliveryStatus
+from models import Product
+from result import DeliveryResult, DeliveryStatus, StockistHealth
 from stockist.stockist import Stock
+from utils import batch_items
 
 log = logging.getLogger(__name__)
 
+_OUTBOX_COLUMNS = {
+    "idempotency_key": "VARCHAR",
+    "messenger_name": "VARCHAR",
+    "colour": "INTEGER",
+    "image": "VARCHAR",
+    "price": "VARCHAR",
+    "attempts": "INTEGER DEFAULT 0",
+    "next_attempt_at": "TIMESTAMP",
+    "last_error": "VARCHAR",
+}
+"""Columns added to ``notification_outbox`` after its first release."""
+
 
 class Base(DeclarativeBase):
     pass
@@ -47,15 +65,36 @@ class AmiiboStock(Base):
 
 
 class NotificationOutbox(Base):
+    """A stock alert waiting to be delivered to one messenger."""
+
     __tablename__ = "notification_outbox"
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    idempotency_key: Mapped[str | None] = mapped_column(nullable=True)
+    messenger_name: Mapped[str | None] = mapped_column(nullable=True)
     website: Mapped[str]
     url: Mapped[str]
     title: Mapped[str]
     stock_status: Mapped[str]
+    colour: Mapped[int | None] = mapped_column(nullable=True)
+    image: Mapped[str | None] = mapped_column(nullable=True)
+    price: Mapped[str | None] = mapped_column(nullable=True)
+    attempts: Mapped[int] = mapped_column(default=0)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    last_error: Mapped[str | None] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
 
+    def to_product(self) -> Product:
+        return Product(
+            colour=self.colour or 0,
+            title=self.title,
+            image=self.image or "",
+            url=self.url,
+            price=self.price or "",
+            stock=self.stock_status,
+            website=self.website,
+        )
+
 
 class NotificationDelivery(Base):
     __tablename__ = "notification_deliveries"
@@ -80,6 +119,7 @@ class LastScraped(Base):
     last_success_at: Mapped[datetime | None] = mapped_column(nullable=True)
     last_healthy_count: Mapped[int] = mapped_column(default=0)
     consecutive_unhealthy_obs: Mapped[int] = mapped_column(default=0)
+    content_hash: Mapped[str | None] = mapped_column(nullable=True)
 
 
 class ScrapingFailure(Base):
@@ -208,6 +248,21 @@ class Database:
                             "ALTER TABLE last_scraped ADD COLUMN consecutive_unhealthy_obs INTEGER DEFAULT 0"
                         )
                     )
+                if "content_hash" not in scraped_cols:
+                    conn.execute(
+                        db.text(
+                            "ALTER TABLE last_scraped ADD COLUMN content_hash VARCHAR"
+                        )
+                    )
+                result = conn.execute(db.text("PRAGMA table_info(notification_outbox)"))
+                outbox_cols = [row[1] for row in result]
+                for column, ddl in _OUTBOX_COLUMNS.items():
+                    if column not in outbox_cols:
+                        conn.execute(
+                            db.text(
+                                f"ALTER TABLE notification_outbox ADD COLUMN {column} {ddl}"
+                            )
+                        )
                 conn.commit()
         elif self._engine_type == "postgres":
             with self.engine.connect() as conn:
@@ -297,6 +352,25 @@ class Database:
                             "ALTER TABLE last_scraped ADD COLUMN consecutive_unhealthy_obs INTEGER DEFAULT 0"
                         )
                     )
+                if "content_hash" not in scraped_cols:
+                    conn.execute(
+                        db.text(
+                            "ALTER TABLE last_scraped ADD COLUMN content_hash VARCHAR"
+                        )
+                    )
+                result = conn.execute(
+                    db.text(
+                        "SELECT column_name FROM information_schema.columns WHERE table_name = 'notification_outbox'"
+                    )
+                )
+                outbox_cols = [row[0] for row in result]
+                for column, ddl in _OUTBOX_COLUMNS.items():
+                    if column not in outbox_cols:
+                        conn.execute(
+                            db.text(
+                                f"ALTER TABLE notification_outbox ADD COLUMN {column} {ddl}"
+                            )
+                        )
                 conn.commit()
 
     def remove_currency(self, currency_string: str) -> float:
@@ -493,6 +567,171 @@ class Database:
                 return 0
             return record.last_healthy_count
 
+    def get_last_attempts(self) -> dict[str, datetime]:
+        """Return when each stockist was last scraped, successful or not.
+
+        Returns:
+            Mapping of stockist name to ``LastScraped.last_attempt_at``
+        """
+        with self.Session() as session:
+            rows = session.execute(
+                db.select(LastScraped.stockist, LastScraped.last_attempt_at)
+            )
+            return {stockist: attempted for stockist, attempted in rows}
+
+    def record_stockist_outcome(
+        self, stockist: str, item_count: int | None
+    ) -> StockistHealth:
+        """Record the result of scraping a stockist in a single transaction.
+
+        Combines ``record_scrape_attempt``, ``record_scraping_failure`` or
+        ``record_scraping_success`` and the healthy/unhealthy baseline
+        bookkeeping, reading and updating the ``LastScraped`` and
+        ``ScrapingFailure`` rows once.
+
+        Args:
+            stockist: Name of the stockist
+            item_count: Number of valid items scraped, or None/0 on failure
+
+        Returns:
+            The failure count and health decision for this scrape
+        """
+        now = datetime.now()
+        with self.Session() as session:
+            scraped = session.get(LastScraped, stockist)
+            if scraped is None:
+                scraped = LastScraped(
+                    stockist=stockist,
+                    last_healthy_count=0,
+                    consecutive_unhealthy_obs=0,
+                )
+                session.add(scraped)
+            scraped.last_attempt_at = now
+
+            failure = session.get(ScrapingFailure, stockist)
+            health = StockistHealth(baseline_count=scraped.last_healthy_count)
+
+            if not item_count:
+                if failure is None:
+                    failure = ScrapingFailure(
+                        stockist=stockist,
+                        consecutive_failures=0,
+                        last_success=None,
+                    )
+                    session.add(failure)
+                failure.consecutive_failures += 1
+                failure.last_failure = now
+                health.consecutive_failures = failure.consecutive_failures
+                session.commit()
+                log.warning(
+                    f"{stockist} has {health.consecutive_failures} consecutive scraping failure(s)"
+                )
+                return health
+
+            if failure is not None:
+                if failure.consecutive_failures > 0:
+                    log.info(
+                        f"{stockist} scraping recovered after {failure.consecutive_failures} failure(s)"
+                    )
+                failure.consecutive_failures = 0
+                failure.last_success = now
+
+            baseline = scraped.last_healthy_count
+            if baseline > 0 and item_count / baseline < STOCKIST_HEALTH_RATIO:
+                scraped.consecutive_unhealthy_obs += 1
+                health.unhealthy_obs = scraped.consecutive_unhealthy_obs
+                health.skip_delisting = (
+                    health.unhealthy_obs < CONSECUTIVE_UNHEALTHY_THRESHOLD
+                )
+
+            if not health.skip_delisting:
+                scraped.last_success_at = now
+                scraped.last_healthy_count = item_count
+                scraped.consecutive_unhealthy_obs = 0
+
+            session.commit()
+        return health
+
+    def record_stockist_heartbeat(self, stockist: str) -> None:
+        """Record a successful scrape whose listing matched the last one.
+
+        The ``LastScraped`` timestamps move and any failure streak from
+        scrapes in between is cleared; the healthy baseline is unchanged.
+
+        Args:
+            stockist: Name of the stockist
+        """
+        now = datetime.now()
+        with self.Session() as session:
+            scraped = session.get(LastScraped, stockist)
+            if scraped is None:
+                scraped = LastScraped(stockist=stockist, last_healthy_count=0)
+                session.add(scraped)
+            scraped.last_attempt_at = now
+            scraped.last_success_at = now
+
+            failure = session.get(ScrapingFailure, stockist)
+            if failure is not None and failure.consecutive_failures > 0:
+                log.info(
+                    f"{stockist} scraping recovered after {failure.consecutive_failures} failure(s)"
+                )
+                failure.consecutive_failures = 0
+                failure.last_success = now
+            session.commit()
+
+    def get_content_hashes(self) -> dict[str, str]:
+        """Return the listing hash stored for each stockist.
+
+        Returns:
+            Mapping of stockist name to the hash of its last reconciled listing
+        """
+        with self.Session() as session:
+            rows = session.execute(
+                db.select(LastScraped.stockist, LastScraped.content_hash).where(
+                    LastScraped.content_hash.is_not(None)
+                )
+            )
+            return {stockist: content_hash for stockist, content_hash in rows}
+
+    def record_content_hash(self, stockist: str, content_hash: str | None) -> None:
+        """Store, or clear, the hash of the listing just reconciled.
+
+        Args:
+            stockist: Name of the stockist
+            content_hash: Hash from ``models.listing_hash``, or None when the
+                database does not yet fully reflect the listing
+        """
+        with self.Session() as session:
+            session.execute(
+                db.update(LastScraped)
+                .where(LastScraped.stockist == stockist)
+                .values(content_hash=content_hash)
+            )
+            session.commit()
+
+    def has_pending_misses(self, website: str) -> bool:
+        """Check whether any active item is part way through the delisting grace period.
+
+        Args:
+            website: Website name
+
+        Returns:
+            True if an active item has been missed at least once
+        """
+        with self.Session() as session:
+            return (
+                session.execute(
+                    db.select(AmiiboStock.id)
+                    .where(
+                        AmiiboStock.Website == website,
+                        AmiiboStock.is_active.is_(True),
+                        AmiiboStock.missed_count > 0,
+                    )
+                    .limit(1)
+                ).first()
+                is not None
+            )
+
     def should_suppress_notification(self, url: str, website: str, stock: str) -> bool:
         """Check if a notification should be suppressed due to cooldown.
 
@@ -572,6 +811,364 @@ class Database:
             )
             return delivery is not None
 
+    @staticmethod
+    def _suppressed_keys(
+        session: Any, items: list[tuple[str, str, str]]
+    ) -> set[tuple[str, str, str]]:
+        wanted = set(items)
+        websites = {website for _, website, _ in items}
+        urls = sorted({url for url, _, _ in items})
+        cutoff = datetime.now() - timedelta(minutes=NOTIFICATION_COOLDOWN_MINUTES)
+        suppressed: set[tuple[str, str, str]] = set()
+
+        for chunk in batch_items(urls, DB_BULK_CHUNK_SIZE):
+            rows = session.execute(
+                db.select(
+                    AmiiboStock.URL,
+                    AmiiboStock.Website,
+                    AmiiboStock.last_notified_status,
+                ).where(
+                    AmiiboStock.Website.in_(websites),
+                    AmiiboStock.URL.in_(chunk),
+                    AmiiboStock.last_notified_at > cutoff,
+                )
+            )
+            for url, website, status in rows:
+                if (url, website, status) in wanted:
+                    suppressed.add((url, website, status))
+        return suppressed
+
+    @staticmethod
+    def _mark_notified(session: Any, items: list[tuple[str, str, str]]) -> None:
+        now = datetime.now()
+        table = AmiiboStock.__table__
+        stmt = (
+            db.update(table)
+            .where(
+                table.c.URL == db.bindparam("b_url"),
+                table.c.Website == db.bindparam("b_website"),
+            )
+            .values(
+                last_notified_at=db.bindparam("b_notified_at"),
+                last_notified_status=db.bindparam("b_status"),
+            )
+        )
+        session.connection().execute(
+            stmt,
+            [
+                {
+                    "b_url": url,
+                    "b_website": website,
+                    "b_status": stock,
+                    "b_notified_at": now,
+                }
+                for url, website, stock in items
+            ],
+        )
+
+    @staticmethod
+    def _matching_pairs(
+        session: Any, pairs: list[tuple[str, str]], model: Any, *criteria: Any
+    ) -> set[tuple[str, str]]:
+        """Return the (idempotency_key, messenger_name) pairs found in ``model``."""
+        wanted = set(pairs)
+        messenger_names = {name for _, name in pairs}
+        keys = sorted({key for key, _ in pairs})
+        found: set[tuple[str, str]] = set()
+
+        for chunk in batch_items(keys, DB_BULK_CHUNK_SIZE):
+            rows = session.execute(
+                db.select(model.idempotency_key, model.messenger_name).where(
+                    model.idempotency_key.in_(chunk),
+                    model.messenger_name.in_(messenger_names),
+                    *criteria,
+                )
+            )
+            for key, name in rows:
+                if (key, name) in wanted:
+                    found.add((key, name))
+        return found
+
+    def _enqueue_notifications(
+        self, session: Any, products: list[Product], messenger_names: Sequence[str]
+    ) -> int:
+        """Queue one outbox row per product and messenger inside ``session``.
+
+        Products still in cooldown are skipped, as are pairs that were
+        already delivered or are already waiting in the outbox. The queued
+        products are marked as notified in the same transaction.
+
+        Args:
+            session: Open session holding the stock diff
+            products: Changes found by ``check_then_add_or_update_amiibo``
+            messenger_names: Messengers assigned to the stockist
+
+        Returns:
+            Number of outbox rows queued
+        """
+        keys = [(p.url, p.website or "", p.stock) for p in products]
+        suppressed_keys = self._suppressed_keys(session, keys)
+        pending: list[tuple[Product, tuple[str, str, str], str]] = []
+        for product, key in zip(products, keys):
+            if key in suppressed_keys:
+                log.info(f"Skipping notification for {product.title} (cooldown)")
+                continue
+            pending.append((product, key, self.build_idempotency_key(*key)))
+        if len(pending) < len(products):
+            log.info(
+                f"Suppressed {len(products) - len(pending)} notification(s) "
+                f"(cooldown)"
+            )
+        if not pending:
+            return 0
+
+        pairs = [(ikey, name) for _, _, ikey in pending for name in messenger_names]
+        skip = self._matching_pairs(
+            session,
+            pairs,
+            NotificationDelivery,
+            NotificationDelivery.delivery_status == DeliveryStatus.SUCCESS.value,
+        )
+        skip |= self._matching_pairs(session, pairs, NotificationOutbox)
+
+        now = datetime.now()
+        rows = [
+            {
+                "idempotency_key": ikey,
+                "messenger_name": name,
+                "website": product.website,
+                "url": product.url,
+                "title": product.title,
+                "stock_status": product.stock,
+                "colour": product.colour,
+                "image": product.image,
+                "price": product.price,
+                "attempts": 0,
+                "created_at": now,
+            }
+            for product, _, ikey in pending
+            for name in messenger_names
+            if (ikey, name) not in skip
+        ]
+        if rows:
+            session.execute(db.insert(NotificationOutbox), rows)
+        self._mark_notified(session, [key for _, key, _ in pending])
+        return len(rows)
+
+    def get_outbox(
+        self, messenger_names: Sequence[str], limit: int = OUTBOX_BATCH_SIZE
+    ) -> list[NotificationOutbox]:
+        """Return queued notifications for ``messenger_names`` that are due.
+
+        Rows waiting out a retry backoff are left until their
+        ``next_attempt_at`` has passed.
+
+        Args:
+            messenger_names: Messengers the caller can deliver to
+            limit: Maximum number of rows returned
+
+        Returns:
+            Detached outbox rows, oldest first
+        """
+        if not messenger_names:
+            return []
+
+        with self.Session() as session:
+            return list(
+                session.scalars(
+                    db.select(NotificationOutbox)
+                    .where(
+                        NotificationOutbox.messenger_name.in_(messenger_names),
+                        db.or_(
+                            NotificationOutbox.next_attempt_at.is_(None),
+                            NotificationOutbox.next_attempt_at <= datetime.now(),
+                        ),
+                    )
+                    .order_by(NotificationOutbox.id)
+                    .limit(limit)
+                )
+            )
+
+    def get_next_outbox_attempt(
+        self, messenger_names: Sequence[str]
+    ) -> datetime | None:
+        """Return when the next queued notification becomes due.
+
+        Args:
+            messenger_names: Messengers the caller can deliver to
+
+        Returns:
+            The earliest retry time, now for rows due immediately, or None
+            when nothing is queued
+        """
+        if not messenger_names:
+            return None
+
+        with self.Session() as session:
+            pending, earliest = session.execute(
+                db.select(
+                    db.func.count(NotificationOutbox.id),
+                    db.func.min(
+                        db.func.coalesce(
+                            NotificationOutbox.next_attempt_at,
+                            NotificationOutbox.created_at,
+                        )
+                    ),
+                ).where(NotificationOutbox.messenger_name.in_(messenger_names))
+            ).one()
+        if not pending:
+            return None
+        return earliest
+
+    def discard_orphaned_outbox(self, messenger_names: Sequence[str]) -> int:
+        """Drop queued notifications no configured messenger can deliver.
+
+        Rows for a messenger that has since been removed from the config,
+        or queued before rows named their messenger, would otherwise stay
+        in the outbox forever.
+
+        Args:
+            messenger_names: Messengers that are still configured
+
+        Returns:
+            Number of rows removed
+        """
+        with self.Session() as session:
+            deleted = session.execute(
+                db.delete(NotificationOutbox).where(
+                    db.or_(
+                        NotificationOutbox.messenger_name.is_(None),
+                        NotificationOutbox.messenger_name.not_in(messenger_names),
+                    )
+                )
+            ).rowcount
+            session.commit()
+
+        if deleted:
+            log.warning(
+                f"Discarded {deleted} queued notification(s) for messengers "
+                "that are no longer configured"
+            )
+        return deleted
+
+    def settle_outbox(
+        self,
+        results: list[tuple[NotificationOutbox, DeliveryResult, datetime | None]],
+    ) -> None:
+        """Record the outcome of delivering queued notifications.
+
+        A row with a retry time stays queued until then with its attempt
+        count raised and its error kept. Every other row is final: its
+        outcome is written to ``notification_deliveries`` and it leaves the
+        outbox.
+
+        Args:
+            results: Outbox rows with their delivery result and retry time
+        """
+        if not results:
+            return
+
+        settled: list[tuple[NotificationOutbox, DeliveryStatus]] = []
+        retried: list[dict[str, Any]] = []
+        for entry, result, retry_at in results:
+            if retry_at is None:
+                settled.append((entry, result.status))
+                continue
+            retried.append(
+                {
+                    "b_id": entry.id,
+                    "attempts": entry.attempts + 1,
+                    "next_attempt_at": retry_at,
+                    "last_error": result.diagnostic
+                    or (f"HTTP {result.http_status}" if result.http_status else None),
+                }
+            )
+
+        outbox = NotificationOutbox.__table__
+        with self.Session() as session:
+            try:
+                if retried:
+                    session.execute(
+                        db.update(outbox)
+                        .where(outbox.c.id == db.bindparam("b_id"))
+                        .values(
+                            attempts=db.bindparam("attempts"),
+                            next_attempt_at=db.bindparam("next_attempt_at"),
+                            last_error=db.bindparam("last_error"),
+                        ),
+                        retried,
+                    )
+                if settled:
+                    self._store_deliveries(session, settled)
+                    for chunk in batch_items(
+                        [entry.id for entry, _ in settled], DB_BULK_CHUNK_SIZE
+                    ):
+                        session.execute(db.delete(outbox).where(outbox.c.id.in_(chunk)))
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+    @staticmethod
+    def _store_deliveries(
+        session: Any, settled: list[tuple[NotificationOutbox, DeliveryStatus]]
+    ) -> None:
+        """Upsert one delivery row per settled outbox row.
+
+        An earlier failure for the same pair is overwritten so a later
+        success is what ``_enqueue_notifications`` sees.
+        """
+        existing: dict[tuple[str, str], int] = {}
+        keys = sorted({entry.idempotency_key or "" for entry, _ in settled})
+        for chunk in batch_items(keys, DB_BULK_CHUNK_SIZE):
+            for row_id, key, name in session.execute(
+                db.select(
+                    NotificationDelivery.id,
+                    NotificationDelivery.idempotency_key,
+                    NotificationDelivery.messenger_name,
+                ).where(NotificationDelivery.idempotency_key.in_(chunk))
+            ):
+                existing[(key, name)] = row_id
+
+        now = datetime.now()
+        inserts: dict[tuple[str, str], dict[str, Any]] = {}
+        updates: list[dict[str, Any]] = []
+        for entry, status in settled:
+            pair = (entry.idempotency_key or "", entry.messenger_name or "")
+            if pair in existing:
+                updates.append(
+                    {
+                        "b_id": existing[pair],
+                        "delivery_status": status.value,
+                        "delivered_at": now,
+                    }
+                )
+                continue
+            inserts[pair] = {
+                "idempotency_key": pair[0],
+                "website": entry.website,
+                "url": entry.url,
+                "title": entry.title,
+                "stock_status": entry.stock_status,
+                "messenger_name": pair[1],
+                "delivery_status": status.value,
+                "delivered_at": now,
+            }
+
+        if inserts:
+            session.execute(db.insert(NotificationDelivery), list(inserts.values()))
+        if updates:
+            table = NotificationDelivery.__table__
+            session.execute(
+                db.update(table)
+                .where(table.c.id == db.bindparam("b_id"))
+                .values(
+                    delivery_status=db.bindparam("delivery_status"),
+                    delivered_at=db.bindparam("delivered_at"),
+                ),
+                updates,
+            )
+
     @staticmethod
     def build_idempotency_key(url: str, website: str, stock_status: str) -> str:
         raw = f"{website}:{url}:{stock_status}"
@@ -582,122 +1179,158 @@ class Database:
         with self.Session() as session:
             return session.query(AmiiboStock).filter_by(Website=website).all()
 
-    def _handle_price_change(
-        self, session: Any, item: AmiiboStock, new_price: str
-    ) -> dict[str, Any]:
-        log.info(f"Price changed for {item.Title} from {item.Price} to {new_price}")
-        item.Price = new_price
-        return {
-            "Colour": 0xFFFFFF,
-            "Title": item.Title,
-            "Image": item.Image,
-            "URL": item.URL,
-            "Price": new_price,
-            "Stock": Stock.PRICE_CHANGE.value,
-            "Website": item.Website,
-        }
+    def _upsert_statement(self) -> Any:
+        """Build the engine-specific INSERT ... ON CONFLICT for scraped rows.
 
-    def _handle_delisted_item(self, session: Any, item: AmiiboStock) -> dict[str, Any]:
-        log.info(f"{item.Title} is no longer listed")
-        item.is_active = False
-        item.delisted_at = datetime.now()
-        return {
-            "Colour": 0xFF0000,
-            "Title": item.Title,
-            "Image": item.Image,
-            "URL": item.URL,
-            "Price": item.Price,
-            "Stock": Stock.DELISTED.value,
-            "Website": item.Website,
-        }
-
-    def _add_new_items(
-        self, session: Any, new_items: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
-        added = []
-        for datum in new_items:
-            log.info(f"Adding {datum['Title']}")
-            amiibo = AmiiboStock(
-                Website=datum["Website"],
-                Title=datum["Title"],
-                Price=datum["Price"],
-                Stock=datum["Stock"],
-                Colour=datum["Colour"],
-                URL=datum["URL"],
-                Image=datum["Image"],
-                timestamp=datetime.now(),
-                is_active=True,
-                first_seen_at=datetime.now(),
-            )
-            session.add(amiibo)
-            added.append(datum)
-        return added
+        Existing rows are only touched when they may have changed, and each
+        touched row is returned as it was before the price is compared: the
+        conflict update reactivates the listing but leaves ``Price`` alone,
+        since a price only counts as changed once the currency-aware check in
+        Python agrees. ``first_seen_at`` is only written on insert, so it
+        tells new rows apart from updated ones.
+        """
+        if self._engine_type == "postgres":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        table = AmiiboStock.__table__
+        stmt = insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.Website, table.c.URL],
+            set_={
+                "missed_count": 0,
+                "is_active": True,
+                "delisted_at": None,
+            },
+            where=db.or_(
+                table.c.Price != stmt.excluded.Price,
+                table.c.missed_count != 0,
+                table.c.is_active == db.false(),
+            ),
+        ).returning(
+            table.c.id,
+            table.c.URL,
+            table.c.Title,
+            table.c.Image,
+            table.c.Price,
+            table.c.first_seen_at,
+        )
 
     def check_then_add_or_update_amiibo(
-        self, data: list[dict[str, Any]], skip_delisting: bool = False
-    ) -> list[dict[str, Any]]:
+        self,
+        data: Sequence[Product | dict[str, Any]],
+        skip_delisting: bool = False,
+        notify: Sequence[str] = (),
+    ) -> list[Product]:
+        """Reconcile one stockist's listing with the stored stock.
+
+        The diff comes back from the writes themselves: the upsert returns
+        only new or possibly changed rows and the missed-count update returns
+        only the listings that were not scraped, so unchanged rows are never
+        read. With ``notify``, alerts for the returned changes are queued in
+        the notification outbox for those messengers within the same
+        transaction, so a crash can lose neither the diff nor its alerts.
+
+        Args:
+            data: Validated products from a single website
+            skip_delisting: Leave unseen listings untouched
+            notify: Names of the messengers to alert
+
+        Returns:
+            Products that are new, changed price or were delisted
+        """
         if not data:
             return []
 
+        products = [Product.coerce(datum) for datum in data]
         statistics = {"New": 0, "Updated": 0, "Deleted": 0}
-        output: list[dict[str, Any]] = []
-        website = data[0]["Website"]
+        output: list[Product] = []
+        website = products[0].website
+        now = datetime.now()
+        table = AmiiboStock.__table__
+
+        scraped: dict[str, Product] = {}
+        for product in products:
+            scraped.setdefault(product.url, product)
+        upserts = [
+            {
+                "Website": product.website,
+                "Title": product.title,
+                "Price": product.price,
+                "Stock": product.stock,
+                "Colour": product.colour,
+                "URL": product.url,
+                "Image": product.image,
+                "timestamp": now,
+                "missed_count": 0,
+                "is_active": True,
+                "first_seen_at": now,
+            }
+            for product in scraped.values()
+        ]
 
         with self.Session() as session:
             try:
-                existing_items = (
-                    session.query(AmiiboStock).filter_by(Website=website).all()
-                )
-
-                if not existing_items:
-                    added = self._add_new_items(session, data)
-                    statistics["New"] = len(added)
-                    log.info(f"New items saved: {statistics['New']}")
-                    session.commit()
-                    return added
+                upsert = self._upsert_statement()
+                touched: dict[str, Any] = {}
+                for batch in batch_items(upserts, DB_BULK_CHUNK_SIZE):
+                    touched.update(
+                        (row.URL, row) for row in session.execute(upsert, batch)
+                    )
 
-                existing_map = {
-                    item.URL: (item.id, item.Price, item.Title, item.Image)
-                    for item in existing_items
-                }
-                new_data_map = {datum["URL"]: datum for datum in data}
-
-                for item in existing_items:
-                    if item.URL in new_data_map:
-                        new_datum = new_data_map[item.URL]
-                        item.missed_count = 0
-                        if not item.is_active:
-                            log.info(f"{item.Title} has returned to stock")
-                            item.is_active = True
-                            item.delisted_at = None
-                        if self.remove_currency(
-                            new_datum["Price"]
-                        ) != self.remove_currency(item.Price):
-                            statistics["Updated"] += 1
-                            output.append(
-                                self._handle_price_change(
-                                    session, item, new_datum["Price"]
-                                )
-                            )
-                    elif skip_delisting:
-                        log.debug(
-                            f"Skipping delisting check for {item.Title} (health check active)"
-                        )
-                    else:
-                        item.missed_count += 1
+                new_items: list[Product] = []
+                price_updates: list[dict[str, Any]] = []
+                for url, product in scraped.items():
+                    row = touched.get(url)
+                    if row is None:
+                        continue
+                    if row.first_seen_at == now:
+                        log.info(f"Adding {product.title}")
+                        statistics["New"] += 1
+                        new_items.append(product)
+                    elif self.remove_currency(product.price) != self.remove_currency(
+                        row.Price
+                    ):
                         log.info(
-                            f"{item.Title} missed {item.missed_count} time(s) "
-                            f"(grace: {SCRAPING_FAILURE_GRACE_PERIOD})"
+                            f"Price changed for {row.Title} from {row.Price} to {product.price}"
                         )
-                        if item.missed_count >= SCRAPING_FAILURE_GRACE_PERIOD:
-                            statistics["Deleted"] += 1
-                            output.append(self._handle_delisted_item(session, item))
+                        statistics["Updated"] += 1
+                        price_updates.append({"b_id": row.id, "b_price": product.price})
+                        output.append(
+                            Product(
+                                colour=0xFFFFFF,
+                                title=row.Title,
+                                image=row.Image,
+                                url=row.URL,
+                                price=product.price,
+                                stock=Stock.PRICE_CHANGE.value,
+                                website=website,
+                            )
+                        )
+                    elif row.Price == product.price:
+                        log.info(f"{row.Title} is listed again")
+                if price_updates:
+                    session.execute(
+                        db.update(table)
+                        .where(table.c.id == db.bindparam("b_id"))
+                        .values(Price=db.bindparam("b_price")),
+                        price_updates,
+                    )
 
-                new_items = [d for d in data if d["URL"] not in existing_map]
-                if new_items:
-                    added = self._add_new_items(session, new_items)
-                    output.extend(added)
-                    statistics["New"] = len(added)
+                if skip_delisting:
+                    log.debug(
+                        f"Skipping delisting checks for {website} (health check active)"
+                    )
+                else:
+                    delisted = self._record_misses(session, website, scraped, now)
+                    statistics["Deleted"] = len(delisted)
+                    output.extend(delisted)
+
+                output.extend(new_items)
+                if notify and output:
+                    queued = self._enqueue_notifications(session, output, notify)
+                    log.info(f"Queued {queued} notification(s) for {website}")
 
                 session.commit()
             except Exception:
@@ -711,6 +1344,61 @@ class Database:
         )
         return output
 
+    @staticmethod
+    def _record_misses(
+        session: Any, website: str, scraped: dict[str, Product], now: datetime
+    ) -> list[Product]:
+        """Count a miss against every listing of ``website`` not in ``scraped``.
+
+        Listings that reach the grace period are delisted.
+
+        Returns:
+            Products that were delisted
+        """
+        table = AmiiboStock.__table__
+        missed = session.execute(
+            db.update(table)
+            .where(table.c.Website == website, table.c.URL.not_in(list(scraped)))
+            .values(missed_count=table.c.missed_count + 1)
+            .returning(
+                table.c.id,
+                table.c.URL,
+                table.c.Title,
+                table.c.Image,
+                table.c.Price,
+                table.c.missed_count,
+            )
+        ).all()
+
+        delisted: list[Product] = []
+        delisted_ids: list[int] = []
+        for row in sorted(missed, key=lambda row: row.id):
+            log.info(
+                f"{row.Title} missed {row.missed_count} time(s) "
+                f"(grace: {SCRAPING_FAILURE_GRACE_PERIOD})"
+            )
+            if row.missed_count >= SCRAPING_FAILURE_GRACE_PERIOD:
+                log.info(f"{row.Title} is no longer listed")
+                delisted_ids.append(row.id)
+                delisted.append(
+                    Product(
+                        colour=0xFF0000,
+                        title=row.Title,
+                        image=row.Image,
+                        url=row.URL,
+                        price=row.Price,
+                        stock=Stock.DELISTED.value,
+                        website=website,
+                    )
+                )
+        if delisted_ids:
+            session.execute(
+                db.update(table)
+                .where(table.c.id.in_(delisted_ids))
+                .values(is_active=False, delisted_at=now)
+            )
+        return delisted
+
     def get_statistics(self) -> dict[str, int]:
         """Get database statistics.
 
@@ -1,8 +1,17 @@
 import logging
 from datetime import datetime
-from typing import Any
+from typing import Any, Sequence
 
+from constants import (
+    DISCORD_MAX_EMBED_CHARACTERS,
+    DISCORD_MAX_EMBEDS,
+    DISCORD_RATE_LIMIT,
+    DISCORD_RATE_LIMIT_PERIOD,
+    MESSENGER_POOL_SIZE,
+)
 from messenger.messenger import Messenger
+from messenger.ratelimit import RateLimiter
+from models import Product
 from result import DeliveryResult, DeliveryStatus
 
 log = logging.getLogger(__name__)
@@ -10,9 +19,20 @@ log = logging.getLogger(__name__)
 
 class Discord(Messenger):
     def __init__(
-        self, name: str, stockists: list[str], active: bool, webhook_url: str
+        self,
+        name: str,
+        stockists: list[str],
+        active: bool,
+        webhook_url: str,
+        pool_size: int = MESSENGER_POOL_SIZE,
     ) -> None:
-        super().__init__(name=name, stockists=stockists, active=active)
+        super().__init__(
+            name=name,
+            stockists=stockists,
+            active=active,
+            rate_limiter=RateLimiter(DISCORD_RATE_LIMIT, DISCORD_RATE_LIMIT_PERIOD),
+            pool_size=pool_size,
+        )
         self.webhook_url = webhook_url
         self.data: dict[str, Any] = {
             "username": "Amiibot",
@@ -28,15 +48,63 @@ class Discord(Messenger):
             return self.send_post(url=self.webhook_url, json=self.data)
         return self._build_delivery_result(DeliveryStatus.INACTIVE)
 
-    def send_embed_message(self, embed_data: dict[str, Any]) -> DeliveryResult:
+    def send_embed_message(
+        self, embed_data: Product | dict[str, Any]
+    ) -> DeliveryResult:
+        return self.send_embed_messages([embed_data])[0]
+
+    def send_embed_messages(
+        self, products: Sequence[Product | dict[str, Any]]
+    ) -> list[DeliveryResult]:
+        """Send products as embeds, several to a message.
+
+        A message holds up to ``DISCORD_MAX_EMBEDS`` embeds while their text
+        stays within Discord's limit for a message. Every product in a
+        message shares that message's delivery result.
+        """
         if not self.active:
-            return self._build_delivery_result(DeliveryStatus.INACTIVE)
+            return [
+                self._build_delivery_result(DeliveryStatus.INACTIVE) for _ in products
+            ]
 
-        log.info(f"Sending embedded discord message via {self.name}")
+        results: list[DeliveryResult] = []
+        for group in self.group_embeds([self.build_embed(p) for p in products]):
+            log.info(f"Sending {len(group)} discord embed(s) via {self.name}")
+            data = {**self.data, "content": "Stock alert", "embeds": group}
+            result = self.send_post(url=self.webhook_url, json=data)
+            results.extend(result for _ in group)
+        return results
 
-        options, payload = self.format_embed_data(embed_data)
+    @staticmethod
+    def embed_length(embed: dict[str, Any]) -> int:
+        """Characters of ``embed`` that count towards Discord's message limit."""
+        return (
+            len(embed.get("title", ""))
+            + len(embed.get("description", ""))
+            + sum(len(f["name"]) + len(f["value"]) for f in embed.get("fields", []))
+            + len(embed.get("footer", {}).get("text", ""))
+            + len(embed.get("author", {}).get("name", ""))
+        )
+
+    @classmethod
+    def group_embeds(cls, embeds: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        groups: list[list[dict[str, Any]]] = []
+        length = 0
+        for embed in embeds:
+            size = cls.embed_length(embed)
+            if (
+                not groups
+                or len(groups[-1]) >= DISCORD_MAX_EMBEDS
+                or length + size > DISCORD_MAX_EMBED_CHARACTERS
+            ):
+                groups.append([])
+                length = 0
+            groups[-1].append(embed)
+            length += size
+        return groups
 
-        self.data["content"] = "Stock alert"
+    def build_embed(self, embed_data: Product | dict[str, Any]) -> dict[str, Any]:
+        options, payload = self.format_embed_data(embed_data)
 
         embed: dict[str, Any] = {"fields": []}
         for k, v in options.items():
@@ -47,30 +115,21 @@ class Discord(Messenger):
             "text": f"Amiibot - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             "icon_url": "https://user-images.githubusercontent.com/51025241/176945832-469f75d2-c3e8-4ba0-be54-77e1823b2987.png",
         }
-        self.data["embeds"] = [embed]
-
-        result = self.send_post(url=self.webhook_url, json=self.data)
-        return result
+        return embed
 
     def format_embed_data(
-        self, embed_data: dict[str, Any]
+        self, embed_data: Product | dict[str, Any]
     ) -> tuple[dict[str, Any], dict[str, Any]]:
-        options_keys = {
-            "Title": "title",
-            "Colour": "color",
-            "URL": "url",
-            "Image": "thumbnail",
+        product = Product.coerce(embed_data)
+        options: dict[str, Any] = {
+            "title": product.title,
+            "color": product.colour,
+            "url": product.url,
+            "thumbnail": {"url": product.image.replace(" ", "%20")},
+        }
+        payload: dict[str, Any] = {
+            "Price": product.price,
+            "Stock": product.stock,
+            "Website": product.website,
         }
-        payload_keys = ["Price", "Stock", "Website"]
-        options: dict[str, Any] = {}
-        payload: dict[str, Any] = {}
-        for k, v in embed_data.items():
-            if k in options_keys:
-                if k == "Image":
-                    options[options_keys[k]] = {"url": v.replace(" ", "%20")}
-                else:
-                    options[options_keys[k]] = v
-            elif k in payload_keys:
-                payload[k] = v
-
         return options, payload
@@ -1,10 +1,9 @@
 import logging
-import time
 from typing import Any, Union
 
-from constants import MESSAGE_SEND_DELAY
 from messenger.discord import Discord
 from messenger.telegram import Telegram
+from models import Product
 
 log = logging.getLogger(__name__)
 
@@ -34,6 +33,7 @@ class MessageManager:
                     stockists=messenger_object.stockists,
                     webhook_url=messenger_object.webhook_url,
                     active=messenger_object.active,
+                    pool_size=messenger_object.pool_size,
                 )
                 self.all_messengers.append(discord)
                 if messenger_object.active:
@@ -50,6 +50,7 @@ class MessageManager:
                         bot_token=messenger_object.bot_token,
                         chat_id=messenger_object.chat_id,
                         active=messenger_object.active,
+                        pool_size=messenger_object.pool_size,
                     )
                 )
                 if messenger_object.active:
@@ -71,6 +72,11 @@ class MessageManager:
             return False
         return True
 
+    def close(self) -> None:
+        """Close every messenger's pooled HTTP connections."""
+        for messenger in self.all_messengers:
+            messenger.close()
+
     def send_message_to_all_messengers(self, message: str) -> None:
         """Send a text message to all active messengers.
 
@@ -80,16 +86,16 @@ class MessageManager:
         for messenger in self.all_messengers:
             if messenger.active:
                 messenger.send_message(message=message)
-                time.sleep(MESSAGE_SEND_DELAY)
 
-    def send_embed_message_to_all_messengers(self, embed_data: dict[str, Any]) -> None:
+    def send_embed_message_to_all_messengers(
+        self, embed_data: Product | dict[str, Any]
+    ) -> None:
         """Send an embedded message to all active messengers.
 
         Args:
-            embed_data: Dictionary containing message data
+            embed_data: Product to announce, or its dict form
         """
         for messenger in self.all_messengers:
             if messenger.active:
                 response = messenger.send_embed_message(embed_data=embed_data)
                 log.info(response)
-                time.sleep(MESSAGE_SEND_DELAY)
@@ -1,19 +1,52 @@
 import logging
-from typing import Any
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Sequence
 
 import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
 
-from constants import REQUEST_TIMEOUT
+from constants import MESSENGER_POOL_SIZE, REQUEST_TIMEOUT
+from messenger.ratelimit import RateLimiter
+from models import Product
 from result import DeliveryResult, DeliveryStatus
 
 log = logging.getLogger(__name__)
 
 
 class Messenger:
-    def __init__(self, name: str, stockists: list[str], active: bool) -> None:
+    def __init__(
+        self,
+        name: str,
+        stockists: list[str],
+        active: bool,
+        rate_limiter: RateLimiter | None = None,
+        pool_size: int = MESSENGER_POOL_SIZE,
+    ) -> None:
         self.name = name
         self.stockists = stockists
         self.active = active
+        self.rate_limiter = rate_limiter
+        self.session = self._build_session(pool_size)
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        """Keep-alive session reused for every request this messenger sends.
+
+        Only one API host is ever contacted, so a single pool of up to
+        ``pool_size`` connections serves all deliveries; callers beyond that
+        wait for a free connection rather than opening extra ones.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, pool_block=True
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        self.session.close()
 
     messenger: str | None = None
 
@@ -25,17 +58,58 @@ class Messenger:
             return DeliveryStatus.TRANSIENT_FAILURE
         return DeliveryStatus.PERMANENT_FAILURE
 
+    def _retry_after(self, response: requests.Response) -> float | None:
+        """Seconds the API asked to wait before retrying, from ``Retry-After``.
+
+        The header may hold a number of seconds or an HTTP date.
+        """
+        value = response.headers.get("Retry-After")
+        if not isinstance(value, str):
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+    def _route(self, url: str) -> str:
+        """Rate limit bucket a request to ``url`` draws from."""
+        return url.split("?", 1)[0]
+
+    def _wait_for_rate_limit(self, url: str, messages: int = 1) -> None:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self._route(url), messages)
+
+    def _response_result(self, url: str, response: requests.Response) -> DeliveryResult:
+        status = self._classify_response(response)
+        retry_after = (
+            self._retry_after(response)
+            if status == DeliveryStatus.TRANSIENT_FAILURE
+            else None
+        )
+        if self.rate_limiter is not None:
+            self.rate_limiter.observe(self._route(url), response.headers, retry_after)
+        return self._build_delivery_result(
+            status, response.status_code, retry_after=retry_after
+        )
+
     def _build_delivery_result(
         self,
         status: DeliveryStatus,
         http_status: int | None = None,
         diagnostic: str | None = None,
+        retry_after: float | None = None,
     ) -> DeliveryResult:
         return DeliveryResult(
             status=status,
             messenger_name=self.name,
             http_status=http_status,
             diagnostic=diagnostic,
+            retry_after=retry_after,
         )
 
     def send_post(
@@ -43,11 +117,12 @@ class Messenger:
         url: str,
         json: dict[str, Any] | None = None,
         timeout: int = REQUEST_TIMEOUT,
+        messages: int = 1,
     ) -> DeliveryResult:
+        self._wait_for_rate_limit(url, messages)
         try:
-            response = requests.post(url, json=json, timeout=timeout)
-            status = self._classify_response(response)
-            return self._build_delivery_result(status, response.status_code)
+            response = self.session.post(url, json=json, timeout=timeout)
+            return self._response_result(url, response)
         except requests.exceptions.Timeout:
             return self._build_delivery_result(
                 DeliveryStatus.TRANSIENT_FAILURE, diagnostic="timeout"
@@ -71,10 +146,10 @@ class Messenger:
         params: dict[str, Any] | None = None,
         timeout: int = REQUEST_TIMEOUT,
     ) -> DeliveryResult:
+        self._wait_for_rate_limit(url)
         try:
-            response = requests.get(url, params=params, timeout=timeout)
-            status = self._classify_response(response)
-            return self._build_delivery_result(status, response.status_code)
+            response = self.session.get(url, params=params, timeout=timeout)
+            return self._response_result(url, response)
         except requests.exceptions.Timeout:
             return self._build_delivery_result(
                 DeliveryStatus.TRANSIENT_FAILURE, diagnostic="timeout"
@@ -95,5 +170,17 @@ class Messenger:
     def send_message(self, message: str) -> DeliveryResult:
         return self._build_delivery_result(DeliveryStatus.INACTIVE)
 
-    def send_embed_message(self, embed_data: dict[str, Any]) -> DeliveryResult:
+    def send_embed_message(
+        self, embed_data: Product | dict[str, Any]
+    ) -> DeliveryResult:
         return self._build_delivery_result(DeliveryStatus.INACTIVE)
+
+    def send_embed_messages(
+        self, products: Sequence[Product | dict[str, Any]]
+    ) -> list[DeliveryResult]:
+        """Announce several products, returning one result per product in order.
+
+        Messengers that can group products into one request override this;
+        by default each product is sent on its own.
+        """
+        return [self.send_embed_message(product) for product in products]
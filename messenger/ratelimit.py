@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Mapping, Sequence
+
+log = logging.getLogger(__name__)
+
+
+def _header_float(headers: Mapping[str, Any], name: str) -> float | None:
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Allows ``capacity`` requests at once, refilled evenly over ``period``.
+
+    ``reserve()`` takes a token and returns how long the caller must wait
+    before using it. Tokens may go negative, so concurrent callers queue up
+    behind each other instead of all waking at the same moment. The
+    server's own view of the bucket, when it reports one, overrides the
+    local estimate through ``sync()``, and ``pause()`` holds every request
+    until a ``Retry-After`` has passed.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        period: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def reserve(self, tokens: int = 1) -> float:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def sync(self, limit: float | None, remaining: float, reset_after: float) -> None:
+        """Adopt the limit, remaining requests and reset time a server reported."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if limit is not None and limit > 0:
+                self.capacity = limit
+                self.rate = limit / self.period
+            self._tokens = min(self._tokens, remaining)
+            if remaining <= 0:
+                self._tokens = max(self._tokens, 0.0)
+                self._blocked_until = max(self._blocked_until, now + reset_after)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            now = self._clock()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+
+
+class RateLimiter:
+    """Token buckets for one messenger, one per route.
+
+    Routes start with a bucket of ``capacity`` requests per ``period``.
+    Servers that name their buckets (Discord's ``X-RateLimit-Bucket``) can
+    map several routes onto one bucket, and the ``X-RateLimit-*`` headers
+    of each response keep it in step with the server. ``shared`` buckets,
+    such as a bot-wide limit, are drawn from on every request.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        period: float,
+        shared: Sequence[TokenBucket] = (),
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.capacity = capacity
+        self.period = period
+        self.shared = list(shared)
+        self._clock = clock
+        self._sleep = sleep
+        self._routes: dict[str, TokenBucket] = {}
+        self._named: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _new_bucket(self) -> TokenBucket:
+        return TokenBucket(self.capacity, self.period, clock=self._clock)
+
+    def bucket(self, route: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._routes.get(route)
+            if bucket is None:
+                bucket = self._routes[route] = self._new_bucket()
+            return bucket
+
+    def acquire(self, route: str, tokens: int = 1) -> float:
+        """Block until a request on ``route`` is allowed; return the wait.
+
+        A request that delivers several messages, such as a Telegram album,
+        draws one token for each of them.
+        """
+        buckets = [self.bucket(route), *self.shared]
+        wait = max(bucket.reserve(tokens) for bucket in buckets)
+        if wait > 0:
+            log.debug(f"Rate limited on {route}, waiting {wait:.2f}s")
+            self._sleep(wait)
+        return wait
+
+    def observe(
+        self,
+        route: str,
+        headers: Mapping[str, Any],
+        retry_after: float | None = None,
+    ) -> None:
+        """Update ``route``'s bucket from a response's rate limit headers."""
+        name = headers.get("X-RateLimit-Bucket")
+        if isinstance(name, str):
+            with self._lock:
+                if name not in self._named:
+                    self._named[name] = self._routes.get(route) or self._new_bucket()
+                self._routes[route] = self._named[name]
+        bucket = self.bucket(route)
+
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        reset_after = _header_float(headers, "X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None:
+            bucket.sync(
+                _header_float(headers, "X-RateLimit-Limit"), remaining, reset_after
+            )
+
+        if not retry_after:
+            return
+        if headers.get("X-RateLimit-Global") == "true":
+            with self._lock:
+                paused = [*self._routes.values(), *self.shared]
+        else:
+            paused = [bucket]
+        for limited in paused:
+            limited.pause(retry_after)
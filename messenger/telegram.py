@@ -1,10 +1,49 @@
 import logging
+import re
+import threading
+from typing import Any, Sequence
 
+import requests  # type: ignore
+
+from constants import (
+    MESSENGER_POOL_SIZE,
+    TELEGRAM_BOT_RATE_LIMIT,
+    TELEGRAM_CHAT_RATE_LIMIT,
+    TELEGRAM_CHAT_RATE_LIMIT_PERIOD,
+    TELEGRAM_GROUP_RATE_LIMIT,
+    TELEGRAM_GROUP_RATE_LIMIT_PERIOD,
+    TELEGRAM_MAX_CAPTION_LENGTH,
+    TELEGRAM_MAX_ITEMS,
+    TELEGRAM_MAX_MESSAGE_LENGTH,
+)
 from messenger.messenger import Messenger
-from result import DeliveryStatus
+from messenger.ratelimit import RateLimiter, TokenBucket
+from models import Product
+from result import DeliveryResult, DeliveryStatus
+from utils import batch_items
 
 log = logging.getLogger(__name__)
 
+_MARKDOWN_SPECIAL = re.compile(r"([_*`\[])")
+_ALERT_HEADER = "*Stock alert*\n\n"
+
+
+def _escape_markdown(text: str) -> str:
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", text)
+
+
+_bot_buckets: dict[str, TokenBucket] = {}
+_bot_buckets_lock = threading.Lock()
+
+
+def _bot_bucket(bot_token: str) -> TokenBucket:
+    """The bot-wide limit, shared by every messenger using ``bot_token``."""
+    with _bot_buckets_lock:
+        bucket = _bot_buckets.get(bot_token)
+        if bucket is None:
+            bucket = _bot_buckets[bot_token] = TokenBucket(TELEGRAM_BOT_RATE_LIMIT, 1.0)
+        return bucket
+
 
 class Telegram(Messenger):
     def __init__(
@@ -14,8 +53,20 @@ class Telegram(Messenger):
         active: bool,
         bot_token: str,
         chat_id: str,
+        pool_size: int = MESSENGER_POOL_SIZE,
     ) -> None:
-        super().__init__(name=name, stockists=stockists, active=active)
+        # Groups and channels have negative chat ids and a stricter limit.
+        if str(chat_id).startswith("-"):
+            limit, period = TELEGRAM_GROUP_RATE_LIMIT, TELEGRAM_GROUP_RATE_LIMIT_PERIOD
+        else:
+            limit, period = TELEGRAM_CHAT_RATE_LIMIT, TELEGRAM_CHAT_RATE_LIMIT_PERIOD
+        super().__init__(
+            name=name,
+            stockists=stockists,
+            active=active,
+            rate_limiter=RateLimiter(limit, period, shared=[_bot_bucket(bot_token)]),
+            pool_size=pool_size,
+        )
         self.bot_token = bot_token
         self.data: dict[str, str] = {
             "chat_id": chat_id,
@@ -24,10 +75,147 @@ class Telegram(Messenger):
 
     messenger = "telegram"
 
+    def _route(self, url: str) -> str:
+        """Telegram limits messages per chat, whichever method sends them."""
+        return self.data["chat_id"]
+
+    def _retry_after(self, response: requests.Response) -> float | None:
+        """Telegram also reports the wait in the body of a 429 response."""
+        retry_after = super()._retry_after(response)
+        if retry_after is not None:
+            return retry_after
+        try:
+            parameters = response.json().get("parameters") or {}
+            return max(0.0, float(parameters["retry_after"]))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return None
+
     def send_message(self, message: str):
         if self.active:
             log.info(f"Sending telegram message to {self.name}")
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            self.data["text"] = message
-            return self.send_get(url=url, params=self.data)
+            params = {**self.data, "text": message}
+            return self.send_get(url=self._api_url("sendMessage"), params=params)
         return self._build_delivery_result(DeliveryStatus.INACTIVE)
+
+    def send_embed_message(
+        self, embed_data: Product | dict[str, Any]
+    ) -> DeliveryResult:
+        return self.send_embed_messages([embed_data])[0]
+
+    def send_embed_messages(
+        self, products: Sequence[Product | dict[str, Any]]
+    ) -> list[DeliveryResult]:
+        """Send products as photo alerts, up to ``TELEGRAM_MAX_ITEMS`` at once.
+
+        One product is sent with ``sendPhoto`` and several as a
+        ``sendMediaGroup`` album, each photo captioned with its product.
+        Products without a usable image, and albums Telegram rejects (for
+        instance when it cannot fetch an image), are sent as grouped text
+        messages instead. Every product in a request shares its result.
+        """
+        if not self.active:
+            return [
+                self._build_delivery_result(DeliveryStatus.INACTIVE) for _ in products
+            ]
+
+        items = [Product.coerce(product) for product in products]
+        results: list[DeliveryResult | None] = [None] * len(items)
+        with_photo = [i for i, item in enumerate(items) if self._has_photo(item)]
+        for batch in batch_items(with_photo, TELEGRAM_MAX_ITEMS):
+            result = self.send_photos([items[i] for i in batch])
+            if result.status == DeliveryStatus.PERMANENT_FAILURE:
+                log.warning(
+                    f"Telegram rejected {len(batch)} photo alert(s) for {self.name} "
+                    f"(HTTP {result.http_status}), sending them as text"
+                )
+                continue
+            for i in batch:
+                results[i] = result
+
+        text_only = [i for i, result in enumerate(results) if result is None]
+        for i, result in zip(text_only, self.send_texts([items[i] for i in text_only])):
+            results[i] = result
+        return [result for result in results if result is not None]
+
+    def send_photos(self, products: list[Product]) -> DeliveryResult:
+        """Send up to ``TELEGRAM_MAX_ITEMS`` products in one photo request."""
+        log.info(f"Sending {len(products)} telegram photo alert(s) to {self.name}")
+        captions = [self.format_entry(product) for product in products]
+        captions[0] = _ALERT_HEADER + captions[0]
+        if len(products) == 1:
+            return self.send_post(
+                url=self._api_url("sendPhoto"),
+                json={
+                    **self.data,
+                    "photo": self._photo_url(products[0]),
+                    "caption": captions[0],
+                },
+            )
+        media = [
+            {
+                "type": "photo",
+                "media": self._photo_url(product),
+                "caption": caption,
+                "parse_mode": self.data["parse_mode"],
+            }
+            for product, caption in zip(products, captions)
+        ]
+        # Telegram counts every photo in an album against its limits
+        return self.send_post(
+            url=self._api_url("sendMediaGroup"),
+            json={"chat_id": self.data["chat_id"], "media": media},
+            messages=len(media),
+        )
+
+    def send_texts(self, products: list[Product]) -> list[DeliveryResult]:
+        """Send products as text alerts, several to a message.
+
+        A message holds up to ``TELEGRAM_MAX_ITEMS`` products while it stays
+        within Telegram's message length.
+        """
+        results: list[DeliveryResult] = []
+        for group in self.group_entries([self.format_entry(p) for p in products]):
+            log.info(f"Sending {len(group)} telegram stock alert(s) to {self.name}")
+            params = {**self.data, "text": _ALERT_HEADER + "\n\n".join(group)}
+            result = self.send_get(url=self._api_url("sendMessage"), params=params)
+            results.extend(result for _ in group)
+        return results
+
+    def _api_url(self, method: str) -> str:
+        return f"https://api.telegram.org/bot{self.bot_token}/{method}"
+
+    @staticmethod
+    def _photo_url(product: Product) -> str:
+        return product.image.replace(" ", "%20")
+
+    def _has_photo(self, product: Product) -> bool:
+        caption = _ALERT_HEADER + self.format_entry(product)
+        return (
+            product.image.startswith(("https://", "http://"))
+            and len(caption) <= TELEGRAM_MAX_CAPTION_LENGTH
+        )
+
+    @staticmethod
+    def format_entry(embed_data: Product | dict[str, Any]) -> str:
+        product = Product.coerce(embed_data)
+        return (
+            f"[{_escape_markdown(product.title)}]({product.url})\n"
+            f"{_escape_markdown(product.price)} | {_escape_markdown(product.stock)}"
+            f" | {_escape_markdown(product.website or '')}"
+        )
+
+    @staticmethod
+    def group_entries(entries: list[str]) -> list[list[str]]:
+        groups: list[list[str]] = []
+        length = 0
+        for entry in entries:
+            if (
+                not groups
+                or len(groups[-1]) >= TELEGRAM_MAX_ITEMS
+                or length + len(entry) + 2 > TELEGRAM_MAX_MESSAGE_LENGTH
+            ):
+                groups.append([])
+                length = len(_ALERT_HEADER)
+            groups[-1].append(entry)
+            length += len(entry) + 2
+        return groups
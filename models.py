@@ -1,8 +1,16 @@
+import hashlib
+import json
 import re
+from dataclasses import dataclass
+from typing import Annotated, Any, Mapping
 
 from pydantic import (
     BaseModel,
     Field,
+    TypeAdapter,
+    ValidationError,
+    ValidatorFunctionWrapHandler,
+    WrapValidator,
     field_validator,
 )
 
@@ -10,6 +18,44 @@ MAX_TITLE_LENGTH = 300
 MAX_URL_LENGTH = 2048
 MAX_IMAGE_LENGTH = 2048
 MAX_PRICE_LENGTH = 30
+MAX_WEBSITE_LENGTH = 100
+
+PRODUCT_KEYS = ("Colour", "Title", "Image", "URL", "Price", "Stock", "Website")
+"""Keys of the dict form of a product, in the order earlier versions used."""
+
+
+@dataclass(frozen=True, slots=True)
+class Product:
+    """One listing as it travels from a stockist to the database and messengers.
+
+    Each dict key maps to the attribute of the same name in lower case.
+    ``to_dict``/``from_dict`` convert to and from that dict shape, and
+    ``product["Title"]`` still reads a field by its dict key.
+    """
+
+    colour: int
+    title: str
+    image: str
+    url: str
+    price: str
+    stock: str
+    website: str | None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Product":
+        return cls(*(data[key] for key in PRODUCT_KEYS))
+
+    @classmethod
+    def coerce(cls, item: "Product | Mapping[str, Any]") -> "Product":
+        return item if isinstance(item, Product) else cls.from_dict(item)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: getattr(self, key.lower()) for key in PRODUCT_KEYS}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in PRODUCT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key.lower())
 
 
 class ScrapedProduct(BaseModel):
@@ -17,7 +63,7 @@ class ScrapedProduct(BaseModel):
     Price: str = Field(max_length=MAX_PRICE_LENGTH, min_length=1)
     Stock: str
     URL: str = Field(max_length=MAX_URL_LENGTH)
-    Website: str = Field(max_length=100)
+    Website: str = Field(max_length=MAX_WEBSITE_LENGTH)
     Image: str = Field(max_length=MAX_IMAGE_LENGTH)
     Colour: int
 
@@ -49,15 +95,18 @@ def _strip_control_characters(text: str) -> str:
     return stripped
 
 
-def deduplicate_by_url(products: list[dict]) -> list[dict]:
-    seen: set[str] = set()
-    result: list[dict] = []
-    for item in products:
-        key = _canonical_url(item.get("URL", ""))
-        if key not in seen:
-            seen.add(key)
-            result.append(item)
-    return result
+def listing_hash(products: list[Product]) -> str:
+    """Hash a scraped listing independent of the order items were found in."""
+    rows = sorted(
+        json.dumps(
+            item.to_dict() if isinstance(item, Product) else item,
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        for item in products
+    )
+    return hashlib.sha256("\n".join(rows).encode("utf-8")).hexdigest()
 
 
 def _canonical_url(url: str) -> str:
@@ -65,15 +114,104 @@ def _canonical_url(url: str) -> str:
     return cleaned
 
 
+@dataclass(frozen=True)
+class ProductError:
+    """Why the item at ``index`` of a scraped listing was rejected."""
+
+    index: int
+    field: str | None
+    message: str
+
+    def __str__(self) -> str:
+        if self.field is None:
+            return f"item {self.index}: {self.message}"
+        return f"item {self.index} {self.field}: {self.message}"
+
+
+def _keep_error(value: Any, handler: ValidatorFunctionWrapHandler) -> Any:
+    # Return a failing row's error in its place so one bad row does not
+    # abort the batch.
+    try:
+        return handler(value)
+    except ValidationError as e:
+        return e
+
+
+_SCRAPED_PRODUCTS = TypeAdapter(
+    list[Annotated[ScrapedProduct, WrapValidator(_keep_error)]]
+)
+
+
+def _plain(value: Any, max_length: int, min_length: int = 0) -> bool:
+    return (
+        isinstance(value, str)
+        and min_length <= len(value) <= max_length
+        and value.isprintable()
+    )
+
+
+def _is_known_good(item: Any) -> bool:
+    """Cheap checks that guarantee ``ScrapedProduct`` accepts ``item`` unchanged.
+
+    Printable strings carry no control characters, so nothing would be
+    stripped. Anything these checks cannot vouch for takes the model path.
+    """
+    return (
+        isinstance(item, Product)
+        and type(item.colour) is int
+        and _plain(item.title, MAX_TITLE_LENGTH, min_length=1)
+        and _plain(item.price, MAX_PRICE_LENGTH, min_length=1)
+        and isinstance(item.stock, str)
+        and item.stock.isprintable()
+        and _plain(item.url, MAX_URL_LENGTH)
+        and item.url.startswith("https://")
+        and _plain(item.website, MAX_WEBSITE_LENGTH)
+        and _plain(item.image, MAX_IMAGE_LENGTH)
+        and item.image.startswith("https://")
+    )
+
+
+def _from_model(model: ScrapedProduct) -> Product:
+    return Product(
+        colour=model.Colour,
+        title=model.Title,
+        image=model.Image,
+        url=model.URL,
+        price=model.Price,
+        stock=model.Stock,
+        website=model.Website,
+    )
+
+
 def validate_products(
-    products: list[dict],
-) -> tuple[list[dict], list[str]]:
-    valid = []
-    errors = []
+    products: list[Product],
+) -> tuple[list[Product], list[ProductError]]:
+    """Split scraped items into valid products and per-item errors.
+
+    Products that pass ``_is_known_good`` are accepted as they are. The
+    rest, including items still in the dict form, are validated together
+    in one batch and returned with control characters stripped.
+    """
+    accepted: dict[int, Product] = {}
+    pending: list[int] = []
     for idx, item in enumerate(products):
-        try:
-            ScrapedProduct(**item)
-            valid.append(item)
-        except Exception as e:
-            errors.append(f"item {idx}: {e}")
-    return valid, errors
+        if _is_known_good(item):
+            accepted[idx] = item
+        else:
+            pending.append(idx)
+
+    errors: list[ProductError] = []
+    if pending:
+        rows = [
+            item.to_dict() if isinstance(item, Product) else item
+            for item in (products[idx] for idx in pending)
+        ]
+        for idx, result in zip(pending, _SCRAPED_PRODUCTS.validate_python(rows)):
+            if isinstance(result, ValidationError):
+                for error in result.errors():
+                    field = str(error["loc"][0]) if error["loc"] else None
+                    errors.append(ProductError(idx, field, error["msg"]))
+            else:
+                accepted[idx] = _from_model(result)
+
+    return [accepted[idx] for idx in sorted(accepted)], errors
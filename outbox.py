@@ -0,0 +1,193 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any
+
+from constants import (
+    OUTBOX_FLUSH_TIMEOUT,
+    OUTBOX_MAX_AGE_MINUTES,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_POLL_INTERVAL,
+    OUTBOX_RETRY_BASE_DELAY,
+    OUTBOX_RETRY_MAX_DELAY,
+)
+from database import NotificationOutbox
+from result import DeliveryResult, DeliveryStatus
+
+log = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    """Seconds to wait before redelivering after the ``attempt``-th failure.
+
+    The delay doubles per attempt up to ``OUTBOX_RETRY_MAX_DELAY`` and is
+    drawn from its upper half so retries from a burst spread out. A
+    ``Retry-After`` from the messenger is a lower bound.
+    """
+    delay = min(OUTBOX_RETRY_MAX_DELAY, OUTBOX_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    delay = random.uniform(delay / 2, delay)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class OutboxWorker:
+    """Delivers the stock alerts queued in the notification outbox.
+
+    ``drain()`` sends everything currently due, one thread per messenger
+    so a slow API only holds up its own alerts, and returns how many items
+    were delivered. A transient failure is queued again after
+    ``backoff_delay``; it is recorded as failed once ``max_attempts`` are
+    used or the alert is older than ``max_age``. The first drain discards
+    alerts queued for messengers that are no longer configured. ``flush()`` keeps
+    draining until nothing is left or its timeout passes, and ``start()``
+    runs drains on a background thread, as soon as a retry falls due,
+    every ``interval`` seconds or when ``wake()`` is called, until
+    ``stop()``.
+    """
+
+    def __init__(
+        self,
+        database: Any,
+        messengers: list[Any],
+        interval: float = OUTBOX_POLL_INTERVAL,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        max_age: timedelta = timedelta(minutes=OUTBOX_MAX_AGE_MINUTES),
+    ) -> None:
+        self.database = database
+        self.messengers = {messenger.name: messenger for messenger in messengers}
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.max_age = max_age
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._drain_lock = threading.Lock()
+        self._orphans_discarded = False
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def drain(self) -> int:
+        with self._drain_lock:
+            if not self._orphans_discarded:
+                self.database.discard_orphaned_outbox(list(self.messengers))
+                self._orphans_discarded = True
+            entries = self.database.get_outbox(list(self.messengers))
+            if not entries:
+                return 0
+
+            queues: dict[str, list[NotificationOutbox]] = {}
+            for entry in entries:
+                queues.setdefault(entry.messenger_name, []).append(entry)
+
+            with ThreadPoolExecutor(
+                max_workers=len(queues), thread_name_prefix="outbox"
+            ) as executor:
+                futures = [
+                    executor.submit(self._deliver, self.messengers[name], queue)
+                    for name, queue in queues.items()
+                ]
+                results = [result for future in futures for result in future.result()]
+
+            now = datetime.now()
+            self.database.settle_outbox(
+                [
+                    (entry, result, self._retry_at(entry, result, now))
+                    for entry, result in results
+                ]
+            )
+            sent = sum(
+                1 for _, result in results if result.status == DeliveryStatus.SUCCESS
+            )
+            log.info(f"Delivered {sent}/{len(results)} queued notification(s)")
+            return sent
+
+    def flush(self, timeout: float = OUTBOX_FLUSH_TIMEOUT) -> int:
+        """Drain repeatedly, waiting out retry backoffs, for up to ``timeout``."""
+        deadline = time.monotonic() + timeout
+        sent = self.drain()
+        while True:
+            wait = self._seconds_until_due()
+            if wait is None or time.monotonic() + wait > deadline:
+                return sent
+            time.sleep(wait)
+            sent += self.drain()
+
+    def _retry_at(
+        self, entry: NotificationOutbox, result: DeliveryResult, now: datetime
+    ) -> datetime | None:
+        if result.status != DeliveryStatus.TRANSIENT_FAILURE:
+            return None
+        attempt = entry.attempts + 1
+        retry_at = now + timedelta(seconds=backoff_delay(attempt, result.retry_after))
+        if attempt >= self.max_attempts or retry_at > entry.created_at + self.max_age:
+            log.warning(
+                f"Giving up on {entry.title} via {entry.messenger_name} after "
+                f"{attempt} attempt(s): {result.diagnostic or result.http_status}"
+            )
+            return None
+        return retry_at
+
+    def _seconds_until_due(self) -> float | None:
+        due = self.database.get_next_outbox_attempt(list(self.messengers))
+        if due is None:
+            return None
+        return max(0.0, (due - datetime.now()).total_seconds())
+
+    def _deliver(
+        self, messenger: Any, entries: list[NotificationOutbox]
+    ) -> list[tuple[NotificationOutbox, DeliveryResult]]:
+        try:
+            results = messenger.send_embed_messages(
+                [entry.to_product() for entry in entries]
+            )
+        except Exception as e:
+            log.error(f"Error delivering queued alerts via {messenger.name}: {e}")
+            results = [
+                DeliveryResult(
+                    status=DeliveryStatus.TRANSIENT_FAILURE,
+                    messenger_name=messenger.name,
+                    diagnostic=str(e),
+                )
+                for _ in entries
+            ]
+        return list(zip(entries, results))
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="outbox-worker", daemon=True
+        )
+        self._thread.start()
+        log.info(f"Outbox worker started, polling every {self.interval}s")
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the background thread after its current drain."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            wait = self.interval
+            try:
+                self.drain()
+                due = self._seconds_until_due()
+                if due is not None:
+                    wait = min(due, self.interval)
+            except Exception as e:
+                log.error(f"Outbox drain failed: {e}", exc_info=True)
+            self._wake.wait(wait)
+            self._wake.clear()
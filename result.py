@@ -31,6 +31,7 @@ class RunResult:
     stockists_succeeded: int = 0
     stockists_failed: int = 0
     notifications_sent: int = 0
+    duplicates_removed: int = 0
     failure_category: FailureCategory | None = None
     errors: list[str] = field(default_factory=list)
 
@@ -41,3 +42,12 @@ class DeliveryResult:
     messenger_name: str
     http_status: int | None = None
     diagnostic: str | None = None
+    retry_after: float | None = None
+
+
+@dataclass
+class StockistHealth:
+    consecutive_failures: int = 0
+    baseline_count: int = 0
+    unhealthy_obs: int = 0
+    skip_delisting: bool = False
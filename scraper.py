@@ -1,16 +1,30 @@
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 from constants import (
     CONSECUTIVE_UNHEALTHY_THRESHOLD,
+    HTTP_CACHE_DIR,
     MAX_RETRY_ATTEMPTS,
+    POLL_INTERVAL_TOLERANCE,
     RETRY_BACKOFF_FACTOR,
     STOCKIST_HEALTH_RATIO,
 )
-from models import deduplicate_by_url, validate_products
-from result import DeliveryStatus, FailureCategory, RunResult, RunStatus
+from models import (
+    Product,
+    ProductError,
+    listing_hash,
+    validate_products,
+)
+from outbox import OutboxWorker
+from result import FailureCategory, RunResult, RunStatus
+from stockist.deadline import Deadline, DeadlineExceeded
+from stockist.httpcache import Fetch, ValidatorCache
+from stockist.stockist import Stockist
 
 log = logging.getLogger(__name__)
 
@@ -23,6 +37,7 @@ class StockistResult:
     duration_seconds: float = 0
     consecutive_failures: int = 0
     error: str | None = None
+    duplicates_removed: int = 0
 
 
 @dataclass
@@ -31,6 +46,22 @@ class CycleStats:
     failed: int
     notifications_sent: int
     stockist_results: list[StockistResult] = field(default_factory=list)
+    skipped: int = 0
+    duplicates_removed: int = 0
+
+
+@dataclass
+class StockistOutcome:
+    stockist: Any
+    scraped: list[Product] = field(default_factory=list)
+    validated: list[Product] = field(default_factory=list)
+    validation_errors: list[ProductError] = field(default_factory=list)
+    error: Exception | None = None
+    elapsed: float = 0
+    fetches: list[Fetch] = field(default_factory=list)
+    unchanged: bool = False
+    content_hash: str | None = None
+    duplicates_removed: int = 0
 
 
 class Scraper:
@@ -39,6 +70,15 @@ class Scraper:
         self.messengers = stockists.messengers
         self.database = database
         self.config = config
+        self.max_workers = config.scraper.max_workers
+        self.stockist_deadline = config.scraper.stockist_deadline
+        self.http_cache = (
+            ValidatorCache(Path(HTTP_CACHE_DIR))
+            if config.scraper.conditional_requests
+            else None
+        )
+        self.schedule = config.scraper.stockists
+        self.outbox = OutboxWorker(database, list(self.messengers.all_messengers))
 
     def scrape(self) -> RunResult:
         try:
@@ -51,8 +91,13 @@ class Scraper:
                     f"  {sr.name}: {'OK' if sr.success else 'FAIL'} "
                     f"items={sr.item_count} "
                     f"{sr.duration_seconds}s "
-                    f"failures={sr.consecutive_failures}"
+                    f"failures={sr.consecutive_failures} "
+                    f"duplicates={sr.duplicates_removed}"
                 )
+            if cycle.skipped:
+                log.info(f"  {cycle.skipped} stockist(s) not due this cycle")
+            if cycle.duplicates_removed:
+                log.info(f"  {cycle.duplicates_removed} duplicate item(s) removed")
             return RunResult(
                 status=(RunStatus.SUCCESS if cycle.failed == 0 else RunStatus.PARTIAL),
                 exit_code=0 if cycle.failed == 0 else 2,
@@ -60,6 +105,7 @@ class Scraper:
                 stockists_succeeded=cycle.succeeded,
                 stockists_failed=cycle.failed,
                 notifications_sent=cycle.notifications_sent,
+                duplicates_removed=cycle.duplicates_removed,
                 errors=errors,
             )
         except Exception as e:
@@ -71,189 +117,282 @@ class Scraper:
                 errors=[str(e)],
             )
 
-    def _scrape_stockist(self, stockist: Any) -> list[dict[str, Any]]:
-        for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
-            try:
-                return stockist.get_amiibo()
-            except Exception as e:
-                log.warning(
-                    f"Error scraping {stockist.name} "
-                    f"(attempt {attempt}/{MAX_RETRY_ATTEMPTS}): {e}"
-                )
-                if attempt < MAX_RETRY_ATTEMPTS:
-                    wait_time = RETRY_BACKOFF_FACTOR**attempt
-                    log.info(f"Retrying {stockist.name} in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
+    def _scrape_stockist(
+        self, stockist: Any, fetches: list[Fetch] | None = None
+    ) -> list[Product]:
+        deadline = Deadline(self.stockist_deadline)
+        stockist.deadline = deadline
+        stockist.http_cache = self.http_cache
+        try:
+            for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
+                deadline.check(stockist.name)
+                # Only the attempt that succeeds decides whether anything changed.
+                if fetches is not None:
+                    fetches.clear()
+                stockist.fetches = fetches
+                try:
+                    return stockist.get_amiibo()
+                except DeadlineExceeded:
                     raise
-        raise RuntimeError("unreachable")
-
-    def scrape_cycle(self) -> CycleStats:
-        succeeded = 0
-        failed = 0
-        notifications_sent = 0
-        stockist_results: list[StockistResult] = []
-
-        for stockist in self.stockists.all_stockists:
-            log.info(f"Scraping {stockist.name}")
-            start_time = time.monotonic()
-
-            try:
-                scraped = self._scrape_stockist(stockist)
-            except Exception as e:
-                log.error(f"Error scraping {stockist.name}: {e}", exc_info=True)
-                elapsed = time.monotonic() - start_time
-
-                failure_count = self.database.record_scraping_failure(stockist.name)
-                self.database.record_scrape_attempt(stockist=stockist.name)
-
-                stockist_results.append(
-                    StockistResult(
-                        name=stockist.name,
-                        success=False,
-                        duration_seconds=round(elapsed, 2),
-                        consecutive_failures=failure_count,
-                        error=str(e),
+                except Exception as e:
+                    log.warning(
+                        f"Error scraping {stockist.name} "
+                        f"(attempt {attempt}/{MAX_RETRY_ATTEMPTS}): {e}"
                     )
-                )
-                failed += 1
-                continue
-
-            log.info(f"Scraped {len(scraped)} items from {stockist.name}")
-
-            self.database.record_scrape_attempt(stockist=stockist.name)
-
-            if len(scraped) == 0:
-                failure_count = self.database.record_scraping_failure(stockist.name)
-
-                log.warning(
-                    f"No items returned from {stockist.name}. This may be a scraping failure "
-                    f"or the store genuinely has no amiibo. Consecutive failures: {failure_count}. "
-                    f"Skipping database update to prevent false 'delisted' notifications."
-                )
-
-                failed += 1
-                continue
-
-            validated_items, validation_errors = validate_products(scraped)
-            for error in validation_errors:
-                log.error(f"Invalid data from {stockist.name}: {error}")
-
-            validated_items = deduplicate_by_url(validated_items)
-
-            if not validated_items:
-                log.warning(f"No valid items from {stockist.name} after validation")
-                log.warning("Skipping database update to prevent false notifications")
-                self.database.record_scraping_failure(stockist.name)
-                failed += 1
-                continue
-
-            self.database.record_scraping_success(stockist.name)
-
-            current_count = len(validated_items)
-            healthy_count = self.database.get_last_healthy_count(stockist.name)
-            skip_delisting = False
-
-            if healthy_count > 0:
-                ratio = current_count / healthy_count
-                if ratio < STOCKIST_HEALTH_RATIO:
-                    unhealthy_obs = self.database.record_unhealthy_scrape(stockist.name)
-
-                    if unhealthy_obs < CONSECUTIVE_UNHEALTHY_THRESHOLD:
-                        log.warning(
-                            f"Stockist {stockist.name} may be unhealthy: "
-                            f"{current_count} items vs {healthy_count} baseline "
-                            f"(ratio {ratio:.2f} < {STOCKIST_HEALTH_RATIO}). "
-                            f"Skipping delisting. "
-                            f"({unhealthy_obs}/{CONSECUTIVE_UNHEALTHY_THRESHOLD} unhealthy observations)"
-                        )
-                        skip_delisting = True
+                    if attempt < MAX_RETRY_ATTEMPTS:
+                        wait_time = RETRY_BACKOFF_FACTOR**attempt
+                        log.info(f"Retrying {stockist.name} in {wait_time}s...")
+                        time.sleep(deadline.clamp(wait_time))
                     else:
-                        log.warning(
-                            f"Stockist {stockist.name}: accepting new baseline of "
-                            f"{current_count} items (previous: {healthy_count}) after "
-                            f"{unhealthy_obs} low observations"
-                        )
-                        self.database.record_healthy_scrape(
-                            stockist.name, current_count
-                        )
-                else:
-                    self.database.record_healthy_scrape(stockist.name, current_count)
-            else:
-                self.database.record_healthy_scrape(stockist.name, current_count)
+                        raise
+            raise RuntimeError("unreachable")
+        finally:
+            stockist.deadline = None
+            stockist.fetches = None
+
+    def _collect(
+        self, stockist: Any, previous_hash: str | None = None
+    ) -> StockistOutcome:
+        """Fetch, parse and validate one stockist.
+
+        Runs on a worker thread, so it must not touch the database or
+        messengers; everything it learns is returned for reconciliation.
+        """
+        log.info(f"Scraping {stockist.name}")
+        outcome = StockistOutcome(stockist=stockist)
+        start_time = time.monotonic()
 
-            to_notify = self.database.check_then_add_or_update_amiibo(
-                validated_items, skip_delisting=skip_delisting
+        try:
+            scraped = self._scrape_stockist(stockist, outcome.fetches)
+        except Exception as e:
+            log.error(f"Error scraping {stockist.name}: {e}", exc_info=True)
+            outcome.error = e
+        else:
+            outcome.scraped = scraped
+            log.info(f"Scraped {len(outcome.scraped)} items from {stockist.name}")
+            outcome.unchanged = bool(outcome.fetches) and not any(
+                fetch.changed for fetch in outcome.fetches
             )
-
-            if len(to_notify) == 0:
-                log.info(f"No changes detected for {stockist.name}")
-                elapsed = time.monotonic() - start_time
-                stockist_results.append(
-                    StockistResult(
-                        name=stockist.name,
-                        success=True,
-                        item_count=current_count,
-                        duration_seconds=round(elapsed, 2),
-                    )
+            if outcome.unchanged:
+                log.info(f"{stockist.name} not modified since last scrape")
+            elif outcome.scraped:
+                outcome.content_hash = listing_hash(outcome.scraped)
+                if outcome.content_hash == previous_hash:
+                    log.info(f"{stockist.name} listing unchanged since last scrape")
+                    outcome.unchanged = True
+            if outcome.scraped and not outcome.unchanged:
+                validated_items, outcome.validation_errors = validate_products(
+                    outcome.scraped
                 )
-                succeeded += 1
-                continue
-
-            suppressed = 0
-            for item in to_notify:
-                if self.database.should_suppress_notification(
-                    item["URL"], item["Website"], item["Stock"]
-                ):
-                    log.info(f"Skipping notification for {item['Title']} (cooldown)")
-                    suppressed += 1
-                    continue
-
-                idempotency_key = self.database.build_idempotency_key(
-                    item["URL"], item["Website"], item["Stock"]
+                # Deduplicate only valid items, so a broken first copy of a
+                # URL cannot push out a good one found later.
+                outcome.validated, outcome.duplicates_removed = Stockist.deduplicate(
+                    validated_items
                 )
+                if outcome.duplicates_removed:
+                    log.info(
+                        f"Removed {outcome.duplicates_removed} duplicate item(s) "
+                        f"from {stockist.name}"
+                    )
 
-                for messenger in self.messengers.all_messengers:
-                    if messenger.name not in stockist.messengers:
-                        continue
-                    if self.database.was_delivered_to(idempotency_key, messenger.name):
-                        continue
-
-                    result = messenger.send_embed_message(item)
-                    self.database.record_delivery(
-                        idempotency_key=idempotency_key,
-                        website=item["Website"],
-                        url=item["URL"],
-                        title=item["Title"],
-                        stock_status=item["Stock"],
-                        messenger_name=messenger.name,
-                        delivery_status=result.status.value,
+        outcome.elapsed = time.monotonic() - start_time
+        return outcome
+
+    def _remember_listing(self, outcome: StockistOutcome, skip_delisting: bool) -> None:
+        """Persist the listing hash and HTTP validators once the database reflects it.
+
+        A later hash match or 304 skips reconciliation entirely, so both are
+        only kept when nothing is left for a future reconcile to finish: no
+        delisting was deferred and no item is waiting out its grace period.
+        Otherwise the stored hash is cleared so the next scrape reconciles.
+        """
+        name = outcome.stockist.name
+        settled = not skip_delisting and not self.database.has_pending_misses(name)
+        self.database.record_content_hash(
+            name, outcome.content_hash if settled else None
+        )
+        if not settled:
+            log.debug(f"Not caching {name} listing: reconcile still pending")
+            return
+        if self.http_cache is None:
+            return
+        entries = {f.url: f.entry for f in outcome.fetches if f.entry is not None}
+        try:
+            self.http_cache.store(entries)
+        except OSError as e:
+            log.warning(f"Could not save HTTP cache for {name}: {e}")
+
+    def _poll_settings(self, stockist: Any) -> tuple[int, int]:
+        """Return (poll_interval, priority), applying any config override."""
+        poll_interval, priority = stockist.poll_interval, stockist.priority
+        override = self.schedule.get(stockist.site)
+        if override is not None:
+            if override.poll_interval is not None:
+                poll_interval = override.poll_interval
+            if override.priority is not None:
+                priority = override.priority
+        return poll_interval, priority
+
+    def _due_stockists(self, stockists: list[Any]) -> list[Any]:
+        """Return the stockists whose poll interval has elapsed, by priority.
+
+        Higher priority stockists are submitted first so they get a worker
+        straight away; equal priorities keep configuration order.
+        """
+        last_attempts = self.database.get_last_attempts()
+        now = datetime.now()
+        due: list[tuple[int, Any]] = []
+        for stockist in stockists:
+            poll_interval, priority = self._poll_settings(stockist)
+            last_attempt = last_attempts.get(stockist.name)
+            if last_attempt is not None:
+                elapsed = (now - last_attempt).total_seconds()
+                if elapsed < poll_interval * (1 - POLL_INTERVAL_TOLERANCE):
+                    log.info(
+                        f"Skipping {stockist.name}: last scraped {elapsed:.0f}s ago, "
+                        f"polled every {poll_interval}s"
                     )
-                    if result.status == DeliveryStatus.SUCCESS:
-                        notifications_sent += 1
+                    continue
+            due.append((priority, stockist))
+        due.sort(key=lambda entry: entry[0], reverse=True)
+        return [stockist for _, stockist in due]
 
-                self.database.record_notification(
-                    item["URL"], item["Website"], item["Stock"]
-                )
-            if suppressed:
-                log.info(
-                    f"Suppressed {suppressed} notification(s) for {stockist.name} "
-                    f"(cooldown)"
+    def scrape_cycle(self) -> CycleStats:
+        stats = CycleStats(succeeded=0, failed=0, notifications_sent=0)
+        all_stockists = list(self.stockists.all_stockists)
+        stockists = self._due_stockists(all_stockists) if all_stockists else []
+        stats.skipped = len(all_stockists) - len(stockists)
+        if not stockists:
+            self._flush_outbox(stats)
+            return stats
+
+        workers = min(self.max_workers, len(stockists))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="scrape"
+        ) as executor:
+            content_hashes = self.database.get_content_hashes()
+            futures = [
+                executor.submit(self._collect, s, content_hashes.get(s.name))
+                for s in stockists
+            ]
+            # Reconcile in submission (priority) order regardless of which
+            # fetch finishes first so database writes and alerts stay
+            # deterministic.
+            for future in futures:
+                self._reconcile(future.result(), stats)
+
+        self._flush_outbox(stats)
+        return stats
+
+    def _flush_outbox(self, stats: CycleStats) -> None:
+        # Alerts were queued with each stockist's diff. A background worker
+        # only needs waking; a one-shot run delivers them, retrying transient
+        # failures for a while, before returning.
+        if self.outbox.running:
+            self.outbox.wake()
+        else:
+            stats.notifications_sent += self.outbox.flush()
+
+    def _reconcile(self, outcome: StockistOutcome, stats: CycleStats) -> None:
+        stockist = outcome.stockist
+        start_time = time.monotonic() - outcome.elapsed
+
+        if outcome.error is not None:
+            health = self.database.record_stockist_outcome(stockist.name, None)
+
+            stats.stockist_results.append(
+                StockistResult(
+                    name=stockist.name,
+                    success=False,
+                    duration_seconds=round(outcome.elapsed, 2),
+                    consecutive_failures=health.consecutive_failures,
+                    error=str(outcome.error),
                 )
-            elapsed = time.monotonic() - start_time
-            stockist_results.append(
+            )
+            stats.failed += 1
+            return
+
+        stats.duplicates_removed += outcome.duplicates_removed
+        if outcome.unchanged:
+            self.database.record_stockist_heartbeat(stockist.name)
+            stats.stockist_results.append(
                 StockistResult(
                     name=stockist.name,
                     success=True,
-                    item_count=current_count,
-                    duration_seconds=round(elapsed, 2),
+                    item_count=len(outcome.scraped),
+                    duration_seconds=round(outcome.elapsed, 2),
+                    duplicates_removed=outcome.duplicates_removed,
                 )
             )
-            succeeded += 1
+            stats.succeeded += 1
+            return
+
+        if len(outcome.scraped) == 0:
+            health = self.database.record_stockist_outcome(stockist.name, None)
+
+            log.warning(
+                f"No items returned from {stockist.name}. This may be a scraping failure "
+                f"or the store genuinely has no amiibo. Consecutive failures: "
+                f"{health.consecutive_failures}. "
+                f"Skipping database update to prevent false 'delisted' notifications."
+            )
 
-        return CycleStats(
-            succeeded=succeeded,
-            failed=failed,
-            notifications_sent=notifications_sent,
-            stockist_results=stockist_results,
+            stats.failed += 1
+            return
+
+        for error in outcome.validation_errors:
+            log.error(f"Invalid data from {stockist.name}: {error}")
+
+        validated_items = outcome.validated
+
+        if not validated_items:
+            log.warning(f"No valid items from {stockist.name} after validation")
+            log.warning("Skipping database update to prevent false notifications")
+            self.database.record_stockist_outcome(stockist.name, None)
+            stats.failed += 1
+            return
+
+        current_count = len(validated_items)
+        health = self.database.record_stockist_outcome(stockist.name, current_count)
+        skip_delisting = health.skip_delisting
+
+        if health.unhealthy_obs:
+            ratio = current_count / health.baseline_count
+            if skip_delisting:
+                log.warning(
+                    f"Stockist {stockist.name} may be unhealthy: "
+                    f"{current_count} items vs {health.baseline_count} baseline "
+                    f"(ratio {ratio:.2f} < {STOCKIST_HEALTH_RATIO}). "
+                    f"Skipping delisting. "
+                    f"({health.unhealthy_obs}/{CONSECUTIVE_UNHEALTHY_THRESHOLD} unhealthy observations)"
+                )
+            else:
+                log.warning(
+                    f"Stockist {stockist.name}: accepting new baseline of "
+                    f"{current_count} items (previous: {health.baseline_count}) after "
+                    f"{health.unhealthy_obs} low observations"
+                )
+
+        targets = [
+            messenger.name
+            for messenger in self.messengers.all_messengers
+            if messenger.name in stockist.messengers
+        ]
+        to_notify = self.database.check_then_add_or_update_amiibo(
+            validated_items, skip_delisting=skip_delisting, notify=targets
+        )
+        self._remember_listing(outcome, skip_delisting)
+
+        if len(to_notify) == 0:
+            log.info(f"No changes detected for {stockist.name}")
+        elapsed = time.monotonic() - start_time
+        stats.stockist_results.append(
+            StockistResult(
+                name=stockist.name,
+                success=True,
+                item_count=current_count,
+                duration_seconds=round(elapsed, 2),
+                duplicates_removed=outcome.duplicates_removed,
+            )
         )
+        stats.succeeded += 1
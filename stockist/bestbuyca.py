@@ -1,12 +1,26 @@
-import json
 import logging
 
+from pydantic import BaseModel
 
+from constants import FAST_STOCKIST_POLL_INTERVAL
+from models import Product
+from stockist.parsing import decode_json
 from stockist.stockist import Stock, Stockist
 
 log = logging.getLogger(__name__)
 
 
+class _Product(BaseModel):
+    name: str
+    thumbnailImage: str
+    productUrl: str
+    salePrice: float | str | None
+
+
+class _SearchPage(BaseModel):
+    products: list[_Product] = []
+
+
 class BestbuyCA(Stockist):
     def __init__(self, messengers):
         super().__init__(messengers=messengers)
@@ -15,41 +29,37 @@ class BestbuyCA(Stockist):
 
     base_url = "https://www.bestbuy.ca/api/v2/json/search"
     name = "Bestbuy CA"
+    poll_interval = FAST_STOCKIST_POLL_INTERVAL
+    priority = 10
 
     def get_amiibo(self):
         all_found = []
 
         response = self.scrape(url=self.base_url, payload=self.params)
 
-        try:
-            cards = json.loads(response.content.decode("utf-8"))
-        except json.JSONDecodeError as exc:
-            log.error(f"Invalid JSON: {exc.msg}, line {exc.lineno}, column {exc.colno}")
-            return all_found
-        except AttributeError as e:
-            log.error(f"Invalid attribute: {e}")
+        page = decode_json(_SearchPage, response.content)
+        if page is None:
             return all_found
 
-        if "products" in cards:
-            for card in cards["products"]:
-                # Convert price to string with currency symbol
-                price_value = card["salePrice"]
-                price = (
-                    f"${price_value:.2f}"
-                    if isinstance(price_value, (int, float))
-                    else str(price_value)
-                )
-
-                found = {
-                    "Colour": 0x00FF00,
-                    "Title": card["name"].strip(),
-                    "Image": card["thumbnailImage"].strip(),
-                    "URL": f"https://www.bestbuy.ca{card['productUrl'].strip()}",
-                    "Price": price,
-                    "Stock": Stock.IN_STOCK.value,
-                    "Website": self.name,
-                }
-
-                all_found.append(found)
+        for card in page.products:
+            # Convert price to string with currency symbol
+            price_value = card.salePrice
+            price = (
+                f"${price_value:.2f}"
+                if isinstance(price_value, float)
+                else str(price_value)
+            )
+
+            found = Product(
+                colour=0x00FF00,
+                title=card.name.strip(),
+                image=card.thumbnailImage.strip(),
+                url=f"https://www.bestbuy.ca{card.productUrl.strip()}",
+                price=price,
+                stock=Stock.IN_STOCK.value,
+                website=self.name,
+            )
+
+            all_found.append(found)
 
         return all_found
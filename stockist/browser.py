@@ -0,0 +1,167 @@
+import logging
+import queue
+import secrets
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from constants import (
+    FALLBACK_USER_AGENTS,
+    SELENIUM_MAX_PAGES_PER_DRIVER,
+    SELENIUM_POOL_SIZE,
+    SELENIUM_WAIT_MAX,
+)
+from stockist.deadline import Deadline, DeadlineExceeded
+
+log = logging.getLogger(__name__)
+
+
+def create_chrome_driver() -> Any:
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    options.add_argument(f"user-agent={secrets.choice(FALLBACK_USER_AGENTS)}")
+
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(SELENIUM_WAIT_MAX)
+    driver.set_script_timeout(SELENIUM_WAIT_MAX)
+    return driver
+
+
+@dataclass
+class _PooledDriver:
+    driver: Any
+    pages: int = 0
+
+
+class BrowserPool:
+    """A bounded pool of warm headless browsers shared by all stockists.
+
+    ``lease()`` hands out an idle driver, starting one only when none is
+    idle and fewer than ``size`` exist; otherwise it waits for a release.
+    A driver is quit and replaced after ``max_pages`` page loads or as soon
+    as a lease ends with an exception, and cookies are cleared before a
+    driver goes back to the pool so stockists never share a session.
+    """
+
+    def __init__(
+        self,
+        size: int = SELENIUM_POOL_SIZE,
+        max_pages: int = SELENIUM_MAX_PAGES_PER_DRIVER,
+        factory: Callable[[], Any] = create_chrome_driver,
+    ) -> None:
+        self.size = size
+        self.max_pages = max_pages
+        self._factory = factory
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: queue.LifoQueue[_PooledDriver] = queue.LifoQueue()
+        self._closed = False
+
+    @contextmanager
+    def lease(
+        self, deadline: Deadline | None = None, name: str | None = None
+    ) -> Iterator[Any]:
+        """Lend a driver until the ``with`` block ends.
+
+        With a ``deadline``, waiting for a free browser is bounded by the
+        remaining budget, and a budget that runs out while a browser starts
+        raises ``DeadlineExceeded`` before the driver is handed over.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        if deadline is None:
+            self._slots.acquire()
+        elif not self._slots.acquire(timeout=deadline.remaining()):
+            raise DeadlineExceeded(
+                f"{name} exceeded its {deadline.seconds}s time budget "
+                "waiting for a browser"
+            )
+        try:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                log.info("Starting headless browser for the Selenium pool")
+                pooled = _PooledDriver(driver=self._factory())
+
+            if deadline is not None and deadline.expired:
+                self._release(pooled)
+                deadline.check(name)
+
+            try:
+                yield pooled.driver
+            except BaseException:
+                self._discard(pooled, reason="lease failed")
+                raise
+            self._release(pooled)
+        finally:
+            self._slots.release()
+
+    def _release(self, pooled: _PooledDriver) -> None:
+        pooled.pages += 1
+        if self._closed:
+            self._discard(pooled, reason="pool closed")
+            return
+        if pooled.pages >= self.max_pages:
+            self._discard(pooled, reason=f"served {pooled.pages} pages")
+            return
+        try:
+            # delete_all_cookies only reaches the current page's domain, so
+            # leave the page and clear the whole browser's jar over CDP.
+            pooled.driver.get("about:blank")
+            pooled.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception as e:
+            self._discard(pooled, reason=f"could not clear cookies: {e}")
+            return
+        self._idle.put(pooled)
+
+    def _discard(self, pooled: _PooledDriver, reason: str) -> None:
+        log.info(f"Recycling Selenium driver: {reason}")
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            log.warning(f"Error closing Selenium driver: {e}")
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(pooled, reason="pool closed")
+
+
+_pool: BrowserPool | None = None
+_pool_size = SELENIUM_POOL_SIZE
+_pool_max_pages = SELENIUM_MAX_PAGES_PER_DRIVER
+_pool_lock = threading.Lock()
+
+
+def configure_browser_pool(size: int, max_pages: int) -> None:
+    """Set the pool limits used when the shared pool is first needed."""
+    global _pool_size, _pool_max_pages
+    with _pool_lock:
+        _pool_size = size
+        _pool_max_pages = max_pages
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(size=_pool_size, max_pages=_pool_max_pages)
+    return _pool
+
+
+def close_browser_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
@@ -1,12 +1,38 @@
-import json
 import logging
 
+from pydantic import BaseModel
 
+from constants import FAST_STOCKIST_POLL_INTERVAL
+from models import Product
+from stockist.parsing import decode_json
 from stockist.stockist import Stock, Stockist
 
 log = logging.getLogger(__name__)
 
 
+class _ImageUrls(BaseModel):
+    medium: str
+
+
+class _Box(BaseModel):
+    boxId: str | int
+    boxName: str
+    imageUrls: _ImageUrls
+    sellPrice: int | float | str
+
+
+class _Data(BaseModel):
+    boxes: list[_Box] | None = None
+
+
+class _Response(BaseModel):
+    data: _Data | None = None
+
+
+class _BoxesPage(BaseModel):
+    response: _Response = _Response()
+
+
 class CexUK(Stockist):
     def __init__(self, messengers):
         super().__init__(messengers=messengers)
@@ -21,56 +47,53 @@ class CexUK(Stockist):
 
     base_url = "https://wss2.cex.uk.webuy.io/v3/boxes"
     name = "CeX UK"
+    poll_interval = FAST_STOCKIST_POLL_INTERVAL
+    priority = 10
 
     def get_amiibo(self):
         all_found = []
-        self.params["firstRecord"] = 1
 
         switch_params = [
             {"q": "amiibo figures", "categoryId": 997},
             {"q": "amiibo cards", "categoryId": 1104},
         ]
         for categories in switch_params:
-            self.params["q"] = categories["q"]
-            self.params["categoryId"] = categories["categoryId"]
-            for first_record in range(1, 1000, self.params["count"]):
-                self.params["firstRecord"] = first_record
-
-                response = self.scrape(url=self.base_url, payload=self.params)
-
-                try:
-                    cards = json.loads(response.content.decode("utf-8"))
-                except json.JSONDecodeError as exc:
-                    log.error(
-                        f"Invalid JSON: {exc.msg}, line {exc.lineno}, column {exc.colno}"
-                    )
-                    return all_found
-                except AttributeError as e:
-                    log.error(f"Invalid attribute: {e}")
-                    return all_found
-
-                if "response" in cards:
-                    if "data" in cards["response"]:
-                        if cards["response"]["data"] is None:
-                            break
-                        if "boxes" in cards["response"]["data"]:
-                            for card in cards["response"]["data"]["boxes"]:
-                                found = {
-                                    "Colour": 0x00FF00,
-                                    "Title": card["boxName"].strip(),
-                                    "Image": card["imageUrls"]["medium"].strip(),
-                                    "URL": f"https://uk.webuy.com/product-detail/?id={card['boxId']}",
-                                    "Price": f"£{card['sellPrice']}",
-                                    "Stock": Stock.IN_STOCK.value,
-                                    "Website": self.name,
-                                }
-
-                                all_found.append(found)
-                        else:
-                            break
-                    else:
-                        break
-                else:
-                    break
+            params = {**self.params, **categories}
+            all_found.extend(
+                self.fetch_pages(
+                    pages=range(1, 1000, params["count"]),
+                    request=lambda first_record, params=params: self.scrape(
+                        url=self.base_url,
+                        payload={**params, "firstRecord": first_record},
+                    ),
+                    parse=self._parse_page,
+                )
+            )
 
         return all_found
+
+    def _parse_page(self, first_record, response):
+        found_on_page = []
+
+        page = decode_json(_BoxesPage, response.content)
+        if page is None:
+            return found_on_page
+
+        data = page.response.data
+        if data is None or not data.boxes:
+            return found_on_page
+
+        for card in data.boxes:
+            found = Product(
+                colour=0x00FF00,
+                title=card.boxName.strip(),
+                image=card.imageUrls.medium.strip(),
+                url=f"https://uk.webuy.com/product-detail/?id={card.boxId}",
+                price=f"£{card.sellPrice}",
+                stock=Stock.IN_STOCK.value,
+                website=self.name,
+            )
+
+            found_on_page.append(found)
+
+        return found_on_page
@@ -0,0 +1,33 @@
+import time
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stockist has used up its scrape time budget."""
+
+
+class Deadline:
+    """Wall-clock budget shared by every fetch made for one stockist.
+
+    Fetch helpers clamp their own timeouts to ``remaining()`` and call
+    ``check()`` before and after each request, so retries, pagination and
+    browser fallbacks all stop once the budget is spent.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clamp(self, timeout: float) -> float:
+        """Return ``timeout`` shortened to fit the remaining budget."""
+        return min(timeout, self.remaining())
+
+    def check(self, name: str | None) -> None:
+        if self.expired:
+            raise DeadlineExceeded(f"{name} exceeded its {self.seconds}s time budget")
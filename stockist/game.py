@@ -1,11 +1,18 @@
 import logging
 
-from bs4 import BeautifulSoup
-
-from stockist.stockist import Stock, Stockist
+from stockist.parsing import CardSelector, Extractor, Field, class_prefix
+from stockist.stockist import Stockist
 
 log = logging.getLogger(__name__)
 
+_EXTRACTOR = Extractor(
+    cards=CardSelector("article", "product"),
+    title=Field("a", index=1),
+    url=Field("a", index=1, attr="href"),
+    price=Field(class_prefix("value", "span")),
+    image=Field(class_prefix("optimisedImg", "img"), attr="src"),
+)
+
 
 class Game(Stockist):
     def __init__(self, messengers):
@@ -21,45 +28,14 @@ class Game(Stockist):
     name = "Game UK"
 
     def get_amiibo(self):
-        all_found = []
-
-        response = self.scrape(url=self.base_url, payload=self.params)
-        soup = BeautifulSoup(response.content, "html.parser")
-        cards = soup.find_all("article", class_="product")
+        # The listing is one large page, so products are extracted while
+        # it streams in rather than after the whole DOM has been built.
+        chunks = self.scrape_stream(url=self.base_url, payload=self.params)
+        found = list(_EXTRACTOR.iter_extract(chunks, website=self.name))
 
-        if len(cards) == 0:
+        if len(found) == 0:
             log.info("Requests library failed, attempting with selenium")
             response = self.scrape_with_selenium(url=self.base_url, payload=self.params)
-            soup = BeautifulSoup(response, "html.parser")
-            log.info(soup)
-            cards = soup.find_all("article", class_="product")
-        for card in cards:
-            name = card.find_all("a")
-            price = card.find_all(
-                "span", attrs={"class": lambda e: e.startswith("value") if e else False}
-            )
-            img = card.find_all(
-                "img",
-                attrs={"class": lambda e: e.startswith("optimisedImg") if e else False},
-            )
-            if name and price and img:
-                name = name[1]
-                price = price[0]
-                img = img[0]
-                url = name
-            else:
-                continue
-
-            found = {
-                "Colour": 0x00FF00,
-                "Title": name.text.strip(),
-                "Image": img["src"].strip(),
-                "URL": f"{url['href'].strip()}",
-                "Price": price.text.strip(),
-                "Stock": Stock.IN_STOCK.value,
-                "Website": self.name,
-            }
-
-            all_found.append(found)
+            found = _EXTRACTOR.extract(_EXTRACTOR.cards.parse(response), self.name)
 
-        return all_found
+        return found
@@ -1,11 +1,23 @@
 import logging
 
-from bs4 import BeautifulSoup
-
-from stockist.stockist import Stock, Stockist
+from constants import SLOW_STOCKIST_POLL_INTERVAL
+from stockist.parsing import CardSelector, Extractor, Field, class_prefix
+from stockist.stockist import Stockist
 
 log = logging.getLogger(__name__)
 
+_EXTRACTOR = Extractor(
+    cards=CardSelector("div", "product", "grid-tile"),
+    title=Field(class_prefix("pd-name", "p")),
+    url=Field(
+        class_prefix("product-tile-link", "a"),
+        attr="href",
+        prefix="https://www.gamestop.com",
+    ),
+    price=Field(class_prefix("actual-price", "span")),
+    image=Field(class_prefix("tile-image", "img"), attr="src"),
+)
+
 
 class Gamestop(Stockist):
     def __init__(self, messengers):
@@ -15,58 +27,16 @@ class Gamestop(Stockist):
 
     base_url = "https://www.gamestop.com/consoles-hardware/nintendo-switch/nintendo-switch-amiibo"
     name = "Gamestop US"
+    poll_interval = SLOW_STOCKIST_POLL_INTERVAL
+    priority = -10
 
     def get_amiibo(self):
-        all_found = []
-
         response = self.scrape_with_selenium(url=self.base_url, payload=self.params)
-
-        soup = BeautifulSoup(response, "html.parser")
-        cards = soup.find_all("div", class_="product grid-tile")
+        cards = _EXTRACTOR.cards.parse(response)
 
         if len(cards) == 0:
             log.info("Selenium failed, attempting with requests")
             response = self.scrape(url=self.base_url, payload=self.params)
-            soup = BeautifulSoup(response.content, "html.parser")
-            cards = soup.find_all("div", class_="product grid-tile")
-
-        for card in cards:
-            name = card.find_all(
-                "p", attrs={"class": lambda e: e.startswith("pd-name") if e else False}
-            )
-            price = card.find_all(
-                "span",
-                attrs={"class": lambda e: e.startswith("actual-price") if e else False},
-            )
-            img = card.find_all(
-                "img",
-                attrs={"class": lambda e: e.startswith("tile-image") if e else False},
-            )
-            url = card.find_all(
-                "a",
-                attrs={
-                    "class": lambda e: e.startswith("product-tile-link") if e else False
-                },
-            )
-
-            if name and price and img and url:
-                name = name[0]
-                price = price[0]
-                img = img[0]
-                url = url[0]
-            else:
-                continue
-
-            found = {
-                "Colour": 0x00FF00,
-                "Title": name.text.strip(),
-                "Image": img["src"].strip(),
-                "URL": f"https://www.gamestop.com{url['href'].strip()}",
-                "Price": price.text.strip(),
-                "Stock": Stock.IN_STOCK.value,
-                "Website": self.name,
-            }
-
-            all_found.append(found)
+            cards = _EXTRACTOR.cards.parse(response.content)
 
-        return all_found
+        return _EXTRACTOR.extract(cards, website=self.name)
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    etag: str | None
+    last_modified: str | None
+    body: bytes
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class Fetch:
+    """One page request made while scraping a stockist.
+
+    ``entry`` holds the validators and body to remember once the stockist
+    has been reconciled; it is ``None`` when the page was served from the
+    cache or the server sent no validators.
+    """
+
+    url: str
+    changed: bool
+    entry: CacheEntry | None = None
+
+
+class CachedResponse:
+    """Stands in for a ``requests.Response`` when the server answered 304."""
+
+    status_code = 304
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+
+class ValidatorCache:
+    """ETag/Last-Modified validators and bodies, keyed by full request URL.
+
+    The index is a small JSON file and each body is stored beside it, so
+    the cache survives restarts. Nothing is read or written until the
+    cache is first used.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._index_path = path / "index.json"
+        self._index: dict[str, dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _body_name(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._index is None:
+            try:
+                self._index = json.loads(self._index_path.read_text())
+            except FileNotFoundError:
+                self._index = {}
+            except (OSError, ValueError) as e:
+                log.warning(f"Ignoring unreadable HTTP cache index: {e}")
+                self._index = {}
+        return self._index
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        with self._lock:
+            meta = self._load().get(url)
+            if meta is None:
+                return None
+            try:
+                body = (self.path / meta["body"]).read_bytes()
+            except OSError:
+                return None
+        return CacheEntry(
+            etag=meta.get("etag"), last_modified=meta.get("last_modified"), body=body
+        )
+
+    def store(self, entries: dict[str, CacheEntry]) -> None:
+        """Persist validators and bodies for the given URLs."""
+        if not entries:
+            return
+        with self._lock:
+            index = self._load()
+            self.path.mkdir(parents=True, exist_ok=True)
+            for url, entry in entries.items():
+                name = self._body_name(url)
+                (self.path / name).write_bytes(entry.body)
+                index[url] = {
+                    "etag": entry.etag,
+                    "last_modified": entry.last_modified,
+                    "body": name,
+                }
+            tmp_path = self._index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(index))
+            os.replace(tmp_path, self._index_path)
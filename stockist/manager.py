@@ -52,6 +52,7 @@ class StockistManager:
             stockist_class = STOCKIST_FACTORY[stockist_url]
             try:
                 stockist_instance = stockist_class(messengers=messenger_names)
+                stockist_instance.site = stockist_url
                 self.all_stockists.append(stockist_instance)
                 log.info(f"Now tracking {stockist_url}")
             except Exception as e:
@@ -1,11 +1,19 @@
 import logging
 
-from bs4 import BeautifulSoup
-
-from stockist.stockist import Stock, Stockist
+from stockist.parsing import CardSelector, Extractor, Field, class_prefix
+from stockist.stockist import Stockist
 
 log = logging.getLogger(__name__)
 
+_EXTRACTOR = Extractor(
+    cards=CardSelector("article", "product-miniature"),
+    title=Field(class_prefix("product-title", "h2") + " a"),
+    url=Field("a", attr="href"),
+    price=Field(class_prefix("price", "span")),
+    image=Field("img", attr="src"),
+    exclude=(class_prefix("oos-label", "div"),),
+)
+
 
 class MecchaJapan(Stockist):
     def __init__(self, messengers):
@@ -17,67 +25,20 @@ class MecchaJapan(Stockist):
     name = "Meccha Japan"
 
     def get_amiibo(self):
-        options = range(1, 5)
-
-        all_found = []
-
-        for each in options:
-            response = self.scrape(url=f"{self.base_url}{each}", payload=self.params)
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            cards = soup.find_all("article", class_="product-miniature")
-
-            if len(cards) == 0:
-                log.info("Requests library failed, attempting with selenium")
-                response = self.scrape_with_selenium(
-                    url=self.base_url, payload=self.params
-                )
-                soup = BeautifulSoup(response, "html.parser")
-                cards = soup.find_all("article", class_="product-miniature")
-
-            for card in cards:
-                header = card.find_all(
-                    "h2",
-                    attrs={
-                        "class": lambda e: e.startswith("product-title") if e else False
-                    },
-                )
-                if header:
-                    name = header[0].find_all("a")
-                else:
-                    continue
-
-                price = card.find_all(
-                    "span",
-                    attrs={"class": lambda e: e.startswith("price") if e else False},
-                )
-                img = card.find_all("img")
-                url = card.find_all("a")
-                oos = card.find_all(
-                    "div",
-                    attrs={
-                        "class": lambda e: e.startswith("oos-label") if e else False
-                    },
-                )
-
-                if name and price and img and url and not oos:
-                    name = name[0]
-                    price = price[0]
-                    img = img[0]
-                    url = url[0]
-                else:
-                    continue
-
-                found = {
-                    "Colour": 0x00FF00,
-                    "Title": name.text.strip(),
-                    "Image": f"{img['src'].strip()}",
-                    "URL": f"{url['href'].strip()}",
-                    "Price": price.text.strip(),
-                    "Stock": Stock.IN_STOCK.value,
-                    "Website": self.name,
-                }
-
-                all_found.append(found)
-
-        return all_found
+        return self.fetch_pages(
+            pages=range(1, 5),
+            request=lambda page: self.scrape(
+                url=f"{self.base_url}{page}", payload=self.params
+            ),
+            parse=self._parse_page,
+        )
+
+    def _parse_page(self, page, response):
+        cards = _EXTRACTOR.cards.parse(response.content)
+
+        if len(cards) == 0:
+            log.info("Requests library failed, attempting with selenium")
+            response = self.scrape_with_selenium(url=self.base_url, payload=self.params)
+            cards = _EXTRACTOR.cards.parse(response)
+
+        return _EXTRACTOR.extract(cards, website=self.name)
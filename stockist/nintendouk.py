@@ -1,12 +1,35 @@
-import json
 import logging
 
+from pydantic import BaseModel
 
+from constants import FAST_STOCKIST_POLL_INTERVAL
+from models import Product
+from stockist.parsing import decode_json
 from stockist.stockist import Stock, Stockist
 
 log = logging.getLogger(__name__)
 
 
+class _Availability(BaseModel):
+    type: str
+
+
+class _Product(BaseModel):
+    name: str
+    pricePerUnit: float | str | None
+    c_productImages: list[str]
+    path: str
+    c_availabilityModel: _Availability
+
+
+class _Data(BaseModel):
+    products: list[_Product] | None = None
+
+
+class _CatalogPage(BaseModel):
+    data: _Data | None = None
+
+
 class NintendoUK(Stockist):
     def __init__(self, messengers):
         super().__init__(messengers=messengers)
@@ -21,71 +44,55 @@ class NintendoUK(Stockist):
 
     base_url = "https://store.nintendo.co.uk/api/catalog/products"
     name = "Nintendo UK"
+    poll_interval = FAST_STOCKIST_POLL_INTERVAL
+    priority = 10
 
     def get_amiibo(self):
-        all_found = []
-        complete = False
-        self.params["offset"] = 0
-
-        while not complete:
-            response = self.scrape(url=self.base_url, payload=self.params)
-
-            try:
-                cards = json.loads(response.content.decode("utf-8"))
-            except json.JSONDecodeError as exc:
-                log.error(
-                    f"Invalid JSON: {exc.msg}, line {exc.lineno}, column {exc.colno}"
-                )
-                cards = []
-            except AttributeError as e:
-                log.error(f"Invalid attribute: {e}")
-                cards = []
-
-            if len(cards) > 0:
-                if "data" in [*cards]:
-                    log.debug(f'{cards["data"]}')
-                    if cards["data"] is None:
-                        log.warning("No data returned from API")
-                        break
-                    if "products" in cards["data"]:
-                        log.debug(f'{cards["data"]["products"]}')
-                        if len(cards["data"]["products"]) == 0:
-                            complete = True
-                        for card in cards["data"]["products"]:
-                            name = card["name"]
-                            price_value = card["pricePerUnit"]
-                            # Convert float price to string with currency symbol
-                            price = (
-                                f"£{price_value:.2f}"
-                                if isinstance(price_value, (int, float))
-                                else str(price_value)
-                            )
-                            img = card["c_productImages"][0]
-                            url = card["path"]
-                            stock = card["c_availabilityModel"]["type"]
-
-                            found = {
-                                "Colour": 0x0000FF,
-                                "Title": name,
-                                "Image": f"https://assets.nintendo.eu/image/upload/v1654696477/{img}",
-                                "URL": f"https://store.nintendo.co.uk{url}",
-                                "Price": price,
-                                "Stock": "",
-                                "Website": self.name,
-                            }
-
-                            if stock == "OutOfStock":
-                                found["Colour"] = 0xFF0000
-                                found["Stock"] = Stock.OUT_OF_STOCK.value
-                            else:
-                                found["Colour"] = 0x00FF00
-                                found["Stock"] = Stock.IN_STOCK.value
-
-                            if found not in all_found:
-                                all_found.append(found)
-                        self.params["offset"] += 24
-                        if self.params["offset"] > 500:
-                            break
-            else:
-                break
-        return all_found
+        return self.fetch_pages(
+            pages=range(0, 501, self.params["limit"]),
+            request=lambda offset: self.scrape(
+                url=self.base_url, payload={**self.params, "offset": offset}
+            ),
+            parse=self._parse_page,
+        )
+
+    def _parse_page(self, offset, response):
+        found_on_page = []
+
+        page = decode_json(_CatalogPage, response.content)
+        if page is None:
+            return found_on_page
+
+        if page.data is None:
+            log.warning("No data returned from API")
+            return found_on_page
+        if page.data.products is None:
+            return found_on_page
+
+        log.debug(f"{self.name}: {len(page.data.products)} products at {offset}")
+        for card in page.data.products:
+            name = card.name
+            price_value = card.pricePerUnit
+            # Convert float price to string with currency symbol
+            price = (
+                f"£{price_value:.2f}"
+                if isinstance(price_value, float)
+                else str(price_value)
+            )
+            img = card.c_productImages[0]
+            url = card.path
+            stock = card.c_availabilityModel.type
+
+            out_of_stock = stock == "OutOfStock"
+            found = Product(
+                colour=0xFF0000 if out_of_stock else 0x00FF00,
+                title=name,
+                image=f"https://assets.nintendo.eu/image/upload/v1654696477/{img}",
+                url=f"https://store.nintendo.co.uk{url}",
+                price=price,
+                stock=(Stock.OUT_OF_STOCK if out_of_stock else Stock.IN_STOCK).value,
+                website=self.name,
+            )
+
+            found_on_page.append(found)
+        return found_on_page
@@ -0,0 +1,290 @@
+import codecs
+import logging
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Iterable, Iterator, TypeVar
+
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+from pydantic import BaseModel, ValidationError
+
+from constants import COLOR_IN_STOCK, COLOR_OUT_OF_STOCK
+from models import Product
+from stockist.stockist import Stock
+
+log = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+HTML_PARSER = "lxml"
+"""Tree builder for stockist pages: lxml's C parser."""
+
+_VOID_ELEMENTS = frozenset(
+    "area base br col embed hr img input link meta param source track wbr".split()
+)
+
+
+def decode_json(model: type[M], content: Any) -> M | None:
+    """Decode an API response body straight from its bytes into ``model``.
+
+    pydantic-core parses the bytes without an intermediate ``str`` and
+    creates Python objects only for the fields ``model`` declares. A body
+    that is not JSON is logged and gives ``None``, like an empty page; JSON
+    of the wrong shape raises ``ValidationError`` so the stockist fails
+    rather than reporting an empty listing.
+    """
+    try:
+        return model.model_validate_json(content)
+    except ValidationError as e:
+        error = e.errors()[0]
+        if error["type"] != "json_invalid":
+            raise
+        log.error(error["msg"])
+        return None
+
+
+def class_prefix(prefix: str, tag: str = "") -> str:
+    """CSS selector for ``tag`` elements with a class token starting ``prefix``.
+
+    Equivalent to the ``attrs={"class": lambda e: e.startswith(prefix)}``
+    predicates it replaces, but evaluated by a compiled selector.
+    """
+    return f':is({tag}[class^="{prefix}"], {tag}[class*=" {prefix}"])'
+
+
+class CardSelector:
+    """Product cards on a listing page, identified by tag and class tokens.
+
+    ``parse`` hands the tree builder a strainer so only the card elements
+    and their descendants become nodes; headers, footers, scripts and the
+    rest of the page are skipped while parsing rather than afterwards.
+    """
+
+    def __init__(self, tag: str, *classes: str) -> None:
+        # The strainer sees the raw class attribute, so every token is
+        # matched on word boundaries in any order.
+        tokens = "".join(rf"(?=(?:.*\s)?{re.escape(c)}(?:\s|$))" for c in classes)
+        self.tag = tag
+        self.class_pattern = re.compile(f"^{tokens}")
+        self.strainer = SoupStrainer(tag, class_=self.class_pattern)
+        self.selector = sv.compile(tag + "".join(f".{c}" for c in classes))
+
+    def parse(self, markup: Any) -> list[Tag]:
+        soup = BeautifulSoup(markup, HTML_PARSER, parse_only=self.strainer)
+        return self.selector.select(soup)
+
+    def is_card(self, tag: str, attrs: list[tuple[str, str | None]]) -> bool:
+        if tag != self.tag:
+            return False
+        classes = dict(attrs).get("class")
+        return classes is not None and self.class_pattern.search(classes) is not None
+
+    def iter_parse(
+        self, chunks: Iterable[bytes | str], encoding: str = "utf-8"
+    ) -> Iterator[Tag]:
+        """Yield cards as soon as their closing tag arrives in ``chunks``.
+
+        Only the markup of the card currently open is held in memory, so
+        the page never has to be downloaded or parsed as a whole.
+        """
+        stream = _CardStream(self)
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        for chunk in chunks:
+            stream.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+            yield from stream.drain()
+        stream.feed(decoder.decode(b"", final=True))
+        stream.close()
+        yield from stream.drain()
+
+
+class _CardStream(HTMLParser):
+    """Incremental tokenizer that cuts card markup out of a page.
+
+    Tokens outside a card are dropped as they are read. Inside a card they
+    are copied verbatim until the card's own end tag, and the fragment is
+    then parsed into a tree. End tags close any elements left open inside
+    them, as browsers do, so an unclosed ``<p>`` cannot swallow the page.
+    """
+
+    def __init__(self, cards: CardSelector) -> None:
+        super().__init__(convert_charrefs=False)
+        self._cards = cards
+        self._open: list[str] = []
+        self._markup: list[str] = []
+        self._completed: list[Tag] = []
+
+    def drain(self) -> list[Tag]:
+        completed, self._completed = self._completed, []
+        return completed
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if not self._open and not self._cards.is_card(tag, attrs):
+            return
+        self._markup.append(self.get_starttag_text() or "")
+        if tag not in _VOID_ELEMENTS:
+            self._open.append(tag)
+        elif not self._open:
+            self._finish_card()
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._open:
+            self._markup.append(self.get_starttag_text() or "")
+        elif self._cards.is_card(tag, attrs):
+            self._markup.append(self.get_starttag_text() or "")
+            self._finish_card()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag not in self._open:
+            return
+        while self._open:
+            closed = self._open.pop()
+            self._markup.append(f"</{closed}>")
+            if closed == tag:
+                break
+        if not self._open:
+            self._finish_card()
+
+    def handle_data(self, data: str) -> None:
+        if self._open:
+            self._markup.append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        if self._open:
+            self._markup.append(f"&{name};")
+
+    def handle_charref(self, name: str) -> None:
+        if self._open:
+            self._markup.append(f"&#{name};")
+
+    def _finish_card(self) -> None:
+        self._completed.extend(self._cards.parse("".join(self._markup)))
+        self._markup.clear()
+
+
+@dataclass(frozen=True)
+class Field:
+    """Where one product value lives inside a card.
+
+    ``selector`` is matched against the card's descendants and the
+    ``index``-th match is used: its text, or its ``attr`` attribute, with
+    surrounding whitespace removed and ``prefix`` prepended.
+    """
+
+    selector: str
+    attr: str | None = None
+    index: int = 0
+    prefix: str = ""
+
+
+@dataclass(frozen=True)
+class StockField:
+    """Stock status from the text of the first element matching ``selector``.
+
+    With ``out_of_stock`` the product is out of stock only when the text
+    equals it; with ``in_stock`` it is in stock only when the text equals it.
+    """
+
+    selector: str
+    in_stock: str | None = None
+    out_of_stock: str | None = None
+
+    def is_in_stock(self, text: str) -> bool:
+        if self.out_of_stock is not None:
+            return text != self.out_of_stock
+        return text == self.in_stock
+
+
+class Extractor:
+    """Declarative product extraction for an HTML listing.
+
+    A stockist declares its cards, one ``Field`` per product value, an
+    optional ``StockField`` (products are in stock without one), and
+    selectors a card must (``require``) or must not (``exclude``) contain.
+    Every selector is compiled once, when the extractor is created, and
+    each card is walked once with all selectors tested per element. A card
+    missing any value is skipped.
+    """
+
+    def __init__(
+        self,
+        cards: CardSelector,
+        title: Field,
+        url: Field,
+        price: Field,
+        image: Field,
+        stock: StockField | None = None,
+        require: tuple[str, ...] = (),
+        exclude: tuple[str, ...] = (),
+    ) -> None:
+        self.cards = cards
+        self.stock = stock
+        fields = {"Title": title, "URL": url, "Price": price, "Image": image}
+        if stock is not None:
+            fields["Stock"] = Field(stock.selector)
+        self._fields = [
+            (name, sv.compile(field.selector), field) for name, field in fields.items()
+        ]
+        self._require = [sv.compile(selector) for selector in require]
+        self._exclude = [sv.compile(selector) for selector in exclude]
+
+    def extract(self, cards: list[Tag], website: str | None) -> list[Product]:
+        items = []
+        for card in cards:
+            item = self._extract_card(card, website)
+            if item is not None:
+                items.append(item)
+        return items
+
+    def iter_extract(
+        self, chunks: Iterable[bytes | str], website: str | None
+    ) -> Iterator[Product]:
+        """Yield products while ``chunks`` of the page are still arriving."""
+        for card in self.cards.iter_parse(chunks):
+            item = self._extract_card(card, website)
+            if item is not None:
+                yield item
+
+    def _extract_card(self, card: Tag, website: str | None) -> Product | None:
+        seen = [0] * len(self._fields)
+        matched: dict[str, Tag] = {}
+        required = [False] * len(self._require)
+
+        for element in card.descendants:
+            if not isinstance(element, Tag):
+                continue
+            for selector in self._exclude:
+                if selector.match(element):
+                    return None
+            for i, selector in enumerate(self._require):
+                if not required[i] and selector.match(element):
+                    required[i] = True
+            for i, (name, selector, field) in enumerate(self._fields):
+                if name in matched or not selector.match(element):
+                    continue
+                if seen[i] == field.index:
+                    matched[name] = element
+                seen[i] += 1
+
+        if not all(required) or len(matched) != len(self._fields):
+            return None
+
+        values: dict[str, str] = {}
+        for name, _, field in self._fields:
+            element = matched[name]
+            raw = element.text if field.attr is None else element.get(field.attr)
+            if not isinstance(raw, str):
+                return None
+            values[name] = field.prefix + raw.strip()
+
+        in_stock = self.stock is None or self.stock.is_in_stock(values["Stock"])
+        return Product(
+            colour=COLOR_IN_STOCK if in_stock else COLOR_OUT_OF_STOCK,
+            title=values["Title"],
+            image=values["Image"],
+            url=values["URL"],
+            price=values["Price"],
+            stock=(Stock.IN_STOCK if in_stock else Stock.OUT_OF_STOCK).value,
+            website=website,
+        )
@@ -1,11 +1,18 @@
 import logging
 
-from bs4 import BeautifulSoup
-
-from stockist.stockist import Stock, Stockist
+from stockist.parsing import CardSelector, Extractor, Field, class_prefix
+from stockist.stockist import Stockist
 
 log = logging.getLogger(__name__)
 
+_EXTRACTOR = Extractor(
+    cards=CardSelector("div", "p_prev"),
+    title=Field(class_prefix("p_prev_n", "span")),
+    url=Field("a", attr="href", prefix="https://www.play-asia.com"),
+    price=Field(class_prefix("price_val", "span")),
+    image=Field(class_prefix("p_prev_img", "img"), attr="src", prefix="https:"),
+)
+
 
 class PlayAsia(Stockist):
     def __init__(self, messengers):
@@ -17,62 +24,20 @@ class PlayAsia(Stockist):
     name = "Playasia"
 
     def get_amiibo(self):
-        options = range(1, 11)
-
-        all_found = []
-
-        for each in options:
-            response = self.scrape(url=f"{self.base_url}{each}", payload=self.params)
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            cards = soup.find_all("div", class_="p_prev")
-
-            if len(cards) == 0:
-                log.info("Requests library failed, attempting with selenium")
-                response = self.scrape_with_selenium(
-                    url=self.base_url, payload=self.params
-                )
-                soup = BeautifulSoup(response, "html.parser")
-                cards = soup.find_all("div", class_="p_prev")
-
-            for card in cards:
-                name = card.find_all(
-                    "span",
-                    attrs={"class": lambda e: e.startswith("p_prev_n") if e else False},
-                )
-                price = card.find_all(
-                    "span",
-                    attrs={
-                        "class": lambda e: e.startswith("price_val") if e else False
-                    },
-                )
-                img = card.find_all(
-                    "img",
-                    attrs={
-                        "class": lambda e: e.startswith("p_prev_img") if e else False
-                    },
-                )
-                url = card.find_all("a")
-
-                if name and price and img and url:
-                    name = name[0]
-                    price = price[0]
-                    img = img[0]
-                    url = url[0]
-                else:
-                    continue
-
-                found = {
-                    "Colour": 0x00FF00,
-                    "Title": name.text.strip(),
-                    "Image": f"https:{img['src'].strip()}",
-                    "URL": f"https://www.play-asia.com{url['href'].strip()}",
-                    "Price": price.text.strip(),
-                    "Stock": Stock.IN_STOCK.value,
-                    "Website": self.name,
-                }
-
-                if found not in all_found:
-                    all_found.append(found)
-
-        return all_found
+        return self.fetch_pages(
+            pages=range(1, 11),
+            request=lambda page: self.scrape(
+                url=f"{self.base_url}{page}", payload=self.params
+            ),
+            parse=self._parse_page,
+        )
+
+    def _parse_page(self, page, response):
+        cards = _EXTRACTOR.cards.parse(response.content)
+
+        if len(cards) == 0:
+            log.info("Requests library failed, attempting with selenium")
+            response = self.scrape_with_selenium(url=self.base_url, payload=self.params)
+            cards = _EXTRACTOR.cards.parse(response)
+
+        return _EXTRACTOR.extract(cards, website=self.name)
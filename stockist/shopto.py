@@ -1,11 +1,23 @@
 import logging
 
-from bs4 import BeautifulSoup
-
-from stockist.stockist import Stock, Stockist
+from stockist.parsing import CardSelector, Extractor, Field, StockField, class_prefix
+from stockist.stockist import Stockist
 
 log = logging.getLogger(__name__)
 
+_EXTRACTOR = Extractor(
+    cards=CardSelector("div", "itemlist2"),
+    title=Field(class_prefix("itemlist__description", "div")),
+    url=Field(
+        class_prefix("itemlist__container", "a"),
+        attr="href",
+        prefix="https://www.shopto.net",
+    ),
+    price=Field(class_prefix("cross_price", "div")),
+    image=Field("img", attr="src", prefix="https://www.shopto.net"),
+    stock=StockField(class_prefix("inventory", "div"), out_of_stock="Sold out"),
+)
+
 
 class Shopto(Stockist):
     def __init__(self, messengers):
@@ -17,70 +29,14 @@ class Shopto(Stockist):
     name = "Shopto"
 
     def get_amiibo(self):
-        all_found = []
+        # The listing is one large page, so products are extracted while
+        # it streams in rather than after the whole DOM has been built.
+        chunks = self.scrape_stream(url=self.base_url, payload=self.params)
+        found = list(_EXTRACTOR.iter_extract(chunks, website=self.name))
 
-        response = self.scrape(url=self.base_url, payload=self.params)
-        soup = BeautifulSoup(response.content, "html.parser")
-        cards = soup.find_all("div", class_="itemlist2")
-
-        if len(cards) == 0:
+        if len(found) == 0:
             log.info("Requests library failed, attempting with selenium")
             response = self.scrape_with_selenium(url=self.base_url, payload=self.params)
-            soup = BeautifulSoup(response, "html.parser")
-            cards = soup.find_all("div", class_="itemlist2")
-
-        for card in cards:
-            name = card.find_all(
-                "div",
-                attrs={
-                    "class": lambda e: (
-                        e.startswith("itemlist__description") if e else False
-                    )
-                },
-            )
-            stock = card.find_all(
-                "div",
-                attrs={"class": lambda e: e.startswith("inventory") if e else False},
-            )
-            price = card.find_all(
-                "div",
-                attrs={"class": lambda e: e.startswith("cross_price") if e else False},
-            )
-            img = card.find_all("img")
-            url = card.find_all(
-                "a",
-                attrs={
-                    "class": lambda e: (
-                        e.startswith("itemlist__container") if e else False
-                    )
-                },
-            )
-
-            if name and stock and price and img and url:
-                name = name[0]
-                stock = stock[0]
-                price = price[0]
-                img = img[0]
-                url = url[0]
-            else:
-                continue
-
-            found = {
-                "Colour": 0x0000FF,
-                "Title": name.text.strip(),
-                "Image": f"https://www.shopto.net{img['src'].strip()}",
-                "URL": f"https://www.shopto.net{url['href'].strip()}",
-                "Price": price.text.strip(),
-                "Stock": "",
-                "Website": self.name,
-            }
-
-            if stock.text.strip() == "Sold out":
-                found["Colour"] = 0xFF0000
-                found["Stock"] = Stock.OUT_OF_STOCK.value
-            else:
-                found["Colour"] = 0x00FF00
-                found["Stock"] = Stock.IN_STOCK.value
-            all_found.append(found)
+            found = _EXTRACTOR.extract(_EXTRACTOR.cards.parse(response), self.name)
 
-        return all_found
+        return found
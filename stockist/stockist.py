@@ -1,23 +1,26 @@
 import logging
-import secrets
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
-from selenium import webdriver
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 
 from constants import (
-    FALLBACK_USER_AGENTS,
+    PAGINATION_WINDOW,
+    REQUEST_TIMEOUT,
     SELENIUM_WAIT_MAX,
+    STOCKIST_POLL_INTERVAL,
+    STREAM_CHUNK_SIZE,
 )
-from stockist.utils import send_public_request
+from models import Product, _canonical_url
+from stockist.browser import get_browser_pool
+from stockist.deadline import Deadline
+from stockist.httpcache import CachedResponse, CacheEntry, Fetch, ValidatorCache
+from stockist.utils import AsyncClient, build_url, send_public_request
 
 log = logging.getLogger(__name__)
 
-USER_AGENTS: list[str] = FALLBACK_USER_AGENTS
-
 
 class Stock(Enum):
     DELISTED = "Delisted"
@@ -33,42 +36,214 @@ class Stockist:
 
     base_url: str | None = None
     name: str | None = None
+    site: str | None = None
+    poll_interval: int = STOCKIST_POLL_INTERVAL
+    priority: int = 0
+    deadline: Deadline | None = None
+    http_cache: ValidatorCache | None = None
+    fetches: list[Fetch] | None = None
+
+    @staticmethod
+    def deduplicate(products: Iterable[Product]) -> tuple[list[Product], int]:
+        """Keep the first product seen for each canonical URL.
+
+        A single pass over ``products`` with a set of keys, so the cost grows
+        linearly with the listing and items can be consumed as they are
+        produced. Returns the unique products and how many were dropped.
+        """
+        seen: set[str] = set()
+        unique: list[Product] = []
+        removed = 0
+        for item in products:
+            key = _canonical_url(item.url)
+            if key in seen:
+                removed += 1
+                continue
+            seen.add(key)
+            unique.append(item)
+        return unique, removed
+
+    def _check_deadline(self) -> None:
+        if self.deadline is not None:
+            self.deadline.check(self.name)
+
+    def _timeout(self, limit: float) -> float:
+        return limit if self.deadline is None else self.deadline.clamp(limit)
+
+    def _record_fetch(self, fetch: Fetch) -> None:
+        if self.fetches is not None:
+            self.fetches.append(fetch)
 
     def scrape(self, url: str, payload: dict[str, Any] | None) -> Any:
-        return send_public_request(url=url, payload=payload)
+        self._check_deadline()
+        if self.http_cache is None:
+            response = send_public_request(
+                url=url, payload=payload, timeout=self._timeout(REQUEST_TIMEOUT)
+            )
+            # A request cut short by the budget looks like an empty page; raise
+            # instead so callers never mistake it for a genuinely empty listing.
+            self._check_deadline()
+            return response
+
+        full_url = build_url(url, payload)
+        cached = self.http_cache.lookup(full_url)
+        response = send_public_request(
+            url=url,
+            payload=payload,
+            timeout=self._timeout(REQUEST_TIMEOUT),
+            headers=cached.conditional_headers() if cached is not None else None,
+        )
+        self._check_deadline()
+        return self._settle_fetch(full_url, cached, response)
+
+    async def ascrape(
+        self, client: AsyncClient, url: str, payload: dict[str, Any] | None
+    ) -> Any:
+        """Fetch a page on the running event loop through ``client``.
+
+        Follows the same deadline and conditional-request rules as
+        ``scrape``, so many pages can be awaited together without a thread
+        each.
+        """
+        self._check_deadline()
+        full_url = build_url(url, payload)
+        cached = self.http_cache.lookup(full_url) if self.http_cache else None
+        response = await client.get(
+            url=url,
+            payload=payload,
+            timeout=self._timeout(REQUEST_TIMEOUT),
+            headers=cached.conditional_headers() if cached is not None else None,
+        )
+        self._check_deadline()
+        if self.http_cache is None:
+            return response
+        return self._settle_fetch(full_url, cached, response)
+
+    def _settle_fetch(
+        self, full_url: str, cached: CacheEntry | None, response: Any
+    ) -> Any:
+        status_code = getattr(response, "status_code", None)
+        if cached is not None and status_code == 304:
+            self._record_fetch(Fetch(url=full_url, changed=False))
+            return CachedResponse(cached.body)
+
+        entry = None
+        if status_code == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                entry = CacheEntry(
+                    etag=etag, last_modified=last_modified, body=response.content
+                )
+        self._record_fetch(Fetch(url=full_url, changed=True, entry=entry))
+        return response
+
+    def scrape_stream(
+        self, url: str, payload: dict[str, Any] | None
+    ) -> Iterator[bytes]:
+        """Yield the body of a page in chunks while it downloads.
+
+        Follows the same deadline and conditional-request rules as
+        ``scrape``; the request is only sent once iteration starts. The body
+        is buffered only when the server sent validators, since the cache
+        must keep it to answer a later 304.
+        """
+        self._check_deadline()
+        full_url = build_url(url, payload)
+        cached = self.http_cache.lookup(full_url) if self.http_cache else None
+        response = send_public_request(
+            url=url,
+            payload=payload,
+            timeout=self._timeout(REQUEST_TIMEOUT),
+            headers=cached.conditional_headers() if cached is not None else None,
+            stream=True,
+        )
+        try:
+            self._check_deadline()
+            status_code = getattr(response, "status_code", None)
+            if cached is not None and status_code == 304:
+                self._record_fetch(Fetch(url=full_url, changed=False))
+                yield cached.body
+                return
+
+            fetch = Fetch(url=full_url, changed=True)
+            self._record_fetch(fetch)
+            etag = last_modified = None
+            if self.http_cache is not None and status_code == 200:
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+            body: list[bytes] | None = [] if etag or last_modified else None
+
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                self._check_deadline()
+                if body is not None:
+                    body.append(chunk)
+                yield chunk
+
+            if body is not None:
+                fetch.entry = CacheEntry(
+                    etag=etag, last_modified=last_modified, body=b"".join(body)
+                )
+        finally:
+            response.close()
 
     def scrape_with_selenium(self, url: str, payload: dict[str, Any] | None) -> str:
-        driver = None
+        self._check_deadline()
+        self._record_fetch(Fetch(url=url, changed=True))
         try:
-            options = Options()
-            options.add_argument("--headless=new")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1920,1080")
-            options.add_experimental_option("excludeSwitches", ["enable-logging"])
-            options.add_argument(f"user-agent={secrets.choice(USER_AGENTS)}")
-
-            driver = webdriver.Chrome(options=options)
-            driver.set_page_load_timeout(SELENIUM_WAIT_MAX)
-            driver.set_script_timeout(SELENIUM_WAIT_MAX)
-
-            driver.get(url)
-            WebDriverWait(driver, SELENIUM_WAIT_MAX).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            return driver.page_source
+            with get_browser_pool().lease(self.deadline, self.name) as driver:
+                wait = self._timeout(SELENIUM_WAIT_MAX)
+                driver.set_page_load_timeout(wait)
+                driver.get(url)
+                WebDriverWait(driver, wait).until(
+                    lambda d: d.execute_script("return document.readyState")
+                    == "complete"
+                )
+                return driver.page_source
 
         except TimeoutException as e:
+            self._check_deadline()
             log.error(f"Selenium timeout for {url[:100]}: {e}")
             return ""
         except WebDriverException as e:
             log.error(f"WebDriver exception: {e.msg}")
             return ""
-        finally:
-            if driver is not None:
-                try:
-                    driver.quit()
-                except Exception as e:
-                    log.warning(f"Error closing Selenium driver: {e}")
 
-    def get_amiibo(self) -> list[dict[str, Any]]:
+    def fetch_pages(
+        self,
+        pages: Iterable[Any],
+        request: Callable[[Any], Any],
+        parse: Callable[[Any, Any], list[Product]],
+        window: int = PAGINATION_WINDOW,
+    ) -> list[Product]:
+        """Fetch listing pages a window at a time and merge them in page order.
+
+        ``request(page)`` is called concurrently for every page in the current
+        window. ``parse(page, response)`` then runs on the calling thread in
+        page order. Pagination stops at the first page that parses to no
+        items; later pages already fetched in that window are discarded.
+        Raises ``DeadlineExceeded`` rather than returning a partial listing
+        when the stockist's budget runs out.
+        """
+        pages = list(pages)
+        all_found: list[Product] = []
+        if not pages:
+            return all_found
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(window, len(pages))),
+            thread_name_prefix="page",
+        ) as executor:
+            for start in range(0, len(pages), window):
+                self._check_deadline()
+                chunk = pages[start : start + window]
+                for page, response in zip(chunk, executor.map(request, chunk)):
+                    found = parse(page, response)
+                    if not found:
+                        log.debug(f"{self.name}: no items on page {page}, stopping")
+                        return all_found
+                    all_found.extend(found)
+        return all_found
+
+    def get_amiibo(self) -> list[Product]:
         raise NotImplementedError("Subclasses must implement get_amiibo()")
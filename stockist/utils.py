@@ -1,22 +1,41 @@
+import asyncio
 import logging
 import secrets
-from urllib.parse import urlencode
+import threading
+from typing import Self
+from urllib.parse import urlencode, urlsplit
 
+import httpx
 import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
 
-from constants import FALLBACK_USER_AGENTS, REQUEST_TIMEOUT
+from constants import (
+    FALLBACK_USER_AGENTS,
+    HTTP_ASYNC_MAX_CONNECTIONS,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    REQUEST_TIMEOUT,
+)
 
 log = logging.getLogger(__name__)
 
 _session: requests.Session | None = None
+_session_lock = threading.Lock()
 
 
 def _get_session() -> requests.Session:
     global _session
-    if _session is None:
-        _session = requests.Session()
-        _session.headers.update({"Content-Type": "charset=utf-8"})
-    _session.headers.update({"User-Agent": secrets.choice(FALLBACK_USER_AGENTS)})
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update({"Content-Type": "charset=utf-8"})
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                pool_block=True,
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
     return _session
 
 
@@ -24,17 +43,38 @@ class BlankResponse:
     def __init__(self):
         self.content = ""
 
+    def iter_content(self, chunk_size=1):
+        return iter(())
 
-def send_public_request(url, payload=None):
-    empty_response = BlankResponse()
-    if payload is None:
-        payload = {}
-    query_string = urlencode(payload, True)
+    def close(self):
+        pass
+
+
+def build_url(url, payload=None):
+    query_string = urlencode(payload or {}, True)
     if query_string:
         url = url + "?" + query_string
+    return url
+
+
+def send_public_request(
+    url, payload=None, timeout=REQUEST_TIMEOUT, headers=None, stream=False
+):
+    empty_response = BlankResponse()
+    url = build_url(url, payload)
 
     try:
-        response = _get_session().get(url=url, timeout=REQUEST_TIMEOUT)
+        # The session is shared between scraper threads, so the rotating
+        # user agent travels with the request rather than the session.
+        response = _get_session().get(
+            url=url,
+            headers={
+                "User-Agent": secrets.choice(FALLBACK_USER_AGENTS),
+                **(headers or {}),
+            },
+            timeout=timeout,
+            stream=stream,
+        )
         response.raise_for_status()
         return response
     except requests.exceptions.Timeout:
@@ -52,3 +92,80 @@ def send_public_request(url, payload=None):
     except requests.exceptions.RequestException as e:
         log.warning(f"Request exception: {e}")
         return empty_response
+
+
+class AsyncClient:
+    """Asyncio counterpart of ``send_public_request``.
+
+    A single ``httpx.AsyncClient`` keeps connections alive per host, and at
+    most ``HTTP_POOL_MAXSIZE`` requests are in flight to any one host, as
+    with the shared session's ``pool_block``. ``get`` returns the response,
+    or a ``BlankResponse`` when the request fails. Use one client per event
+    loop and close it with ``aclose`` or ``async with``.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_ASYNC_MAX_CONNECTIONS,
+        max_per_host: int = HTTP_POOL_MAXSIZE,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._client = httpx.AsyncClient(
+            headers={"Content-Type": "charset=utf-8"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            follow_redirects=True,
+            transport=transport,
+        )
+        self._max_per_host = max_per_host
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _slots(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self._max_per_host)
+        return self._host_slots[host]
+
+    async def get(self, url, payload=None, timeout=REQUEST_TIMEOUT, headers=None):
+        empty_response = BlankResponse()
+        url = build_url(url, payload)
+
+        try:
+            async with self._slots(url):
+                response = await self._client.get(
+                    url,
+                    headers={
+                        "User-Agent": secrets.choice(FALLBACK_USER_AGENTS),
+                        **(headers or {}),
+                    },
+                    timeout=timeout,
+                )
+            # httpx also raises for 3xx, which would hide a 304 from the
+            # validator cache, so only client and server errors count here.
+            if response.is_error:
+                log.warning(f"HTTP error: {response.status_code} for url {url}")
+                return empty_response
+            return response
+        except httpx.TimeoutException:
+            log.info("Request timed out")
+            return empty_response
+        except httpx.ConnectError as e:
+            log.warning(f"Connection error: {e}")
+            return empty_response
+        except httpx.TooManyRedirects:
+            log.warning("Too many redirects")
+            return empty_response
+        except httpx.HTTPError as e:
+            log.warning(f"Request exception: {e}")
+            return empty_response
@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 
 class TestAmiibotLogging:
     def test_logging_constants(self):
-        from constants import LOG_FILE_NAME, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+        from constants import LOG_BACKUP_COUNT, LOG_FILE_NAME, LOG_MAX_BYTES
 
         assert LOG_FILE_NAME == "log.txt"
         assert LOG_MAX_BYTES == 5 * 1024 * 1024
@@ -67,11 +67,13 @@ class TestAmiibotMainExecution:
         mock_stockist_manager_class,
         mock_scraper_class,
     ):
+        from config.config import ScraperConfig
         from result import RunResult, RunStatus
 
         mock_config = Mock()
         mock_config.database = Mock()
         mock_config.messengers = Mock()
+        mock_config.scraper = ScraperConfig()
         mock_load_config.return_value = mock_config
 
         mock_database = Mock()
@@ -113,11 +115,13 @@ class TestAmiibotMainExecution:
         mock_stockist_manager_class,
         mock_scraper_class,
     ):
+        from config.config import ScraperConfig
         from result import RunResult, RunStatus
 
         mock_config = Mock()
         mock_config.database = Mock()
         mock_config.messengers = Mock()
+        mock_config.scraper = ScraperConfig()
         mock_load_config.return_value = mock_config
 
         mock_database = Mock()
@@ -165,7 +169,7 @@ class TestAmiibotIntegration:
         assert StockistManager is not None
 
     def test_constants_imported(self):
-        from constants import LOG_FILE_NAME, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+        from constants import LOG_BACKUP_COUNT, LOG_FILE_NAME, LOG_MAX_BYTES
 
         assert isinstance(LOG_FILE_NAME, str)
         assert isinstance(LOG_MAX_BYTES, int)
@@ -217,8 +221,8 @@ class TestAmiibotErrorHandling:
 class TestAmiibotModuleStructure:
     def test_module_has_docstring(self):
         import amiibot
-        import scraper
         import database
+        import scraper
 
         assert hasattr(amiibot, "__file__")
         assert hasattr(scraper, "__file__")
@@ -234,7 +238,79 @@ class TestAmiibotModuleStructure:
         import logging
         import os
         import sys
-        from pathlib import Path
         from logging.handlers import RotatingFileHandler
+        from pathlib import Path
 
         assert all([logging, os, sys, Path, RotatingFileHandler])
+
+
+class TestAmiibotDaemon:
+    def test_parse_args_defaults(self):
+        import amiibot
+        from constants import DAEMON_INTERVAL_SECONDS
+
+        args = amiibot.parse_args([])
+
+        assert args.daemon is False
+        assert args.interval == DAEMON_INTERVAL_SECONDS
+
+    def test_parse_args_daemon_with_interval(self):
+        import amiibot
+
+        args = amiibot.parse_args(["--daemon", "--interval", "120"])
+
+        assert args.daemon is True
+        assert args.interval == 120
+
+    def test_parse_args_rejects_non_positive_interval(self):
+        import pytest
+
+        import amiibot
+
+        with pytest.raises(SystemExit):
+            amiibot.parse_args(["--interval", "0"])
+
+    @patch("amiibot.signal.signal")
+    def test_run_daemon_loops_until_shutdown(self, mock_signal):
+        import amiibot
+        from result import RunResult, RunStatus
+
+        scraper = Mock()
+        results = [
+            RunResult(status=RunStatus.SUCCESS, exit_code=0),
+            RunResult(status=RunStatus.PARTIAL, exit_code=1),
+        ]
+
+        def scrape():
+            result = results[scraper.scrape.call_count - 1]
+            if scraper.scrape.call_count == len(results):
+                amiibot._shutdown.set()
+            return result
+
+        scraper.scrape.side_effect = scrape
+        amiibot._shutdown.clear()
+        try:
+            result = amiibot.run_daemon(scraper, interval=0.01)
+        finally:
+            amiibot._shutdown.clear()
+
+        assert scraper.scrape.call_count == 2
+        assert result.exit_code == 1
+        scraper.outbox.start.assert_called_once()
+        scraper.outbox.stop.assert_called_once()
+        scraper.outbox.drain.assert_called_once()
+        mock_signal.assert_called_once_with(
+            amiibot.signal.SIGTERM, amiibot._request_shutdown
+        )
+
+    def test_sigterm_handler_sets_shutdown(self):
+        import signal
+
+        import amiibot
+
+        amiibot._shutdown.clear()
+        try:
+            amiibot._request_shutdown(signal.SIGTERM, None)
+            assert amiibot._shutdown.is_set()
+        finally:
+            amiibot._shutdown.clear()
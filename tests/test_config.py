@@ -186,6 +186,65 @@ class TestConfiguration:
         finally:
             temp_path.unlink()
 
+    def test_scraper_config_defaults_and_override(self):
+        """Test scraper section is optional and validates max_workers."""
+        from constants import SCRAPER_MAX_WORKERS
+
+        config_data = {
+            "database": {"engine": "sqlite", "name": "test_db"},
+            "messengers": {
+                "test": {
+                    "messenger_type": "discord",
+                    "webhook_url": "https://discord.com/api/webhooks/123/abc",
+                    "active": True,
+                    "embedded_messages": True,
+                    "stockists": ["bestbuy.com"],
+                }
+            },
+        }
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump(config_data, f)
+            temp_path = Path(f.name)
+
+        try:
+            config = load_config(temp_path)
+            assert config.scraper.max_workers == SCRAPER_MAX_WORKERS
+
+            config_data["scraper"] = {"max_workers": 0}
+            temp_path.write_text(json.dumps(config_data))
+            with pytest.raises(ValueError, match="max_workers"):
+                load_config(temp_path)
+
+            config_data["scraper"] = {"max_workers": 8}
+            temp_path.write_text(json.dumps(config_data))
+            assert load_config(temp_path).scraper.max_workers == 8
+
+            config_data["scraper"] = {"browser_pool_size": 0}
+            temp_path.write_text(json.dumps(config_data))
+            with pytest.raises(ValueError, match="browser_pool_size"):
+                load_config(temp_path)
+
+            config_data["scraper"] = {
+                "stockists": {"gamestop.com": {"poll_interval": 7200, "priority": 5}}
+            }
+            temp_path.write_text(json.dumps(config_data))
+            schedule = load_config(temp_path).scraper.stockists["gamestop.com"]
+            assert schedule.poll_interval == 7200
+            assert schedule.priority == 5
+
+            config_data["scraper"] = {"stockists": {"gamestop.com": {"every": 1}}}
+            temp_path.write_text(json.dumps(config_data))
+            with pytest.raises(ValueError):
+                load_config(temp_path)
+
+            config_data["scraper"] = {"stockists": {"gamestop.co": {"priority": 1}}}
+            temp_path.write_text(json.dumps(config_data))
+            with pytest.raises(ValueError, match="stockists.gamestop.co"):
+                load_config(temp_path)
+        finally:
+            temp_path.unlink()
+
     def test_messenger_active_false(self):
         """Test messenger with active=false."""
         config_data = {
@@ -208,6 +267,7 @@ class TestConfiguration:
         try:
             config = load_config(temp_path)
             assert config.messengers["inactive_discord"].active is False
+            assert config.messengers["inactive_discord"].pool_size == 4
         finally:
             temp_path.unlink()
 
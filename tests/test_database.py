@@ -4,7 +4,16 @@ Unit tests for database module.
 
 import pytest
 from datetime import datetime, timedelta
-from database import Database, LastScraped, AmiiboStock, ScrapingFailure
+from database import (
+    Database,
+    LastScraped,
+    AmiiboStock,
+    NotificationDelivery,
+    NotificationOutbox,
+    ScrapingFailure,
+)
+from models import Product
+from result import DeliveryResult, DeliveryStatus
 from config.config import DatabaseConfig
 
 
@@ -339,6 +348,88 @@ class TestDatabase:
             assert item is not None
             assert item.missed_count == 0
 
+    def test_upsert_returns_only_changes_and_reactivates(self, database):
+        """Test the bulk upsert path reports only changed rows."""
+        data = [
+            {
+                "Title": f"Upsert Amiibo {i}",
+                "Price": "$19.99",
+                "Stock": "In stock",
+                "URL": f"https://test.com/upsert/{i}",
+                "Website": "upsert.com",
+                "Image": "https://test.com/img.jpg",
+                "Colour": 0x00FF00,
+            }
+            for i in range(3)
+        ]
+        assert len(database.check_then_add_or_update_amiibo(data + data[:1])) == 3
+
+        with database.Session() as session:
+            first_seen = (
+                session.query(AmiiboStock)
+                .filter_by(URL="https://test.com/upsert/0")
+                .one()
+                .first_seen_at
+            )
+
+        # Same prices written differently are not a change
+        unchanged = [{**d, "Price": "$19.990"} for d in data]
+        assert database.check_then_add_or_update_amiibo(unchanged) == []
+
+        # Delist item 2 over the grace period, then bring it back
+        database.check_then_add_or_update_amiibo(data[:2])
+        result = database.check_then_add_or_update_amiibo(data[:2])
+        assert [r["Stock"] for r in result] == ["Delisted"]
+
+        changed = [{**data[0], "Price": "$24.99"}, data[1], data[2]]
+        result = database.check_then_add_or_update_amiibo(changed)
+        assert [(r["URL"], r["Stock"]) for r in result] == [
+            ("https://test.com/upsert/0", "Price change")
+        ]
+
+        with database.Session() as session:
+            rows = {
+                row.URL: row
+                for row in session.query(AmiiboStock).filter_by(Website="upsert.com")
+            }
+            assert len(rows) == 3
+            assert rows["https://test.com/upsert/0"].Price == "$24.99"
+            assert rows["https://test.com/upsert/0"].first_seen_at == first_seen
+            assert rows["https://test.com/upsert/1"].Price == "$19.99"
+            assert rows["https://test.com/upsert/2"].is_active is True
+            assert rows["https://test.com/upsert/2"].delisted_at is None
+            assert rows["https://test.com/upsert/2"].missed_count == 0
+
+    def test_reconcile_does_not_read_the_listing(self, database):
+        """Test the diff comes from the writes rather than a SELECT."""
+        from sqlalchemy import event
+
+        data = [
+            {
+                "Title": f"Quiet Amiibo {i}",
+                "Price": "$19.99",
+                "Stock": "In stock",
+                "URL": f"https://test.com/quiet/{i}",
+                "Website": "quiet.com",
+                "Image": "https://test.com/img.jpg",
+                "Colour": 0x00FF00,
+            }
+            for i in range(3)
+        ]
+        database.check_then_add_or_update_amiibo(data)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", record)
+        try:
+            assert database.check_then_add_or_update_amiibo(data) == []
+        finally:
+            event.remove(database.engine, "before_cursor_execute", record)
+
+        assert not [s for s in statements if s.lstrip().startswith("SELECT")]
+
     def test_skip_delisting_parameter(self, database):
         """Test that skip_delisting=True prevents delisting entirely."""
         initial_data = [
@@ -423,6 +514,112 @@ class TestDatabase:
             assert record.last_success_at is not None
             assert record.last_healthy_count == 25
 
+    def test_record_stockist_outcome_failure(self, database):
+        """Test a failed scrape records the attempt and increments failures."""
+        health = database.record_stockist_outcome("outcome_fail", None)
+        assert health.consecutive_failures == 1
+        health = database.record_stockist_outcome("outcome_fail", 0)
+        assert health.consecutive_failures == 2
+        assert database.get_consecutive_failures("outcome_fail") == 2
+
+        with database.Session() as session:
+            record = session.get(LastScraped, "outcome_fail")
+            assert record is not None
+            assert record.last_attempt_at is not None
+            assert record.last_success_at is None
+
+    def test_record_stockist_outcome_success_resets_failures(self, database):
+        """Test a successful scrape resets failures and sets the baseline."""
+        database.record_stockist_outcome("outcome_ok", None)
+
+        health = database.record_stockist_outcome("outcome_ok", 40)
+
+        assert health.consecutive_failures == 0
+        assert health.skip_delisting is False
+        assert health.baseline_count == 0
+        assert database.get_consecutive_failures("outcome_ok") == 0
+        assert database.get_last_healthy_count("outcome_ok") == 40
+
+    def test_record_stockist_outcome_unhealthy_threshold(self, database):
+        """Test low counts skip delisting until the threshold is reached."""
+        database.record_stockist_outcome("outcome_low", 100)
+
+        health = database.record_stockist_outcome("outcome_low", 10)
+        assert health.skip_delisting is True
+        assert health.unhealthy_obs == 1
+        assert health.baseline_count == 100
+        assert database.get_last_healthy_count("outcome_low") == 100
+
+        health = database.record_stockist_outcome("outcome_low", 10)
+        assert health.skip_delisting is False
+        assert health.unhealthy_obs == 2
+        assert database.get_last_healthy_count("outcome_low") == 10
+        assert database.get_consecutive_unhealthy_obs("outcome_low") == 0
+
+    def test_get_last_attempts(self, database):
+        """Test last attempt timestamps are returned per stockist."""
+        database.record_stockist_outcome("attempt_a", None)
+        database.record_stockist_outcome("attempt_b", 5)
+
+        attempts = database.get_last_attempts()
+
+        assert isinstance(attempts["attempt_a"], datetime)
+        assert isinstance(attempts["attempt_b"], datetime)
+        assert "never_scraped" not in attempts
+
+    def test_record_stockist_heartbeat(self, database):
+        """Test a heartbeat moves the timestamps but keeps the baseline."""
+        database.record_stockist_outcome("heartbeat", 12)
+
+        database.record_stockist_heartbeat("heartbeat")
+
+        with database.Session() as session:
+            record = session.get(LastScraped, "heartbeat")
+            assert record.last_success_at is not None
+            assert record.last_attempt_at >= record.last_success_at
+        assert database.get_last_healthy_count("heartbeat") == 12
+
+    def test_content_hash_round_trip(self, database):
+        """Test listing hashes are stored, returned and cleared per stockist."""
+        database.record_stockist_outcome("hashed", 3)
+        database.record_stockist_outcome("unhashed", 3)
+
+        database.record_content_hash("hashed", "abc123")
+        assert database.get_content_hashes() == {"hashed": "abc123"}
+
+        database.record_content_hash("hashed", None)
+        assert database.get_content_hashes() == {}
+
+    def test_heartbeat_clears_failure_streak(self, database):
+        """Test a heartbeat after failures resets the failure counter."""
+        database.record_stockist_outcome("recovering", 5)
+        database.record_stockist_outcome("recovering", None)
+        assert database.get_consecutive_failures("recovering") == 1
+
+        database.record_stockist_heartbeat("recovering")
+
+        assert database.get_consecutive_failures("recovering") == 0
+
+    def test_has_pending_misses(self, database):
+        """Test items inside the delisting grace period are detected."""
+        item = {
+            "Title": "Grace Amiibo",
+            "Price": "$19.99",
+            "Stock": "In stock",
+            "URL": "https://test.com/grace",
+            "Website": "grace.com",
+            "Image": "https://test.com/img.jpg",
+            "Colour": 0x00FF00,
+        }
+        other = {**item, "Title": "Other Amiibo", "URL": "https://test.com/other"}
+        database.check_then_add_or_update_amiibo([item, other])
+        assert database.has_pending_misses("grace.com") is False
+
+        database.check_then_add_or_update_amiibo([item])
+
+        assert database.has_pending_misses("grace.com") is True
+        assert database.has_pending_misses("elsewhere.com") is False
+
     def test_notification_suppression_cooldown(self, database):
         """Test that notifications are suppressed within the cooldown period."""
         data = [
@@ -464,6 +661,160 @@ class TestDatabase:
             "https://nonexistent.com/item", "no_site.com", "In stock"
         )
 
+    def test_diff_enqueues_notifications_in_outbox(self, database):
+        """Test the stock diff queues one outbox row per item and messenger."""
+        data = [
+            {
+                "Title": f"Queued Amiibo {i}",
+                "Price": "$19.99",
+                "Stock": "In stock",
+                "URL": f"https://test.com/queued/{i}",
+                "Website": "queued.com",
+                "Image": "https://test.com/img.jpg",
+                "Colour": 0x00FF00,
+            }
+            for i in range(2)
+        ]
+        database.check_then_add_or_update_amiibo(data, notify=["discord", "telegram"])
+
+        entries = database.get_outbox(["discord", "telegram"])
+        assert len(entries) == 4
+        assert {e.messenger_name for e in entries} == {"discord", "telegram"}
+        assert entries[0].to_product() == Product.from_dict(data[0])
+        assert database.get_outbox(["discord"], limit=1)[0].id == entries[0].id
+        assert database.get_outbox([]) == []
+
+        # Queued items are in cooldown, so the same diff queues nothing more
+        assert all(
+            database.should_suppress_notification(d["URL"], d["Website"], d["Stock"])
+            for d in data
+        )
+
+    def test_enqueue_skips_delivered_and_queued_pairs(self, database):
+        """Test a pair already delivered or queued is not queued again."""
+        item = {
+            "Title": "Dup Amiibo",
+            "Price": "$19.99",
+            "Stock": "In stock",
+            "URL": "https://test.com/dup",
+            "Website": "dup.com",
+            "Image": "https://test.com/img.jpg",
+            "Colour": 0x00FF00,
+        }
+        key = database.build_idempotency_key(item["URL"], "dup.com", "In stock")
+        database.record_delivery(
+            idempotency_key=key,
+            website="dup.com",
+            url=item["URL"],
+            title=item["Title"],
+            stock_status="In stock",
+            messenger_name="discord",
+            delivery_status="success",
+        )
+        with database.Session() as session:
+            queued = database._enqueue_notifications(
+                session, [Product.from_dict(item)], ["discord", "telegram"]
+            )
+            again = database._enqueue_notifications(
+                session, [Product.from_dict(item)], ["telegram"]
+            )
+            session.commit()
+
+        assert queued == 1
+        assert again == 0
+        entries = database.get_outbox(["discord", "telegram"])
+        assert [e.messenger_name for e in entries] == ["telegram"]
+
+    def test_settle_outbox(self, database):
+        """Test settling delivered, failed and retried outbox rows."""
+        data = [
+            {
+                "Title": f"Settle Amiibo {i}",
+                "Price": "$19.99",
+                "Stock": "In stock",
+                "URL": f"https://test.com/settle/{i}",
+                "Website": "settle.com",
+                "Image": "https://test.com/img.jpg",
+                "Colour": 0x00FF00,
+            }
+            for i in range(3)
+        ]
+        database.check_then_add_or_update_amiibo(data, notify=["discord"])
+        delivered, failed, retried = database.get_outbox(["discord"])
+
+        transient = DeliveryResult(
+            DeliveryStatus.TRANSIENT_FAILURE, "discord", http_status=429
+        )
+        database.settle_outbox(
+            [
+                (delivered, DeliveryResult(DeliveryStatus.SUCCESS, "discord"), None),
+                (
+                    failed,
+                    DeliveryResult(DeliveryStatus.PERMANENT_FAILURE, "discord"),
+                    None,
+                ),
+                (retried, transient, datetime.now() + timedelta(minutes=5)),
+            ]
+        )
+
+        # The retried row waits out its backoff before it is due again
+        assert database.get_outbox(["discord"]) == []
+        next_attempt = database.get_next_outbox_attempt(["discord"])
+        assert next_attempt > datetime.now() + timedelta(minutes=4)
+        assert database.was_delivered_to(delivered.idempotency_key, "discord")
+        assert not database.was_delivered_to(failed.idempotency_key, "discord")
+        with database.Session() as session:
+            remaining = session.get(NotificationOutbox, retried.id)
+            assert remaining.attempts == 1
+            assert remaining.last_error == "HTTP 429"
+
+        # A transient failure without a retry time is final
+        database.settle_outbox([(remaining, transient, None)])
+        assert database.get_next_outbox_attempt(["discord"]) is None
+        with database.Session() as session:
+            statuses = {
+                d.idempotency_key: d.delivery_status
+                for d in session.query(NotificationDelivery)
+            }
+        assert statuses[retried.idempotency_key] == "transient_failure"
+
+    def test_discard_orphaned_outbox(self, database):
+        """Test rows for messengers removed from the config are dropped."""
+        item = {
+            "Title": "Orphan Amiibo",
+            "Price": "$19.99",
+            "Stock": "In stock",
+            "URL": "https://test.com/orphan",
+            "Website": "orphan.com",
+            "Image": "https://test.com/img.jpg",
+            "Colour": 0x00FF00,
+        }
+        database.check_then_add_or_update_amiibo([item], notify=["discord", "old"])
+
+        assert database.discard_orphaned_outbox(["discord", "telegram"]) == 1
+        assert database.get_outbox(["old"]) == []
+        assert len(database.get_outbox(["discord"])) == 1
+
+    def test_settle_outbox_overwrites_earlier_failure(self, database):
+        """Test a later success replaces a recorded failure for the same pair."""
+        item = {
+            "Title": "Retry Amiibo",
+            "Price": "$19.99",
+            "Stock": "In stock",
+            "URL": "https://test.com/retry",
+            "Website": "retry.com",
+            "Image": "https://test.com/img.jpg",
+            "Colour": 0x00FF00,
+        }
+        database.check_then_add_or_update_amiibo([item], notify=["discord"])
+        (entry,) = database.get_outbox(["discord"])
+        failed = DeliveryResult(DeliveryStatus.PERMANENT_FAILURE, "discord")
+        database.settle_outbox([(entry, failed, None)])
+        delivered = DeliveryResult(DeliveryStatus.SUCCESS, "discord")
+        database.settle_outbox([(entry, delivered, None)])
+
+        assert database.was_delivered_to(entry.idempotency_key, "discord")
+
     def test_cleanup_old_records(self, database):
         """Test cleaning up old records."""
         # Add an old item manually
@@ -1,13 +1,27 @@
 import pytest
+from dataclasses import replace
 from unittest.mock import Mock, patch
 from messenger.messenger import Messenger
 from messenger.discord import Discord
 from messenger.telegram import Telegram
 from messenger.manager import MessageManager
+from models import Product
 from result import DeliveryResult, DeliveryStatus
 import requests
 
 
+def _product(i):
+    return Product(
+        colour=0x00FF00,
+        title=f"Amiibo_{i}",
+        image="https://test.com/image.jpg",
+        url=f"https://test.com/{i}",
+        price="$19.99",
+        stock="In stock",
+        website="test.com",
+    )
+
+
 class TestMessenger:
     @pytest.fixture
     def messenger(self):
@@ -22,7 +36,26 @@ class TestMessenger:
         assert messenger.stockists == ["test.com", "example.com"]
         assert messenger.active is True
 
-    @patch("requests.post")
+    def test_session_is_pooled_and_reused(self, messenger):
+        pooled = Messenger(name="pooled", stockists=[], active=True, pool_size=3)
+        adapter = pooled.session.get_adapter("https://discord.com/api")
+
+        assert adapter._pool_maxsize == 3
+        assert adapter._pool_block is True
+        assert messenger.session is not pooled.session
+
+    @patch("requests.Session.post")
+    def test_send_post_reuses_session(self, mock_post, messenger):
+        mock_post.return_value = Mock(status_code=200)
+        session = messenger.session
+
+        messenger.send_post(url="https://test.com/api")
+        messenger.send_post(url="https://test.com/api")
+
+        assert mock_post.call_count == 2
+        assert messenger.session is session
+
+    @patch("requests.Session.post")
     def test_send_post_success(self, mock_post, messenger):
         mock_response = Mock()
         mock_response.status_code = 200
@@ -34,7 +67,7 @@ class TestMessenger:
         assert result.status == DeliveryStatus.SUCCESS
         assert result.http_status == 200
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_post_timeout(self, mock_post, messenger):
         mock_post.side_effect = requests.exceptions.Timeout
 
@@ -43,7 +76,7 @@ class TestMessenger:
         assert result.status == DeliveryStatus.TRANSIENT_FAILURE
         assert result.diagnostic == "timeout"
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_post_too_many_redirects(self, mock_post, messenger):
         mock_post.side_effect = requests.exceptions.TooManyRedirects
 
@@ -51,7 +84,7 @@ class TestMessenger:
 
         assert result.status == DeliveryStatus.PERMANENT_FAILURE
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_post_request_exception(self, mock_post, messenger):
         mock_post.side_effect = requests.exceptions.RequestException("Error")
 
@@ -59,7 +92,7 @@ class TestMessenger:
 
         assert result.status == DeliveryStatus.TRANSIENT_FAILURE
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_post_4xx_permanent_failure(self, mock_post, messenger):
         mock_response = Mock()
         mock_response.status_code = 403
@@ -70,7 +103,7 @@ class TestMessenger:
         assert result.status == DeliveryStatus.PERMANENT_FAILURE
         assert result.http_status == 403
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_post_5xx_transient(self, mock_post, messenger):
         mock_response = Mock()
         mock_response.status_code = 503
@@ -81,7 +114,7 @@ class TestMessenger:
         assert result.status == DeliveryStatus.TRANSIENT_FAILURE
         assert result.http_status == 503
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_post_429_transient(self, mock_post, messenger):
         mock_response = Mock()
         mock_response.status_code = 429
@@ -92,7 +125,38 @@ class TestMessenger:
         assert result.status == DeliveryStatus.TRANSIENT_FAILURE
         assert result.http_status == 429
 
-    @patch("requests.get")
+    @patch("requests.Session.post")
+    def test_send_post_429_retry_after(self, mock_post, messenger):
+        mock_response = Mock()
+        mock_response.status_code = 429
+        mock_response.headers = {"Retry-After": "2.5"}
+        mock_post.return_value = mock_response
+
+        result = messenger.send_post(url="https://test.com/api")
+
+        assert result.retry_after == 2.5
+
+    @patch("requests.Session.post")
+    def test_send_post_503_retry_after_http_date(self, mock_post, messenger):
+        mock_response = Mock()
+        mock_response.status_code = 503
+        mock_response.headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        mock_post.return_value = mock_response
+
+        result = messenger.send_post(url="https://test.com/api")
+
+        assert result.retry_after == 0.0
+
+    @patch("requests.Session.post")
+    def test_send_post_retry_after_ignored_on_success(self, mock_post, messenger):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Retry-After": "10"}
+        mock_post.return_value = mock_response
+
+        assert messenger.send_post(url="https://test.com/api").retry_after is None
+
+    @patch("requests.Session.get")
     def test_send_get_success(self, mock_get, messenger):
         mock_response = Mock()
         mock_response.status_code = 200
@@ -105,7 +169,7 @@ class TestMessenger:
         assert result.status == DeliveryStatus.SUCCESS
         assert result.http_status == 200
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_send_get_timeout(self, mock_get, messenger):
         mock_get.side_effect = requests.exceptions.Timeout
 
@@ -113,7 +177,7 @@ class TestMessenger:
 
         assert result.status == DeliveryStatus.TRANSIENT_FAILURE
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_send_get_too_many_redirects(self, mock_get, messenger):
         mock_get.side_effect = requests.exceptions.TooManyRedirects
 
@@ -121,7 +185,7 @@ class TestMessenger:
 
         assert result.status == DeliveryStatus.PERMANENT_FAILURE
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_send_get_request_exception(self, mock_get, messenger):
         mock_get.side_effect = requests.exceptions.RequestException("Error")
 
@@ -218,6 +282,50 @@ class TestDiscord:
 
         assert result.status == DeliveryStatus.INACTIVE
 
+    @patch("messenger.discord.Discord.send_post")
+    def test_send_embed_messages_packs_ten_per_message(
+        self, mock_post, discord_messenger
+    ):
+        results = [
+            DeliveryResult(status=status, messenger_name="test_discord")
+            for status in (
+                DeliveryStatus.SUCCESS,
+                DeliveryStatus.TRANSIENT_FAILURE,
+                DeliveryStatus.SUCCESS,
+            )
+        ]
+        mock_post.side_effect = results
+
+        delivered = discord_messenger.send_embed_messages(
+            [_product(i) for i in range(23)]
+        )
+
+        embeds = [call.kwargs["json"]["embeds"] for call in mock_post.call_args_list]
+        assert [len(batch) for batch in embeds] == [10, 10, 3]
+        assert embeds[2][0]["title"] == "Amiibo_20"
+        assert delivered == [results[0]] * 10 + [results[1]] * 10 + [results[2]] * 3
+        assert "embeds" not in discord_messenger.data
+
+    @patch("messenger.discord.Discord.send_post")
+    def test_send_embed_messages_splits_on_total_length(
+        self, mock_post, discord_messenger
+    ):
+        mock_post.return_value = DeliveryResult(
+            status=DeliveryStatus.SUCCESS, messenger_name="test_discord"
+        )
+        # Each embed carries about 2000 characters, so three fit in 6000
+        products = [replace(_product(i), website="w" * 1900) for i in range(5)]
+
+        delivered = discord_messenger.send_embed_messages(products)
+
+        embeds = [call.kwargs["json"]["embeds"] for call in mock_post.call_args_list]
+        assert [len(batch) for batch in embeds] == [3, 2]
+        assert all(
+            sum(Discord.embed_length(embed) for embed in batch) <= 6000
+            for batch in embeds
+        )
+        assert len(delivered) == 5
+
 
 class TestTelegram:
     @pytest.fixture
@@ -240,6 +348,23 @@ class TestTelegram:
         )
         assert telegram_messenger.data["chat_id"] == "123456789"
 
+    @patch("requests.Session.get")
+    def test_send_get_429_retry_after_from_body(self, mock_get, telegram_messenger):
+        mock_response = Mock()
+        mock_response.status_code = 429
+        mock_response.headers = {}
+        mock_response.json.return_value = {
+            "ok": False,
+            "error_code": 429,
+            "parameters": {"retry_after": 7},
+        }
+        mock_get.return_value = mock_response
+
+        result = telegram_messenger.send_get(url="https://api.telegram.org/bot/x")
+
+        assert result.status == DeliveryStatus.TRANSIENT_FAILURE
+        assert result.retry_after == 7.0
+
     @patch("messenger.telegram.Telegram.send_get")
     def test_send_message_active(self, mock_get, telegram_messenger):
         mock_get.return_value = DeliveryResult(
@@ -251,7 +376,8 @@ class TestTelegram:
         result = telegram_messenger.send_message("Test message")
 
         assert result.status == DeliveryStatus.SUCCESS
-        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["params"]["text"] == "Test message"
+        assert "text" not in telegram_messenger.data
 
     def test_send_message_inactive(self):
         telegram = Telegram(
@@ -266,6 +392,93 @@ class TestTelegram:
 
         assert result.status == DeliveryStatus.INACTIVE
 
+    @patch("messenger.telegram.Telegram.send_post")
+    def test_send_embed_message_sends_photo(self, mock_post, telegram_messenger):
+        mock_post.return_value = DeliveryResult(
+            status=DeliveryStatus.SUCCESS, messenger_name="test_telegram"
+        )
+
+        result = telegram_messenger.send_embed_message(_product(0))
+
+        assert result.status == DeliveryStatus.SUCCESS
+        url = mock_post.call_args.kwargs["url"]
+        body = mock_post.call_args.kwargs["json"]
+        assert url.endswith("/sendPhoto")
+        assert body["chat_id"] == "123456789"
+        assert body["photo"] == "https://test.com/image.jpg"
+        assert body["caption"].startswith("*Stock alert*")
+        assert r"[Amiibo\_0](https://test.com/0)" in body["caption"]
+
+    @patch("messenger.telegram.Telegram.send_post")
+    def test_send_embed_messages_sends_media_groups(
+        self, mock_post, telegram_messenger
+    ):
+        mock_post.return_value = DeliveryResult(
+            status=DeliveryStatus.SUCCESS, messenger_name="test_telegram"
+        )
+
+        delivered = telegram_messenger.send_embed_messages(
+            [_product(i) for i in range(12)]
+        )
+
+        calls = mock_post.call_args_list
+        assert [c.kwargs["url"].rsplit("/", 1)[1] for c in calls] == [
+            "sendMediaGroup",
+            "sendMediaGroup",
+        ]
+        media = [c.kwargs["json"]["media"] for c in calls]
+        assert [len(m) for m in media] == [10, 2]
+        assert [c.kwargs["messages"] for c in calls] == [10, 2]
+        assert media[0][0]["type"] == "photo"
+        assert media[0][0]["caption"].startswith("*Stock alert*")
+        assert media[0][1]["parse_mode"] == "Markdown"
+        assert len(delivered) == 12
+
+    @patch("messenger.telegram.Telegram.send_get")
+    @patch("messenger.telegram.Telegram.send_post")
+    def test_rejected_photos_fall_back_to_text(
+        self, mock_post, mock_get, telegram_messenger
+    ):
+        mock_post.return_value = DeliveryResult(
+            status=DeliveryStatus.PERMANENT_FAILURE,
+            messenger_name="test_telegram",
+            http_status=400,
+        )
+        mock_get.return_value = DeliveryResult(
+            status=DeliveryStatus.SUCCESS, messenger_name="test_telegram"
+        )
+
+        delivered = telegram_messenger.send_embed_messages([_product(0), _product(1)])
+
+        mock_post.assert_called_once()
+        mock_get.assert_called_once()
+        assert [r.status for r in delivered] == [DeliveryStatus.SUCCESS] * 2
+
+    @patch("messenger.telegram.Telegram.send_get")
+    def test_send_embed_messages_groups_items(self, mock_get, telegram_messenger):
+        mock_get.return_value = DeliveryResult(
+            status=DeliveryStatus.SUCCESS, messenger_name="test_telegram"
+        )
+
+        # Without an image every product goes out as text
+        delivered = telegram_messenger.send_embed_messages(
+            [replace(_product(i), image="") for i in range(12)]
+        )
+
+        texts = [call.kwargs["params"]["text"] for call in mock_get.call_args_list]
+        assert len(texts) == 2
+        assert [text.count("https://test.com/") for text in texts] == [10, 2]
+        assert r"[Amiibo\_0](https://test.com/0)" in texts[0]
+        assert len(delivered) == 12
+        assert "text" not in telegram_messenger.data
+
+    def test_group_entries_respects_message_length(self):
+        entries = ["x" * 1500] * 4
+
+        groups = Telegram.group_entries(entries)
+
+        assert [len(group) for group in groups] == [2, 2]
+
 
 class TestMessageManager:
     def test_message_manager_initialization_discord(self):
@@ -328,6 +541,24 @@ class TestMessageManager:
         result = manager.check_for_one_messenger()
         assert result is True
 
+    def test_pool_size_passed_to_messengers(self):
+        config = {
+            "test_discord": Mock(
+                messenger_type="discord",
+                stockists=["test.com"],
+                webhook_url="https://discord.com/api/webhooks/123/abc",
+                active=True,
+                pool_size=6,
+            )
+        }
+        manager = MessageManager(config)
+        adapter = manager.all_messengers[0].session.get_adapter("https://discord.com")
+        assert adapter._pool_maxsize == 6
+
+        with patch.object(manager.all_messengers[0].session, "close") as mock_close:
+            manager.close()
+        mock_close.assert_called_once()
+
     def test_check_for_one_messenger_failure(self):
         manager = MessageManager({})
         result = manager.check_for_one_messenger()
@@ -356,7 +587,7 @@ class TestMessageManager:
         manager.send_message_to_all_messengers("Test message")
         for messenger in manager.all_messengers:
             messenger.send_message.assert_called_once_with(message="Test message")
-        assert mock_sleep.call_count == 2
+        mock_sleep.assert_not_called()
 
     @patch("time.sleep")
     def test_send_embed_message_to_all_messengers(self, mock_sleep):
@@ -379,7 +610,7 @@ class TestMessageManager:
         manager.all_messengers[0].send_embed_message.assert_called_once_with(
             embed_data=embed_data
         )
-        assert mock_sleep.call_count == 1
+        mock_sleep.assert_not_called()
 
     @patch("time.sleep")
     def test_send_message_skips_inactive(self, mock_sleep):
@@ -0,0 +1,181 @@
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from database import NotificationOutbox
+from outbox import OutboxWorker, backoff_delay
+from result import DeliveryResult, DeliveryStatus
+
+
+def _entry(entry_id, messenger_name, attempts=0, created_at=None):
+    return NotificationOutbox(
+        id=entry_id,
+        idempotency_key=f"key{entry_id}",
+        messenger_name=messenger_name,
+        website="test.com",
+        url=f"https://test.com/{entry_id}",
+        title=f"Test Amiibo {entry_id}",
+        stock_status="In stock",
+        colour=0x00FF00,
+        image="https://test.com/img.jpg",
+        price="$19.99",
+        attempts=attempts,
+        created_at=created_at or datetime.now(),
+    )
+
+
+def _messenger(name, status=DeliveryStatus.SUCCESS):
+    messenger = Mock()
+    messenger.name = name
+    result = DeliveryResult(status=status, messenger_name=name)
+    messenger.send_embed_messages.side_effect = lambda items: [result] * len(items)
+    return messenger
+
+
+class TestOutboxWorker:
+    @pytest.fixture
+    def database(self):
+        db = Mock()
+        db.get_outbox.return_value = []
+        db.get_next_outbox_attempt.return_value = None
+        return db
+
+    def test_drain_empty_outbox(self, database):
+        worker = OutboxWorker(database, [_messenger("discord")])
+
+        assert worker.drain() == 0
+        database.get_outbox.assert_called_once_with(["discord"])
+        database.settle_outbox.assert_not_called()
+
+    def test_first_drain_discards_orphaned_rows(self, database):
+        worker = OutboxWorker(database, [_messenger("discord")])
+
+        worker.drain()
+        worker.drain()
+
+        database.discard_orphaned_outbox.assert_called_once_with(["discord"])
+
+    def test_drain_sends_one_batch_per_messenger(self, database):
+        discord = _messenger("discord")
+        telegram = _messenger("telegram", DeliveryStatus.PERMANENT_FAILURE)
+        entries = [_entry(1, "discord"), _entry(2, "telegram"), _entry(3, "discord")]
+        database.get_outbox.return_value = entries
+        worker = OutboxWorker(database, [discord, telegram], max_attempts=3)
+
+        sent = worker.drain()
+
+        assert sent == 2
+        discord.send_embed_messages.assert_called_once_with(
+            [entries[0].to_product(), entries[2].to_product()]
+        )
+        telegram.send_embed_messages.assert_called_once_with([entries[1].to_product()])
+        (results,) = database.settle_outbox.call_args[0]
+        assert sorted((e.id, r.status, at) for e, r, at in results) == [
+            (1, DeliveryStatus.SUCCESS, None),
+            (2, DeliveryStatus.PERMANENT_FAILURE, None),
+            (3, DeliveryStatus.SUCCESS, None),
+        ]
+
+    def test_drain_messengers_concurrently(self, database):
+        both_sending = threading.Barrier(2, timeout=5)
+
+        def send(items):
+            both_sending.wait()
+            return [DeliveryResult(DeliveryStatus.SUCCESS, "x")] * len(items)
+
+        discord = _messenger("discord")
+        telegram = _messenger("telegram")
+        discord.send_embed_messages.side_effect = send
+        telegram.send_embed_messages.side_effect = send
+        database.get_outbox.return_value = [
+            _entry(1, "discord"),
+            _entry(2, "telegram"),
+        ]
+
+        assert OutboxWorker(database, [discord, telegram]).drain() == 2
+
+    def test_drain_messenger_error_is_transient(self, database):
+        discord = _messenger("discord")
+        discord.send_embed_messages.side_effect = RuntimeError("boom")
+        database.get_outbox.return_value = [_entry(1, "discord")]
+
+        assert OutboxWorker(database, [discord]).drain() == 0
+        ((_, result, retry_at),) = database.settle_outbox.call_args[0][0]
+        assert result.status == DeliveryStatus.TRANSIENT_FAILURE
+        assert result.diagnostic == "boom"
+        assert retry_at > datetime.now()
+
+    def test_backoff_delay_doubles_with_jitter(self):
+        for attempt, ceiling in [(1, 2.0), (2, 4.0), (3, 8.0), (20, 300.0)]:
+            delay = backoff_delay(attempt)
+            assert ceiling / 2 <= delay <= ceiling
+
+    def test_backoff_delay_honours_retry_after(self):
+        assert backoff_delay(1, retry_after=30.0) == 30.0
+        assert backoff_delay(1, retry_after=0.0) <= 2.0
+
+    def test_transient_failure_given_up_after_max_attempts(self, database):
+        database.get_outbox.return_value = [_entry(1, "discord", attempts=2)]
+        discord = _messenger("discord", DeliveryStatus.TRANSIENT_FAILURE)
+
+        OutboxWorker(database, [discord], max_attempts=3).drain()
+
+        ((_, _, retry_at),) = database.settle_outbox.call_args[0][0]
+        assert retry_at is None
+
+    def test_transient_failure_given_up_past_max_age(self, database):
+        # Even the shortest first backoff would land after the hour is up
+        stale = datetime.now() - timedelta(hours=1) + timedelta(seconds=0.5)
+        database.get_outbox.return_value = [_entry(1, "discord", created_at=stale)]
+        discord = _messenger("discord", DeliveryStatus.TRANSIENT_FAILURE)
+
+        OutboxWorker(database, [discord], max_age=timedelta(hours=1)).drain()
+
+        ((_, _, retry_at),) = database.settle_outbox.call_args[0][0]
+        assert retry_at is None
+
+    @patch("outbox.time.sleep")
+    def test_flush_waits_for_due_retries(self, mock_sleep, database):
+        entry = _entry(1, "discord")
+        database.get_outbox.side_effect = [[entry], [entry]]
+        database.get_next_outbox_attempt.side_effect = [
+            datetime.now() + timedelta(seconds=3),
+            None,
+        ]
+        discord = _messenger("discord")
+        discord.send_embed_messages.side_effect = [
+            [DeliveryResult(DeliveryStatus.TRANSIENT_FAILURE, "discord")],
+            [DeliveryResult(DeliveryStatus.SUCCESS, "discord")],
+        ]
+
+        assert OutboxWorker(database, [discord]).flush(timeout=10) == 1
+        assert discord.send_embed_messages.call_count == 2
+        assert 0 < mock_sleep.call_args[0][0] <= 3
+
+    @patch("outbox.time.sleep")
+    def test_flush_stops_at_timeout(self, mock_sleep, database):
+        database.get_next_outbox_attempt.return_value = datetime.now() + timedelta(
+            minutes=5
+        )
+
+        assert OutboxWorker(database, [_messenger("discord")]).flush(timeout=10) == 0
+        mock_sleep.assert_not_called()
+
+    def test_background_worker_drains_on_wake(self, database):
+        drained = threading.Event()
+        database.get_outbox.side_effect = lambda names: drained.set() or []
+        worker = OutboxWorker(database, [_messenger("discord")], interval=60)
+
+        worker.start()
+        try:
+            assert worker.running
+            assert drained.wait(5)
+            drained.clear()
+            worker.wake()
+            assert drained.wait(5)
+        finally:
+            worker.stop(timeout=5)
+
+        assert not worker.running
@@ -0,0 +1,174 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from messenger.discord import Discord
+from messenger.ratelimit import RateLimiter, TokenBucket
+from messenger.telegram import Telegram
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_burst_then_even_rate(self, clock):
+        bucket = TokenBucket(2, 1.0, clock=clock)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+
+        clock.now += 1.0
+        assert bucket.reserve() == pytest.approx(0.5)
+
+    def test_reserve_several_tokens(self, clock):
+        bucket = TokenBucket(2, 1.0, clock=clock)
+
+        assert bucket.reserve(4) == pytest.approx(1.0)
+        assert bucket.reserve() == pytest.approx(1.5)
+
+    def test_refill_is_capped_at_capacity(self, clock):
+        bucket = TokenBucket(2, 1.0, clock=clock)
+        clock.now += 60
+
+        assert [bucket.reserve() for _ in range(3)] == [0, 0, pytest.approx(0.5)]
+
+    def test_sync_exhausted_blocks_until_reset(self, clock):
+        bucket = TokenBucket(5, 2.0, clock=clock)
+
+        bucket.sync(limit=5, remaining=0, reset_after=1.5)
+
+        assert bucket.reserve() == pytest.approx(1.5)
+
+    def test_sync_caps_tokens_at_remaining(self, clock):
+        bucket = TokenBucket(5, 5.0, clock=clock)
+
+        bucket.sync(limit=5, remaining=1, reset_after=1.0)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_sync_new_limit_changes_refill_rate(self, clock):
+        bucket = TokenBucket(5, 2.0, clock=clock)
+
+        bucket.sync(limit=10, remaining=0, reset_after=0)
+
+        assert bucket.rate == 5.0
+        assert bucket.reserve() == pytest.approx(0.2)
+
+    def test_pause(self, clock):
+        bucket = TokenBucket(5, 1.0, clock=clock)
+
+        bucket.pause(3.0)
+
+        assert bucket.reserve() == pytest.approx(3.0)
+        clock.now += 3.0
+        assert bucket.reserve() == 0
+
+
+class TestRateLimiter:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def limiter(self, clock):
+        return RateLimiter(1, 1.0, clock=clock, sleep=clock.sleep)
+
+    def test_acquire_waits_only_when_needed(self, limiter, clock):
+        assert limiter.acquire("route") == 0
+        assert limiter.acquire("route") == pytest.approx(1.0)
+        assert clock.now == pytest.approx(101.0)
+
+    def test_acquire_draws_one_token_per_message(self, limiter, clock):
+        assert limiter.acquire("route", 3) == pytest.approx(2.0)
+        assert limiter.acquire("route") == pytest.approx(1.0)
+        assert clock.now == pytest.approx(103.0)
+
+    def test_routes_are_limited_separately(self, limiter):
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("b") == 0
+
+    def test_named_bucket_is_shared_between_routes(self, limiter):
+        limiter.observe("a", {"X-RateLimit-Bucket": "abcd"})
+        limiter.observe("b", {"X-RateLimit-Bucket": "abcd"})
+
+        assert limiter.bucket("a") is limiter.bucket("b")
+
+    def test_observe_discord_headers(self, limiter, clock):
+        limiter.observe(
+            "a",
+            {
+                "X-RateLimit-Limit": "5",
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset-After": "2.5",
+            },
+        )
+
+        assert limiter.acquire("a") == pytest.approx(2.5)
+
+    def test_observe_retry_after(self, limiter):
+        limiter.acquire("b")
+        limiter.observe("a", {}, retry_after=4.0)
+
+        assert limiter.bucket("a").reserve() == pytest.approx(4.0)
+        assert limiter.bucket("b").reserve() == pytest.approx(1.0)
+
+    def test_observe_global_retry_after_pauses_every_route(self, clock):
+        shared = TokenBucket(30, 1.0, clock=clock)
+        limiter = RateLimiter(1, 1.0, shared=[shared], clock=clock, sleep=clock.sleep)
+        limiter.bucket("b")
+
+        limiter.observe("a", {"X-RateLimit-Global": "true"}, retry_after=4.0)
+
+        assert limiter.bucket("b").reserve() == pytest.approx(4.0)
+        assert shared.reserve() == pytest.approx(4.0)
+
+    def test_shared_bucket_limits_every_route(self, clock):
+        shared = TokenBucket(1, 1.0, clock=clock)
+        limiter = RateLimiter(5, 1.0, shared=[shared], clock=clock, sleep=clock.sleep)
+
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("b") == pytest.approx(1.0)
+
+
+class TestMessengerRateLimits:
+    @patch("requests.Session.post")
+    def test_discord_pauses_after_429(self, mock_post):
+        discord = Discord(
+            name="test_discord",
+            stockists=["test.com"],
+            active=True,
+            webhook_url="https://discord.com/api/webhooks/123/abc",
+        )
+        response = Mock(status_code=429, headers={"Retry-After": "3"})
+        mock_post.return_value = response
+
+        discord.send_post(url=discord.webhook_url, json={})
+
+        bucket = discord.rate_limiter.bucket(discord._route(discord.webhook_url))
+        assert bucket.reserve() == pytest.approx(3.0, abs=0.1)
+
+    def test_telegram_limits_per_chat_and_per_bot(self):
+        token = "1234567890:AAECAwQFBgcICQoLDA0ODxAREhMUFRYXGBkaGxs"
+        private = Telegram("a", [], True, bot_token=token, chat_id="123")
+        group = Telegram("b", [], True, bot_token=token, chat_id="-100123")
+
+        assert private._route("https://api.telegram.org/x") == "123"
+        assert private.rate_limiter.capacity == 1
+        assert group.rate_limiter.capacity == 20
+        assert group.rate_limiter.period == 60.0
+        assert private.rate_limiter.shared == group.rate_limiter.shared
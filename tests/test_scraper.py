@@ -1,39 +1,45 @@
 import pytest
 from unittest.mock import Mock, patch
 from scraper import Scraper
-from result import DeliveryResult, DeliveryStatus, RunResult, RunStatus
+from database import NotificationOutbox
+from models import Product
+from result import (
+    DeliveryResult,
+    DeliveryStatus,
+    RunResult,
+    RunStatus,
+    StockistHealth,
+)
 from scraper import CycleStats
+from config.config import ScraperConfig
 
 
 class TestScraper:
     @pytest.fixture
     def mock_config(self):
-        return Mock()
+        config = Mock()
+        config.scraper = ScraperConfig()
+        return config
 
     @pytest.fixture
     def mock_database(self):
         db = Mock()
-        db.record_scraping_failure.return_value = 1
-        db.record_scraping_success.return_value = None
-        db.get_consecutive_failures.return_value = 0
-        db.get_last_healthy_count.return_value = 100
-        db.record_scrape_attempt.return_value = None
-        db.record_healthy_scrape.return_value = None
-        db.record_unhealthy_scrape.return_value = 1
-        db.get_consecutive_unhealthy_obs.return_value = 1
+        db.record_stockist_outcome.return_value = StockistHealth(consecutive_failures=1)
         db._validate_amiibo_data.return_value = True
         db.check_then_add_or_update_amiibo.return_value = []
-        db.should_suppress_notification.return_value = False
-        db.build_idempotency_key.return_value = "abc123"
-        db.was_delivered_to.return_value = False
-        db.record_delivery.return_value = None
-        db.record_notification.return_value = None
+        db.get_last_attempts.return_value = {}
+        db.has_pending_misses.return_value = False
+        db.get_content_hashes.return_value = {}
+        db.get_outbox.return_value = []
+        db.get_next_outbox_attempt.return_value = None
         return db
 
     @pytest.fixture
     def mock_stockist(self):
         stockist = Mock()
         stockist.name = "test.com"
+        stockist.poll_interval = 0
+        stockist.priority = 0
         stockist.messengers = ["test_messenger"]
         stockist.get_amiibo.return_value = []
         return stockist
@@ -42,11 +48,12 @@ class TestScraper:
     def mock_messenger(self):
         messenger = Mock()
         messenger.name = "test_messenger"
-        messenger.send_embed_message.return_value = DeliveryResult(
+        result = DeliveryResult(
             status=DeliveryStatus.SUCCESS,
             messenger_name="test_messenger",
             http_status=200,
         )
+        messenger.send_embed_messages.side_effect = lambda items: [result] * len(items)
         return messenger
 
     @pytest.fixture
@@ -88,6 +95,41 @@ class TestScraper:
         assert result.stockists_failed == 0
         assert result.notifications_sent == 5
 
+    def test_scrape_cycle_reports_duplicates_removed(
+        self, scraper, mock_stockist, mock_database
+    ):
+        item = self._cached_item()
+        mock_stockist.get_amiibo.return_value = [
+            item,
+            {**item, "URL": "https://TEST.com/cached/", "Price": "$1.00"},
+            {**item, "URL": "https://test.com/other"},
+        ]
+
+        stats = scraper.scrape_cycle()
+
+        (validated,) = mock_database.check_then_add_or_update_amiibo.call_args[0]
+        assert [product.url for product in validated] == [
+            "https://test.com/cached",
+            "https://test.com/other",
+        ]
+        assert stats.duplicates_removed == 1
+        assert stats.stockist_results[0].duplicates_removed == 1
+
+    def test_invalid_copy_does_not_displace_valid_duplicate(
+        self, scraper, mock_stockist, mock_database
+    ):
+        item = self._cached_item()
+        mock_stockist.get_amiibo.return_value = [
+            {**item, "Price": None},
+            {**item, "URL": "https://test.com/cached/"},
+        ]
+
+        stats = scraper.scrape_cycle()
+
+        (validated,) = mock_database.check_then_add_or_update_amiibo.call_args[0]
+        assert [product.url for product in validated] == ["https://test.com/cached/"]
+        assert stats.duplicates_removed == 0
+
     def test_scrape_returns_partial_on_some_failures(self, scraper):
         scraper.scrape_cycle = Mock()
         scraper.scrape_cycle.return_value = CycleStats(
@@ -156,6 +198,51 @@ class TestScraper:
         assert calls[0][0][0] == 2
         assert calls[1][0][0] == 4
 
+    @patch("time.sleep")
+    def test_scrape_stockist_stops_retrying_at_deadline(
+        self, mock_sleep, scraper, mock_stockist
+    ):
+        from stockist.deadline import DeadlineExceeded
+
+        mock_stockist.get_amiibo.side_effect = DeadlineExceeded("out of time")
+
+        with pytest.raises(DeadlineExceeded):
+            scraper._scrape_stockist(mock_stockist)
+
+        assert mock_stockist.get_amiibo.call_count == 1
+        mock_sleep.assert_not_called()
+        assert mock_stockist.deadline is None
+
+    def test_scrape_stockist_sets_deadline_from_config(
+        self, mock_stockists, mock_database, mock_stockist
+    ):
+        config = Mock()
+        config.scraper = ScraperConfig(stockist_deadline=5)
+        scraper = Scraper(
+            config=config, stockists=mock_stockists, database=mock_database
+        )
+        budgets = []
+        mock_stockist.get_amiibo.side_effect = (
+            lambda: budgets.append(mock_stockist.deadline.seconds) or []
+        )
+
+        scraper._scrape_stockist(mock_stockist)
+
+        assert budgets == [5]
+
+    def test_deadline_exceeded_skips_reconcile(
+        self, scraper, mock_stockist, mock_database
+    ):
+        from stockist.deadline import DeadlineExceeded
+
+        mock_stockist.get_amiibo.side_effect = DeadlineExceeded("out of time")
+
+        result = scraper.scrape_cycle()
+
+        assert result.failed == 1
+        mock_database.check_then_add_or_update_amiibo.assert_not_called()
+        mock_database.record_stockist_outcome.assert_called_once_with("test.com", None)
+
     def test_scrape_handles_exception(self, scraper):
         scraper.scrape_cycle = Mock()
         scraper.scrape_cycle.side_effect = Exception("Unexpected")
@@ -185,14 +272,13 @@ class TestScraper:
         mock_stockist.get_amiibo.side_effect = Exception("Scraping error")
         result = scraper.scrape_cycle()
         assert result.failed == 1
-        mock_database.record_scraping_failure.assert_called_once_with("test.com")
-        mock_database.record_scrape_attempt.assert_called_once()
+        mock_database.record_stockist_outcome.assert_called_once_with("test.com", None)
+        assert result.stockist_results[0].consecutive_failures == 1
 
     def test_scrape_cycle_empty_items_tracks_failure(self, scraper, mock_database):
         result = scraper.scrape_cycle()
         assert result.failed == 1
-        mock_database.record_scraping_failure.assert_called_once()
-        mock_database.record_scrape_attempt.assert_called_once()
+        mock_database.record_stockist_outcome.assert_called_once_with("test.com", None)
 
     def test_scrape_cycle_success_with_items(
         self, scraper, mock_stockist, mock_database
@@ -209,14 +295,15 @@ class TestScraper:
             }
         ]
         mock_stockist.get_amiibo.return_value = items
-        mock_database.get_last_healthy_count.return_value = 2
+        mock_database.record_stockist_outcome.return_value = StockistHealth(
+            baseline_count=2
+        )
 
         result = scraper.scrape_cycle()
 
         assert result.succeeded == 1
         assert result.failed == 0
-        mock_database.record_scraping_success.assert_called_once_with("test.com")
-        mock_database.record_healthy_scrape.assert_called_once()
+        mock_database.record_stockist_outcome.assert_called_once_with("test.com", 1)
 
     def test_scrape_cycle_with_all_invalid_data_is_failure(
         self, scraper, mock_stockist, mock_database
@@ -234,8 +321,7 @@ class TestScraper:
 
         assert result.failed == 1
         assert result.succeeded == 0
-        mock_database.record_scraping_failure.assert_called_once()
-        mock_database.record_scraping_success.assert_not_called()
+        mock_database.record_stockist_outcome.assert_called_once_with("test.com", None)
         mock_database.check_then_add_or_update_amiibo.assert_not_called()
 
     def test_scrape_cycle_with_notifications(
@@ -253,20 +339,62 @@ class TestScraper:
             }
         ]
         mock_stockist.get_amiibo.return_value = items
-        mock_database.check_then_add_or_update_amiibo.return_value = items
+        mock_database.check_then_add_or_update_amiibo.return_value = [
+            Product.from_dict(item) for item in items
+        ]
+
+        entry = NotificationOutbox(
+            id=1,
+            idempotency_key="abc123",
+            messenger_name="test_messenger",
+            website="test.com",
+            url="https://test.com/1",
+            title="Test Amiibo",
+            stock_status="In stock",
+            colour=0x00FF00,
+            image="https://test.com/img.jpg",
+            price="$19.99",
+            attempts=0,
+        )
+        mock_database.get_outbox.return_value = [entry]
 
         result = scraper.scrape_cycle()
 
-        mock_messenger.send_embed_message.assert_called_once()
+        call_args = mock_database.check_then_add_or_update_amiibo.call_args
+        assert call_args.kwargs["notify"] == ["test_messenger"]
+        mock_messenger.send_embed_messages.assert_called_once_with(
+            [Product.from_dict(item) for item in items]
+        )
+        mock_database.settle_outbox.assert_called_once()
         assert result.notifications_sent == 1
 
+    def test_scrape_cycle_wakes_background_outbox(
+        self, scraper, mock_stockist, mock_database, mock_messenger
+    ):
+        mock_stockist.get_amiibo.return_value = [self._cached_item()]
+        mock_database.check_then_add_or_update_amiibo.return_value = [
+            Product.from_dict(self._cached_item())
+        ]
+        scraper.outbox = Mock(running=True)
+
+        result = scraper.scrape_cycle()
+
+        scraper.outbox.wake.assert_called_once()
+        scraper.outbox.flush.assert_not_called()
+        mock_messenger.send_embed_messages.assert_not_called()
+        assert result.notifications_sent == 0
+
     def test_scrape_cycle_multiple_stockists(self, mock_config, mock_database):
         stockist1 = Mock()
         stockist1.name = "stockist1.com"
+        stockist1.poll_interval = 0
+        stockist1.priority = 0
         stockist1.messengers = []
         stockist1.get_amiibo.return_value = []
         stockist2 = Mock()
         stockist2.name = "stockist2.com"
+        stockist2.poll_interval = 0
+        stockist2.priority = 0
         stockist2.messengers = []
         stockist2.get_amiibo.return_value = []
         stockists = Mock()
@@ -296,10 +424,14 @@ class TestScraper:
         ]
         mock_stockist.get_amiibo.return_value = items
         mock_stockist.messengers = ["different_messenger"]
-        mock_database.check_then_add_or_update_amiibo.return_value = items
+        mock_database.check_then_add_or_update_amiibo.return_value = [
+            Product.from_dict(item) for item in items
+        ]
 
         result = scraper.scrape_cycle()
 
+        call_args = mock_database.check_then_add_or_update_amiibo.call_args
+        assert call_args.kwargs["notify"] == []
         assert result.succeeded == 1
         assert result.notifications_sent == 0
 
@@ -334,29 +466,6 @@ class TestScraper:
         assert call_args[0][0][0]["Title"] == "Valid Amiibo"
         assert result.succeeded == 1
 
-    def test_scrape_cycle_with_suppressed_notifications(
-        self, scraper, mock_stockist, mock_database, mock_messenger
-    ):
-        items = [
-            {
-                "Title": "Test Amiibo",
-                "Price": "$19.99",
-                "Stock": "In stock",
-                "URL": "https://test.com/1",
-                "Website": "test.com",
-                "Image": "https://test.com/img.jpg",
-                "Colour": 0x00FF00,
-            }
-        ]
-        mock_stockist.get_amiibo.return_value = items
-        mock_database.check_then_add_or_update_amiibo.return_value = items
-        mock_database.should_suppress_notification.return_value = True
-
-        result = scraper.scrape_cycle()
-
-        mock_messenger.send_embed_message.assert_not_called()
-        assert result.notifications_sent == 0
-
     def test_low_ratio_skips_delisting_below_threshold(
         self, scraper, mock_stockist, mock_database
     ):
@@ -372,9 +481,9 @@ class TestScraper:
             }
         ]
         mock_stockist.get_amiibo.return_value = items
-        mock_database.get_last_healthy_count.return_value = 100
-        mock_database.record_unhealthy_scrape.return_value = 1
-        mock_database.get_consecutive_unhealthy_obs.return_value = 1
+        mock_database.record_stockist_outcome.return_value = StockistHealth(
+            baseline_count=100, unhealthy_obs=1, skip_delisting=True
+        )
 
         scraper.scrape_cycle()
 
@@ -396,13 +505,13 @@ class TestScraper:
             }
         ]
         mock_stockist.get_amiibo.return_value = items
-        mock_database.get_last_healthy_count.return_value = 100
-        mock_database.record_unhealthy_scrape.return_value = 2
-        mock_database.get_consecutive_unhealthy_obs.return_value = 2
+        mock_database.record_stockist_outcome.return_value = StockistHealth(
+            baseline_count=100, unhealthy_obs=2, skip_delisting=False
+        )
 
         scraper.scrape_cycle()
 
-        mock_database.record_healthy_scrape.assert_called_once_with("test.com", 1)
+        mock_database.record_stockist_outcome.assert_called_once_with("test.com", 1)
         call_args = mock_database.check_then_add_or_update_amiibo.call_args
         assert call_args[1]["skip_delisting"] is False
 
@@ -421,11 +530,15 @@ class TestScraper:
             }
         ]
         mock_stockist.get_amiibo.return_value = items
-        mock_database.get_last_healthy_count.return_value = 1
+        mock_database.record_stockist_outcome.return_value = StockistHealth(
+            baseline_count=1
+        )
 
         scraper.scrape_cycle()
 
-        mock_database.record_healthy_scrape.assert_called_once_with("test.com", 1)
+        mock_database.record_stockist_outcome.assert_called_once_with("test.com", 1)
+        call_args = mock_database.check_then_add_or_update_amiibo.call_args
+        assert call_args[1]["skip_delisting"] is False
 
     def test_no_prior_baseline_records_healthy(
         self, scraper, mock_stockist, mock_database
@@ -442,8 +555,362 @@ class TestScraper:
             }
         ]
         mock_stockist.get_amiibo.return_value = items
-        mock_database.get_last_healthy_count.return_value = 0
+        mock_database.record_stockist_outcome.return_value = StockistHealth()
 
         scraper.scrape_cycle()
 
-        mock_database.record_healthy_scrape.assert_called_once_with("test.com", 1)
+        mock_database.record_stockist_outcome.assert_called_once_with("test.com", 1)
+
+    def test_scrape_cycle_reconciles_in_stockist_order(
+        self, mock_config, mock_database
+    ):
+        import time as real_time
+
+        def make_stockist(name, delay):
+            stockist = Mock()
+            stockist.name = name
+            stockist.poll_interval = 0
+            stockist.priority = 0
+            stockist.messengers = []
+
+            def get_amiibo():
+                real_time.sleep(delay)
+                return [
+                    {
+                        "Title": f"{name} Amiibo",
+                        "Price": "$19.99",
+                        "Stock": "In stock",
+                        "URL": f"https://{name}/1",
+                        "Website": name,
+                        "Image": "https://test.com/img.jpg",
+                        "Colour": 0x00FF00,
+                    }
+                ]
+
+            stockist.get_amiibo.side_effect = get_amiibo
+            return stockist
+
+        stockists = Mock()
+        stockists.all_stockists = [
+            make_stockist("slow.com", 0.2),
+            make_stockist("fast.com", 0.0),
+        ]
+        stockists.messengers = Mock()
+        stockists.messengers.all_messengers = []
+        scraper = Scraper(
+            config=mock_config, stockists=stockists, database=mock_database
+        )
+
+        result = scraper.scrape_cycle()
+
+        assert result.succeeded == 2
+        assert [r.name for r in result.stockist_results] == ["slow.com", "fast.com"]
+        websites = [
+            c[0][0][0]["Website"]
+            for c in mock_database.check_then_add_or_update_amiibo.call_args_list
+        ]
+        assert websites == ["slow.com", "fast.com"]
+
+    def test_scrape_cycle_fetches_concurrently(self, mock_config, mock_database):
+        import threading
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def make_stockist(name):
+            stockist = Mock()
+            stockist.name = name
+            stockist.poll_interval = 0
+            stockist.priority = 0
+            stockist.messengers = []
+
+            def get_amiibo():
+                barrier.wait()
+                return []
+
+            stockist.get_amiibo.side_effect = get_amiibo
+            return stockist
+
+        stockists = Mock()
+        stockists.all_stockists = [make_stockist("a.com"), make_stockist("b.com")]
+        stockists.messengers = Mock()
+        stockists.messengers.all_messengers = []
+        scraper = Scraper(
+            config=mock_config, stockists=stockists, database=mock_database
+        )
+
+        result = scraper.scrape_cycle()
+
+        assert result.failed == 2
+        assert not barrier.broken
+
+    def test_max_workers_from_config(self, mock_stockists, mock_database):
+        config = Mock()
+        config.scraper = ScraperConfig(max_workers=7)
+        scraper = Scraper(
+            config=config, stockists=mock_stockists, database=mock_database
+        )
+        assert scraper.max_workers == 7
+
+    def _scheduled_stockist(self, name, poll_interval, priority=0, site=None):
+        stockist = Mock()
+        stockist.name = name
+        stockist.site = site
+        stockist.poll_interval = poll_interval
+        stockist.priority = priority
+        stockist.messengers = []
+        stockist.get_amiibo.return_value = []
+        return stockist
+
+    def _scraper_for(self, config, database, stockist_list):
+        stockists = Mock()
+        stockists.all_stockists = stockist_list
+        stockists.messengers = Mock()
+        stockists.messengers.all_messengers = []
+        return Scraper(config=config, stockists=stockists, database=database)
+
+    def test_scrape_cycle_skips_stockists_not_due(self, mock_config, mock_database):
+        from datetime import datetime, timedelta
+
+        hot = self._scheduled_stockist("hot", poll_interval=60)
+        heavy = self._scheduled_stockist("heavy", poll_interval=3600)
+        new = self._scheduled_stockist("new", poll_interval=3600)
+        mock_database.get_last_attempts.return_value = {
+            "hot": datetime.now() - timedelta(seconds=120),
+            "heavy": datetime.now() - timedelta(seconds=120),
+        }
+        scraper = self._scraper_for(mock_config, mock_database, [hot, heavy, new])
+
+        result = scraper.scrape_cycle()
+
+        assert result.skipped == 1
+        assert result.failed == 2
+        hot.get_amiibo.assert_called_once()
+        new.get_amiibo.assert_called_once()
+        heavy.get_amiibo.assert_not_called()
+
+    def test_due_stockists_allow_early_poll_within_tolerance(
+        self, mock_config, mock_database
+    ):
+        from datetime import datetime, timedelta
+
+        stockist = self._scheduled_stockist("cron", poll_interval=1800)
+        mock_database.get_last_attempts.return_value = {
+            "cron": datetime.now() - timedelta(seconds=1790)
+        }
+        scraper = self._scraper_for(mock_config, mock_database, [stockist])
+
+        assert scraper._due_stockists([stockist]) == [stockist]
+
+    def test_due_stockists_ordered_by_priority(self, mock_config, mock_database):
+        low = self._scheduled_stockist("low", poll_interval=0, priority=-10)
+        first = self._scheduled_stockist("first", poll_interval=0)
+        high = self._scheduled_stockist("high", poll_interval=0, priority=10)
+        second = self._scheduled_stockist("second", poll_interval=0)
+        scraper = self._scraper_for(mock_config, mock_database, [])
+
+        due = scraper._due_stockists([low, first, high, second])
+
+        assert [s.name for s in due] == ["high", "first", "second", "low"]
+
+    def test_schedule_override_from_config(self, mock_database):
+        from datetime import datetime, timedelta
+
+        from config.config import StockistScheduleConfig
+
+        config = Mock()
+        config.scraper = ScraperConfig(
+            stockists={"shopto.net": StockistScheduleConfig(poll_interval=7200)}
+        )
+        stockist = self._scheduled_stockist("Hot", poll_interval=60, site="shopto.net")
+        mock_database.get_last_attempts.return_value = {
+            "Hot": datetime.now() - timedelta(seconds=600)
+        }
+        scraper = self._scraper_for(config, mock_database, [stockist])
+
+        assert scraper._poll_settings(stockist) == (7200, 0)
+        assert scraper._due_stockists([stockist]) == []
+
+    def _cached_item(self):
+        return {
+            "Title": "Cached Amiibo",
+            "Price": "$19.99",
+            "Stock": "In stock",
+            "URL": "https://test.com/cached",
+            "Website": "test.com",
+            "Image": "https://test.com/img.jpg",
+            "Colour": 0x00FF00,
+        }
+
+    def test_not_modified_stockist_skips_reconcile(
+        self, scraper, mock_stockist, mock_database
+    ):
+        from stockist.httpcache import Fetch
+
+        def get_amiibo():
+            mock_stockist.fetches.append(Fetch(url="https://test.com", changed=False))
+            return [self._cached_item()]
+
+        mock_stockist.get_amiibo.side_effect = get_amiibo
+
+        result = scraper.scrape_cycle()
+
+        assert result.succeeded == 1
+        mock_database.record_stockist_heartbeat.assert_called_once_with("test.com")
+        mock_database.record_stockist_outcome.assert_not_called()
+        mock_database.check_then_add_or_update_amiibo.assert_not_called()
+
+    def test_validators_stored_after_reconcile(
+        self, scraper, mock_stockist, mock_database
+    ):
+        from stockist.httpcache import CacheEntry, Fetch
+
+        entry = CacheEntry(etag='"v1"', last_modified=None, body=b"page")
+
+        def get_amiibo():
+            mock_stockist.fetches.append(
+                Fetch(url="https://test.com", changed=True, entry=entry)
+            )
+            return [self._cached_item()]
+
+        mock_stockist.get_amiibo.side_effect = get_amiibo
+        mock_database.record_stockist_outcome.return_value = StockistHealth()
+        scraper.http_cache = Mock()
+
+        scraper.scrape_cycle()
+
+        mock_database.check_then_add_or_update_amiibo.assert_called_once()
+        scraper.http_cache.store.assert_called_once_with({"https://test.com": entry})
+
+    def test_validators_not_stored_while_misses_pending(
+        self, scraper, mock_stockist, mock_database
+    ):
+        from stockist.httpcache import CacheEntry, Fetch
+
+        def get_amiibo():
+            mock_stockist.fetches.append(
+                Fetch(
+                    url="https://test.com",
+                    changed=True,
+                    entry=CacheEntry(etag='"v1"', last_modified=None, body=b""),
+                )
+            )
+            return [self._cached_item()]
+
+        mock_stockist.get_amiibo.side_effect = get_amiibo
+        mock_database.record_stockist_outcome.return_value = StockistHealth()
+        mock_database.has_pending_misses.return_value = True
+        scraper.http_cache = Mock()
+
+        scraper.scrape_cycle()
+
+        scraper.http_cache.store.assert_not_called()
+
+    def test_conditional_requests_can_be_disabled(self, mock_stockists, mock_database):
+        config = Mock()
+        config.scraper = ScraperConfig(conditional_requests=False)
+
+        scraper = Scraper(
+            config=config, stockists=mock_stockists, database=mock_database
+        )
+
+        assert scraper.http_cache is None
+
+    def test_matching_listing_hash_skips_validation_and_reconcile(
+        self, scraper, mock_stockist, mock_database
+    ):
+        from models import listing_hash
+
+        items = [self._cached_item()]
+        mock_stockist.get_amiibo.return_value = items
+        mock_database.get_content_hashes.return_value = {
+            "test.com": listing_hash(items)
+        }
+
+        with patch("scraper.validate_products") as mock_validate:
+            result = scraper.scrape_cycle()
+
+        assert result.succeeded == 1
+        mock_validate.assert_not_called()
+        mock_database.record_stockist_heartbeat.assert_called_once_with("test.com")
+        mock_database.check_then_add_or_update_amiibo.assert_not_called()
+
+    def test_listing_hash_stored_after_reconcile(
+        self, scraper, mock_stockist, mock_database
+    ):
+        from models import listing_hash
+
+        items = [self._cached_item()]
+        mock_stockist.get_amiibo.return_value = items
+        mock_database.record_stockist_outcome.return_value = StockistHealth()
+
+        scraper.scrape_cycle()
+
+        mock_database.check_then_add_or_update_amiibo.assert_called_once()
+        mock_database.record_content_hash.assert_called_once_with(
+            "test.com", listing_hash(items)
+        )
+
+    def test_listing_hash_cleared_when_delisting_skipped(
+        self, scraper, mock_stockist, mock_database
+    ):
+        mock_stockist.get_amiibo.return_value = [self._cached_item()]
+        mock_database.record_stockist_outcome.return_value = StockistHealth(
+            baseline_count=10, unhealthy_obs=1, skip_delisting=True
+        )
+
+        scraper.scrape_cycle()
+
+        mock_database.record_content_hash.assert_called_once_with("test.com", None)
+
+    def test_listing_hash_ignores_item_order(self):
+        from models import listing_hash
+
+        first = self._cached_item()
+        second = {**first, "URL": "https://test.com/other"}
+
+        assert listing_hash([first, second]) == listing_hash([second, first])
+        assert listing_hash([first]) != listing_hash([{**first, "Price": "$9.99"}])
+
+    def test_product_round_trips_dict_shape(self):
+        item = self._cached_item()
+        product = Product.from_dict(item)
+
+        assert product.to_dict() == item
+        assert product["Title"] == product.title == "Cached Amiibo"
+        assert Product.coerce(product) is product
+        assert not hasattr(product, "__dict__")
+        with pytest.raises(KeyError):
+            product["title"]
+
+    def test_listing_hash_same_for_product_and_dict(self):
+        from models import listing_hash
+
+        item = self._cached_item()
+
+        assert listing_hash([Product.from_dict(item)]) == listing_hash([item])
+
+    def test_validate_products_returns_products(self):
+        from models import validate_products
+
+        valid, errors = validate_products([self._cached_item(), {"Title": "Broken"}])
+
+        assert valid == [Product.from_dict(self._cached_item())]
+        fields = ("Price", "Stock", "URL", "Website", "Image", "Colour")
+        assert {(error.index, error.field) for error in errors} == {
+            (1, field) for field in fields
+        }
+        assert str(errors[0]).startswith("item 1 ")
+
+    def test_validate_products_skips_model_for_known_good_rows(self):
+        from models import validate_products
+
+        good = Product.from_dict(self._cached_item())
+        dirty = Product.from_dict({**self._cached_item(), "Title": "Bad\x07 Title"})
+
+        with patch("models._SCRAPED_PRODUCTS") as mock_adapter:
+            assert validate_products([good, good]) == ([good, good], [])
+        mock_adapter.validate_python.assert_not_called()
+
+        valid, errors = validate_products([dirty, good])
+        assert [item.title for item in valid] == ["Bad Title", "Cached Amiibo"]
+        assert errors == []
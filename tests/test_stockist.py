@@ -2,9 +2,12 @@
 Unit tests for stockist module.
 """
 
+import json
+
 import pytest
 from unittest.mock import Mock, patch
 from stockist.stockist import Stockist, Stock
+from stockist.browser import BrowserPool
 from stockist.manager import StockistManager, STOCKIST_FACTORY
 from stockist.useragents import UserAgent
 from stockist.utils import send_public_request
@@ -20,6 +23,8 @@ from stockist.shopto import Shopto
 from stockist.thesource import TheSource
 import requests
 
+from constants import REQUEST_TIMEOUT
+
 
 class TestStock:
     """Test Stock enumeration."""
@@ -63,9 +68,295 @@ class TestStockist:
 
         assert result == mock_response
         mock_request.assert_called_once_with(
-            url="https://test.com", payload={"key": "value"}
+            url="https://test.com", payload={"key": "value"}, timeout=REQUEST_TIMEOUT
+        )
+
+    @patch("stockist.stockist.send_public_request")
+    def test_scrape_serves_cached_body_on_not_modified(
+        self, mock_request, stockist, tmp_path
+    ):
+        """Test a 304 returns the cached body and records an unchanged fetch."""
+        from stockist.httpcache import CacheEntry, ValidatorCache
+
+        cache = ValidatorCache(tmp_path)
+        cache.store(
+            {
+                "https://test.com?page=1": CacheEntry(
+                    etag='"v1"', last_modified=None, body=b"cached"
+                )
+            }
+        )
+        stockist.http_cache = cache
+        stockist.fetches = []
+        mock_request.return_value = Mock(status_code=304, content=b"")
+
+        response = stockist.scrape(url="https://test.com", payload={"page": 1})
+
+        assert response.content == b"cached"
+        assert mock_request.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+        assert [(f.url, f.changed) for f in stockist.fetches] == [
+            ("https://test.com?page=1", False)
+        ]
+
+    @patch("stockist.stockist.send_public_request")
+    def test_scrape_records_validators_from_response(
+        self, mock_request, stockist, tmp_path
+    ):
+        """Test a 200 with validators is recorded but not yet cached."""
+        from stockist.httpcache import ValidatorCache
+
+        stockist.http_cache = ValidatorCache(tmp_path)
+        stockist.fetches = []
+        mock_request.return_value = Mock(
+            status_code=200,
+            content=b"fresh",
+            headers={"ETag": '"v2"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
         )
 
+        stockist.scrape(url="https://test.com", payload=None)
+
+        assert mock_request.call_args.kwargs["headers"] is None
+        (fetch,) = stockist.fetches
+        assert fetch.changed is True
+        assert fetch.entry.etag == '"v2"'
+        assert fetch.entry.body == b"fresh"
+        assert stockist.http_cache.lookup("https://test.com") is None
+
+    @patch("stockist.stockist.send_public_request")
+    def test_scrape_stream_yields_chunks_and_closes(
+        self, mock_request, stockist, tmp_path
+    ):
+        """Test a streamed page is yielded chunk by chunk and then cached."""
+        from stockist.httpcache import ValidatorCache
+
+        stockist.http_cache = ValidatorCache(tmp_path)
+        stockist.fetches = []
+        response = Mock(status_code=200, headers={"ETag": '"v3"'})
+        response.iter_content.return_value = iter([b"<div>", b"</div>"])
+        mock_request.return_value = response
+
+        chunks = list(stockist.scrape_stream(url="https://test.com", payload=None))
+
+        assert chunks == [b"<div>", b"</div>"]
+        assert mock_request.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
+        (fetch,) = stockist.fetches
+        assert fetch.changed is True
+        assert fetch.entry.body == b"<div></div>"
+
+    @patch("stockist.stockist.send_public_request")
+    def test_scrape_stream_serves_cached_body_on_not_modified(
+        self, mock_request, stockist, tmp_path
+    ):
+        """Test a streamed 304 yields the cached body."""
+        from stockist.httpcache import CacheEntry, ValidatorCache
+
+        stockist.http_cache = ValidatorCache(tmp_path)
+        stockist.http_cache.store(
+            {"https://test.com": CacheEntry(etag='"v1"', last_modified=None, body=b"x")}
+        )
+        stockist.fetches = []
+        mock_request.return_value = Mock(status_code=304)
+
+        chunks = list(stockist.scrape_stream(url="https://test.com", payload=None))
+
+        assert chunks == [b"x"]
+        assert [f.changed for f in stockist.fetches] == [False]
+
+    @patch("stockist.stockist.send_public_request")
+    def test_scrape_stream_raises_when_deadline_expires(self, mock_request, stockist):
+        """Test a download that outlives the budget stops with an error."""
+        from stockist.deadline import DeadlineExceeded
+
+        deadline = Mock()
+        deadline.clamp.side_effect = lambda timeout: timeout
+        deadline.check.side_effect = [None, None, None, DeadlineExceeded("late")]
+        stockist.deadline = deadline
+        response = Mock(status_code=200)
+        response.iter_content.return_value = iter([b"a", b"b"])
+        mock_request.return_value = response
+
+        chunks = stockist.scrape_stream(url="https://test.com", payload=None)
+
+        assert next(chunks) == b"a"
+        with pytest.raises(DeadlineExceeded):
+            next(chunks)
+        response.close.assert_called_once()
+
+    def test_deduplicate_keeps_first_per_canonical_url(self):
+        """Test repeats are dropped by canonical URL and counted."""
+        from models import Product
+
+        def product(url, price="$1"):
+            return Product(0, "Amiibo", "https://img", url, price, "In stock", "Shop")
+
+        unique, removed = Stockist.deduplicate(
+            iter(
+                [
+                    product("https://shop/a"),
+                    product("https://shop/b"),
+                    product("https://SHOP/a/", price="$2"),
+                    product("https://shop/b/", price="$3"),
+                ]
+            )
+        )
+
+        assert [(p.url, p.price) for p in unique] == [
+            ("https://shop/a", "$1"),
+            ("https://shop/b", "$1"),
+        ]
+        assert removed == 2
+
+    def test_fetch_pages_merges_in_page_order(self, stockist):
+        """Test fetch_pages keeps page order even when pages finish out of order."""
+        import time
+
+        def request(page):
+            time.sleep(0.05 * (3 - page))
+            return page
+
+        result = stockist.fetch_pages(
+            pages=range(1, 4),
+            request=request,
+            parse=lambda page, response: [{"page": response}],
+            window=3,
+        )
+
+        assert [r["page"] for r in result] == [1, 2, 3]
+
+    def test_fetch_pages_stops_at_first_empty_page(self, stockist):
+        """Test fetch_pages stops paginating after an empty page."""
+        requested = []
+
+        def request(page):
+            requested.append(page)
+            return page
+
+        result = stockist.fetch_pages(
+            pages=range(10),
+            request=request,
+            parse=lambda page, response: [{"page": page}] if page < 5 else [],
+            window=2,
+        )
+
+        assert [r["page"] for r in result] == [0, 1, 2, 3, 4]
+        assert sorted(requested) == [0, 1, 2, 3, 4, 5]
+
+    def test_fetch_pages_raises_when_deadline_expires(self, stockist):
+        """Test an exhausted budget aborts pagination instead of truncating."""
+        from stockist.deadline import Deadline, DeadlineExceeded
+
+        stockist.deadline = Deadline(60)
+
+        def request(page):
+            if page == 1:
+                stockist.deadline = Deadline(0)
+            return page
+
+        with pytest.raises(DeadlineExceeded):
+            stockist.fetch_pages(
+                pages=range(10),
+                request=request,
+                parse=lambda page, response: [{"page": page}],
+                window=2,
+            )
+
+    @patch("stockist.stockist.send_public_request")
+    def test_scrape_clamps_timeout_to_deadline(self, mock_request, stockist):
+        """Test request timeouts never exceed the remaining budget."""
+        from stockist.deadline import Deadline
+
+        stockist.deadline = Deadline(1)
+
+        stockist.scrape(url="https://test.com", payload=None)
+
+        timeout = mock_request.call_args.kwargs["timeout"]
+        assert 0 < timeout <= 1
+
+    @patch("stockist.stockist.send_public_request")
+    def test_scrape_raises_once_deadline_expired(self, mock_request, stockist):
+        """Test no request is made once the budget is spent."""
+        from stockist.deadline import Deadline, DeadlineExceeded
+
+        stockist.deadline = Deadline(0)
+
+        with pytest.raises(DeadlineExceeded):
+            stockist.scrape(url="https://test.com", payload=None)
+        mock_request.assert_not_called()
+
+    def test_ascrape_serves_cached_body_on_not_modified(self, stockist, tmp_path):
+        """Test the async path sends validators and honours a 304."""
+        import asyncio
+
+        import httpx
+
+        from stockist.httpcache import CacheEntry, ValidatorCache
+        from stockist.utils import AsyncClient
+
+        cache = ValidatorCache(tmp_path)
+        cache.store(
+            {
+                "https://test.com?page=1": CacheEntry(
+                    etag='"v1"', last_modified=None, body=b"cached"
+                )
+            }
+        )
+        stockist.http_cache = cache
+        stockist.fetches = []
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(
+                304 if request.headers.get("If-None-Match") == '"v1"' else 200
+            )
+        )
+
+        async def fetch():
+            async with AsyncClient(transport=transport) as client:
+                return await stockist.ascrape(client, "https://test.com", {"page": 1})
+
+        response = asyncio.run(fetch())
+
+        assert response.content == b"cached"
+        assert [(f.url, f.changed) for f in stockist.fetches] == [
+            ("https://test.com?page=1", False)
+        ]
+
+    def test_ascrape_raises_once_deadline_expired(self, stockist):
+        """Test the async path makes no request once the budget is spent."""
+        import asyncio
+
+        from stockist.deadline import Deadline, DeadlineExceeded
+
+        stockist.deadline = Deadline(0)
+        client = Mock()
+
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(stockist.ascrape(client, "https://test.com", None))
+        client.get.assert_not_called()
+
+    def test_fetch_pages_fetches_window_concurrently(self, stockist):
+        """Test fetch_pages issues a whole window of requests at once."""
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def request(page):
+            barrier.wait()
+            return page
+
+        result = stockist.fetch_pages(
+            pages=range(3),
+            request=request,
+            parse=lambda page, response: [{"page": page}],
+            window=3,
+        )
+
+        assert len(result) == 3
+        assert not barrier.broken
+
+    def test_fetch_pages_empty(self, stockist):
+        """Test fetch_pages with no pages."""
+        assert stockist.fetch_pages([], request=Mock(), parse=Mock()) == []
+
 
 class TestUserAgent:
     """Test UserAgent class."""
@@ -107,6 +398,23 @@ class TestStockistUtils:
         assert result == mock_response
         mock_session.get.assert_called_once()
 
+    @patch("stockist.utils._get_session")
+    def test_send_public_request_sends_extra_headers(self, mock_session_fn):
+        mock_session = Mock()
+        mock_session.get.return_value = Mock(status_code=304)
+        mock_session_fn.return_value = mock_session
+
+        send_public_request(
+            url="https://test.com",
+            payload={"q": "amiibo"},
+            headers={"If-None-Match": '"v1"'},
+        )
+
+        kwargs = mock_session.get.call_args.kwargs
+        assert kwargs["url"] == "https://test.com?q=amiibo"
+        assert kwargs["headers"]["If-None-Match"] == '"v1"'
+        assert "User-Agent" in kwargs["headers"]
+
     @patch("stockist.utils._get_session")
     def test_send_public_request_timeout(self, mock_session_fn):
         from stockist.utils import BlankResponse
@@ -131,6 +439,526 @@ class TestStockistUtils:
 
         assert isinstance(result, BlankResponse)
 
+    @patch("stockist.utils._session", None)
+    def test_session_keeps_pooled_connections_per_host(self):
+        from constants import HTTP_POOL_MAXSIZE
+        from stockist.utils import _get_session
+
+        session = _get_session()
+        adapter = session.get_adapter("https://test.com")
+
+        assert _get_session() is session
+        assert adapter._pool_maxsize == HTTP_POOL_MAXSIZE
+        assert adapter._pool_block is True
+
+    def test_async_client_returns_response_and_blank_on_errors(self):
+        import asyncio
+
+        import httpx
+
+        from stockist.utils import AsyncClient, BlankResponse
+
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            if request.url.path == "/down":
+                raise httpx.ConnectError("refused", request=request)
+            status = {"/ok": 200, "/cached": 304, "/error": 500}[request.url.path]
+            return httpx.Response(status, content=b"body")
+
+        async def fetch_all():
+            async with AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await asyncio.gather(
+                    client.get("https://test.com/ok", payload={"q": "amiibo"}),
+                    client.get(
+                        "https://test.com/cached", headers={"If-None-Match": '"v1"'}
+                    ),
+                    client.get("https://test.com/error"),
+                    client.get("https://test.com/down"),
+                )
+
+        ok, cached, error, down = asyncio.run(fetch_all())
+
+        assert ok.content == b"body"
+        assert cached.status_code == 304
+        assert isinstance(error, BlankResponse)
+        assert isinstance(down, BlankResponse)
+        assert str(seen[0].url) == "https://test.com/ok?q=amiibo"
+        assert seen[1].headers["If-None-Match"] == '"v1"'
+        assert all("User-Agent" in request.headers for request in seen)
+
+    def test_async_client_limits_requests_per_host(self):
+        import asyncio
+
+        import httpx
+
+        from stockist.utils import AsyncClient
+
+        in_flight: dict[str, int] = {}
+        peak: dict[str, int] = {}
+
+        async def handler(request):
+            host = request.url.host
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+            return httpx.Response(200)
+
+        async def fetch_all():
+            async with AsyncClient(
+                max_per_host=2, transport=httpx.MockTransport(handler)
+            ) as client:
+                await asyncio.gather(
+                    *(
+                        client.get(f"https://{host}/{page}")
+                        for host in ("a.test", "b.test")
+                        for page in range(6)
+                    )
+                )
+
+        asyncio.run(fetch_all())
+
+        assert peak == {"a.test": 2, "b.test": 2}
+
+
+class TestBrowserPool:
+    """Test the shared Selenium browser pool."""
+
+    def test_lease_reuses_warm_driver_and_clears_cookies(self):
+        """Test a released driver is handed out again with cookies cleared."""
+        driver = Mock()
+        factory = Mock(return_value=driver)
+        pool = BrowserPool(size=1, max_pages=10, factory=factory)
+
+        with pool.lease() as first:
+            pass
+        with pool.lease() as second:
+            pass
+
+        assert first is second is driver
+        factory.assert_called_once()
+        driver.execute_cdp_cmd.assert_called_with("Network.clearBrowserCookies", {})
+        assert driver.execute_cdp_cmd.call_count == 2
+        driver.quit.assert_not_called()
+
+    def test_release_clears_cookies_for_every_domain(self):
+        """Test cookies set by other domains do not survive a release."""
+
+        class CookieDriver:
+            def __init__(self):
+                self.url = "about:blank"
+                self.cookies: dict[str, set[str]] = {}
+
+            def get(self, url):
+                self.url = url
+
+            def add_cookie(self, domain, name):
+                self.cookies.setdefault(domain, set()).add(name)
+
+            def delete_all_cookies(self):
+                self.cookies.pop(self.url, None)
+
+            def execute_cdp_cmd(self, cmd, args):
+                if cmd == "Network.clearBrowserCookies":
+                    self.cookies.clear()
+
+        driver = CookieDriver()
+        pool = BrowserPool(size=1, max_pages=10, factory=lambda: driver)
+
+        with pool.lease() as leased:
+            leased.get("https://shop.test")
+            leased.add_cookie("https://shop.test", "basket")
+            leased.add_cookie("https://cdn.test", "tracker")
+
+        with pool.lease() as leased:
+            assert leased is driver
+            assert leased.cookies == {}
+
+    def test_driver_recycled_after_max_pages(self):
+        """Test a driver is quit once it has served max_pages pages."""
+        drivers = [Mock(), Mock()]
+        pool = BrowserPool(size=1, max_pages=2, factory=Mock(side_effect=drivers))
+
+        leased = []
+        for _ in range(3):
+            with pool.lease() as driver:
+                leased.append(driver)
+
+        assert leased == [drivers[0], drivers[0], drivers[1]]
+        drivers[0].quit.assert_called_once()
+        drivers[1].quit.assert_not_called()
+
+    def test_driver_discarded_when_lease_fails(self):
+        """Test a crashed driver is quit rather than returned to the pool."""
+        from selenium.common.exceptions import WebDriverException
+
+        drivers = [Mock(), Mock()]
+        pool = BrowserPool(size=1, max_pages=10, factory=Mock(side_effect=drivers))
+
+        with pytest.raises(WebDriverException), pool.lease():
+            raise WebDriverException("chrome crashed")
+        with pool.lease() as driver:
+            assert driver is drivers[1]
+
+        drivers[0].quit.assert_called_once()
+
+    def test_lease_waits_when_pool_is_full(self):
+        """Test no more than size drivers are started concurrently."""
+        import threading
+
+        factory = Mock(side_effect=lambda: Mock())
+        pool = BrowserPool(size=1, max_pages=10, factory=factory)
+        acquired = threading.Event()
+
+        def second_lease():
+            with pool.lease():
+                acquired.set()
+
+        with pool.lease():
+            worker = threading.Thread(target=second_lease)
+            worker.start()
+            assert not acquired.wait(0.1)
+        worker.join(timeout=5)
+
+        assert acquired.is_set()
+        factory.assert_called_once()
+
+    def test_lease_wait_is_bounded_by_deadline(self):
+        """Test a full pool gives up once the stockist's budget is spent."""
+        from stockist.deadline import Deadline, DeadlineExceeded
+
+        pool = BrowserPool(size=1, max_pages=10, factory=Mock())
+
+        with (
+            pool.lease(),
+            pytest.raises(DeadlineExceeded, match="waiting for a browser"),
+            pool.lease(Deadline(0.05), "Slow"),
+        ):
+            pass
+
+    def test_lease_checks_deadline_after_driver_start(self):
+        """Test a browser that outlasts the budget is pooled, not used."""
+        from stockist.deadline import Deadline, DeadlineExceeded
+
+        driver = Mock()
+        pool = BrowserPool(size=1, max_pages=10, factory=Mock(return_value=driver))
+
+        with pytest.raises(DeadlineExceeded), pool.lease(Deadline(0), "Slow"):
+            pytest.fail("lease should not yield")
+
+        with pool.lease() as reused:
+            assert reused is driver
+
+    def test_close_quits_idle_drivers(self):
+        """Test close quits idle drivers and refuses further leases."""
+        driver = Mock()
+        pool = BrowserPool(size=1, max_pages=10, factory=Mock(return_value=driver))
+        with pool.lease():
+            pass
+
+        pool.close()
+
+        driver.quit.assert_called_once()
+        with pytest.raises(RuntimeError), pool.lease():
+            pass
+
+    def test_scrape_with_selenium_uses_pool(self):
+        """Test scrape_with_selenium loads the page on a leased driver."""
+        driver = Mock()
+        driver.execute_script.return_value = "complete"
+        driver.page_source = "<html></html>"
+        pool = BrowserPool(size=1, max_pages=10, factory=Mock(return_value=driver))
+
+        with patch("stockist.stockist.get_browser_pool", return_value=pool):
+            html = Stockist(messengers=[]).scrape_with_selenium(
+                "https://example.com", None
+            )
+
+        assert html == "<html></html>"
+        assert [c.args for c in driver.get.call_args_list] == [
+            ("https://example.com",),
+            ("about:blank",),
+        ]
+        driver.quit.assert_not_called()
+
+    def test_scrape_with_selenium_returns_empty_on_webdriver_error(self):
+        """Test a WebDriver failure yields an empty page and a fresh driver."""
+        from selenium.common.exceptions import WebDriverException
+
+        driver = Mock()
+        driver.get.side_effect = WebDriverException("tab crashed")
+        pool = BrowserPool(size=1, max_pages=10, factory=Mock(return_value=driver))
+
+        with patch("stockist.stockist.get_browser_pool", return_value=pool):
+            html = Stockist(messengers=[]).scrape_with_selenium(
+                "https://example.com", None
+            )
+
+        assert html == ""
+        driver.quit.assert_called_once()
+
+
+class TestDeadline:
+    """Test the per-stockist time budget."""
+
+    def test_remaining_and_clamp(self):
+        """Test clamp shortens timeouts to the remaining budget."""
+        from stockist.deadline import Deadline
+
+        deadline = Deadline(2)
+
+        assert 0 < deadline.remaining() <= 2
+        assert deadline.clamp(20) <= 2
+        assert deadline.clamp(0.5) == 0.5
+        assert not deadline.expired
+
+    def test_check_raises_when_expired(self):
+        """Test check raises DeadlineExceeded naming the stockist."""
+        from stockist.deadline import Deadline, DeadlineExceeded
+
+        deadline = Deadline(0)
+
+        assert deadline.expired
+        with pytest.raises(DeadlineExceeded, match="Game UK"):
+            deadline.check("Game UK")
+
+
+class TestValidatorCache:
+    """Test the persisted ETag/Last-Modified cache."""
+
+    def test_store_and_lookup_persist_across_instances(self, tmp_path):
+        """Test entries written by one cache are read back by another."""
+        from stockist.httpcache import CacheEntry, ValidatorCache
+
+        ValidatorCache(tmp_path).store(
+            {
+                "https://a.com?x=1": CacheEntry(
+                    etag='"abc"',
+                    last_modified="Wed, 01 Jan 2025 00:00:00 GMT",
+                    body=b"body",
+                )
+            }
+        )
+
+        entry = ValidatorCache(tmp_path).lookup("https://a.com?x=1")
+
+        assert entry.body == b"body"
+        assert entry.conditional_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+        assert ValidatorCache(tmp_path).lookup("https://a.com?x=2") is None
+
+    def test_lookup_without_cache_directory(self, tmp_path):
+        """Test an absent or corrupt index behaves like an empty cache."""
+        from stockist.httpcache import ValidatorCache
+
+        assert ValidatorCache(tmp_path / "missing").lookup("https://a.com") is None
+        (tmp_path / "index.json").write_text("not json")
+        assert ValidatorCache(tmp_path).lookup("https://a.com") is None
+
+
+class TestHtmlParsing:
+    """Test compiled selectors and product-grid parsing."""
+
+    def test_card_selector_matches_class_tokens_in_any_order(self):
+        """Test cards are found by class token and the rest is skipped."""
+        from stockist.parsing import CardSelector
+
+        cards = CardSelector("div", "product", "grid-tile").parse(b"""
+            <header><div class="product grid-tile">nav</div></header>
+            <div class="grid-tile product extra">A</div>
+            <div class="product">no</div>
+            <div class="product grid-tiles">no</div>
+            <span class="product grid-tile">no</span>
+            """)
+
+        assert [card.text for card in cards] == ["nav", "A"]
+
+    def test_class_prefix_matches_any_token(self):
+        """Test class_prefix mirrors the startswith lambdas it replaces."""
+        import soupsieve as sv
+        from bs4 import BeautifulSoup
+
+        from stockist.parsing import class_prefix
+
+        soup = BeautifulSoup(
+            '<span class="price_val">1</span><span class="x price_value">2</span>'
+            '<span class="xprice_val">3</span><div class="price_val">4</div>',
+            "html.parser",
+        )
+
+        matches = sv.compile(class_prefix("price_val", "span")).select(soup)
+
+        assert [m.text for m in matches] == ["1", "2"]
+
+    @patch("stockist.shopto.Shopto.scrape_stream")
+    def test_shopto_parses_multi_class_cards(self, mock_scrape_stream):
+        """Test Shopto extracts cards whose classes carry extra tokens."""
+        mock_scrape_stream.return_value = iter([b"""
+            <div class="itemlist2 featured">
+              <a class="itemlist__container js-link" href="/p/1">
+                <img src="/img/1.jpg" />
+                <div class="itemlist__description">Mario amiibo</div>
+                <div class="cross_price big">\xc2\xa314.99</div>
+                <div class="inventory low">Sold out</div>
+              </a>
+            </div>
+            <div class="itemlist2">
+              <a class="itemlist__container" href="/p/2"><img src="/i.jpg" /></a>
+            </div>
+            """])
+
+        result = Shopto(messengers=[]).get_amiibo()
+
+        assert [item.to_dict() for item in result] == [
+            {
+                "Colour": 0xFF0000,
+                "Title": "Mario amiibo",
+                "Image": "https://www.shopto.net/img/1.jpg",
+                "URL": "https://www.shopto.net/p/1",
+                "Price": "\u00a314.99",
+                "Stock": Stock.OUT_OF_STOCK.value,
+                "Website": "Shopto",
+            }
+        ]
+
+    def test_iter_parse_matches_parse_for_any_chunking(self):
+        """Test streamed cards match a whole-page parse however bytes arrive."""
+        from stockist.parsing import CardSelector
+
+        cards = CardSelector("div", "product")
+        page = (
+            '<div class="product"><p>Link &amp; Zelda<img src="1.jpg"><br/>'
+            "\u00a39</div><div>skip</div><div class='product x'><ul><li>a</ul></div>"
+        ).encode("utf-8")
+
+        expected = [str(card) for card in cards.parse(page)]
+        for size in (1, 5, len(page)):
+            chunks = [page[i : i + size] for i in range(0, len(page), size)]
+            assert [str(card) for card in cards.iter_parse(chunks)] == expected
+        assert len(expected) == 2
+
+    def test_iter_extract_yields_before_page_ends(self):
+        """Test a product is produced as soon as its card has closed."""
+        from stockist.parsing import CardSelector, Extractor, Field
+
+        extractor = Extractor(
+            cards=CardSelector("li", "card"),
+            title=Field("a"),
+            url=Field("a", attr="href"),
+            price=Field(".price"),
+            image=Field("img", attr="src"),
+        )
+
+        def chunks():
+            yield b'<ul><li class="card"><a href="/1">One</a>'
+            yield b'<span class="price">$1</span><img src="1.jpg"></li>'
+            raise AssertionError("read past the first card")
+
+        items = extractor.iter_extract(chunks(), website="Shop")
+
+        assert next(items)["Title"] == "One"
+
+    def test_extractor_fields_guards_and_stock_rules(self):
+        """Test an extractor applies index, prefix, require and stock rules."""
+        from stockist.parsing import CardSelector, Extractor, Field, StockField
+
+        extractor = Extractor(
+            cards=CardSelector("li", "card"),
+            title=Field("a", index=1),
+            url=Field("a", index=1, attr="href", prefix="https://shop"),
+            price=Field(".price"),
+            image=Field("img", attr="src"),
+            stock=StockField("button", in_stock="Add to Cart"),
+            require=(".listed",),
+            exclude=(".hidden",),
+        )
+        cards = extractor.cards.parse("""
+            <li class="card"><a href="/x"><i class="listed"></i></a><a href="/1"> One </a>
+              <span class="price">$1</span><img src="1.jpg"><button>Add to Cart</button>
+            </li>
+            <li class="card"><span class="listed"></span><a>x</a><a href="/2">Two</a>
+              <span class="price">$2</span><img src="2.jpg"><button>Sold out</button>
+            </li>
+            <li class="card"><a>x</a><a href="/3">Unlisted</a>
+              <span class="price">$3</span><img src="3.jpg"><button>Add to Cart</button>
+            </li>
+            <li class="card"><span class="listed hidden"></span><a>x</a><a href="/4">4</a>
+              <span class="price">$4</span><img src="4.jpg"><button>Add to Cart</button>
+            </li>
+            <li class="card"><span class="listed"></span><a>x</a><a>No link</a>
+              <span class="price">$5</span><img src="5.jpg"><button>Add to Cart</button>
+            </li>
+            """)
+
+        result = extractor.extract(cards, website="Shop")
+
+        assert [item.to_dict() for item in result] == [
+            {
+                "Colour": 0x00FF00,
+                "Title": "One",
+                "Image": "1.jpg",
+                "URL": "https://shop/1",
+                "Price": "$1",
+                "Stock": Stock.IN_STOCK.value,
+                "Website": "Shop",
+            },
+            {
+                "Colour": 0xFF0000,
+                "Title": "Two",
+                "Image": "2.jpg",
+                "URL": "https://shop/2",
+                "Price": "$2",
+                "Stock": Stock.OUT_OF_STOCK.value,
+                "Website": "Shop",
+            },
+        ]
+
+    def test_the_source_requires_main_link(self):
+        """Test The Source only reads cards that have a product link block."""
+        response = Mock(content=b"""
+            <div class="productListItem">
+              <div class="productMainLink"><a href="p/1"><span>Kirby</span></a></div>
+              <div class="sale-price">$19.99</div>
+              <img class="primary-image" src="img/1.jpg" />
+              <button>Add to Cart</button>
+            </div>
+            <div class="productListItem">
+              <a href="p/2"><span>Ad</span></a><div class="sale-price">$1</div>
+              <img class="primary-image" src="img/2.jpg" /><button>Add to Cart</button>
+            </div>
+            """)
+
+        result = TheSource(messengers=[])._parse_page(0, response)
+
+        assert [item["Title"] for item in result] == ["Kirby"]
+        assert result[0]["URL"] == "https://www.thesource.ca/p/1"
+        assert result[0]["Stock"] == Stock.IN_STOCK.value
+
+    def test_meccha_japan_skips_out_of_stock_cards(self):
+        """Test Meccha Japan ignores cards carrying an out-of-stock label."""
+        response = Mock(content=b"""
+            <article class="product-miniature js-product-miniature">
+              <a href="https://meccha-japan.com/1"><img src="https://m/1.jpg" /></a>
+              <h2 class="h3 product-title"><a href="#">Link</a></h2>
+              <span class="price">\xc2\xa39.99</span>
+            </article>
+            <article class="product-miniature">
+              <a href="https://meccha-japan.com/2"><img src="https://m/2.jpg" /></a>
+              <h2 class="product-title"><a href="#">Zelda</a></h2>
+              <span class="price">\xc2\xa39.99</span>
+              <div class="oos-label">Out of stock</div>
+            </article>
+            """)
+
+        result = MecchaJapan(messengers=[])._parse_page(1, response)
+
+        assert [item["Title"] for item in result] == ["Link"]
+        assert result[0]["URL"] == "https://meccha-japan.com/1"
+
 
 class TestStockistManager:
     """Test StockistManager class."""
@@ -178,6 +1006,28 @@ class TestStockistManager:
         assert "gamestop.com" in manager.relationships
         assert "nintendo.co.uk" in manager.relationships
 
+    def test_stockist_manager_sets_site_and_schedule(self):
+        """Test stockists know their config key and carry poll settings."""
+        from constants import (
+            FAST_STOCKIST_POLL_INTERVAL,
+            SLOW_STOCKIST_POLL_INTERVAL,
+            STOCKIST_POLL_INTERVAL,
+        )
+
+        messenger = Mock()
+        messenger.name = "messenger"
+        messenger.stockists = ["bestbuy.com", "gamestop.com", "nintendo.co.uk"]
+        messengers = Mock()
+        messengers.all_messengers = [messenger]
+
+        manager = StockistManager(messengers=messengers)
+        by_site = {s.site: s for s in manager.all_stockists}
+
+        assert by_site["bestbuy.com"].poll_interval == STOCKIST_POLL_INTERVAL
+        assert by_site["gamestop.com"].poll_interval == SLOW_STOCKIST_POLL_INTERVAL
+        assert by_site["nintendo.co.uk"].poll_interval == FAST_STOCKIST_POLL_INTERVAL
+        assert by_site["nintendo.co.uk"].priority > by_site["gamestop.com"].priority
+
     def test_stockist_manager_unknown_stockist(self):
         """Test StockistManager handles unknown stockist."""
         messenger = Mock()
@@ -220,6 +1070,12 @@ class TestStockistManager:
         for stockist in expected_stockists:
             assert stockist in STOCKIST_FACTORY
 
+    def test_stockist_factory_matches_config_enum(self):
+        """Test every stockist accepted by the config can be built."""
+        from config.config import Stockist as StockistName
+
+        assert {name.value for name in StockistName} == set(STOCKIST_FACTORY)
+
     def test_validate_stockists_success(self, mock_messengers):
         """Test _validate_stockists returns True when stockists exist."""
         manager = StockistManager(messengers=mock_messengers)
@@ -454,6 +1310,86 @@ class TestNintendoUKSpecific:
         if len(result) > 0:
             assert result[0]["Stock"] == Stock.OUT_OF_STOCK.value
 
+    @patch("stockist.nintendouk.NintendoUK.scrape")
+    def test_nintendo_uk_rejects_unexpected_product_shape(
+        self, mock_scrape, nintendo_uk
+    ):
+        """Test a product missing fields fails the stockist, not the listing."""
+        from pydantic import ValidationError
+
+        mock_scrape.return_value = Mock(
+            content=b'{"data": {"products": [{"name": "Test Amiibo"}]}}'
+        )
+
+        with pytest.raises(ValidationError):
+            nintendo_uk._parse_page(0, mock_scrape.return_value)
+
+
+class TestBestbuyCASpecific:
+    """Test Bestbuy CA-specific functionality."""
+
+    @patch("stockist.bestbuyca.BestbuyCA.scrape")
+    def test_bestbuyca_decodes_only_declared_fields(self, mock_scrape):
+        """Test products are read from bytes, ignoring undeclared keys."""
+        mock_scrape.return_value = Mock(content=b"""
+            {"Brand": {"x": [1, 2, 3]}, "products": [
+              {"name": " Link ", "thumbnailImage": "https://img/1.jpg ",
+               "productUrl": "/p/1", "salePrice": 20, "sku": "123",
+               "categoryIds": ["a", "b"]},
+              {"name": "Zelda", "thumbnailImage": "https://img/2.jpg",
+               "productUrl": "/p/2", "salePrice": "N/A"}
+            ]}
+            """)
+
+        result = BestbuyCA(messengers=[]).get_amiibo()
+
+        assert [(r["Title"], r["Price"]) for r in result] == [
+            ("Link", "$20.00"),
+            ("Zelda", "N/A"),
+        ]
+        assert result[0]["URL"] == "https://www.bestbuy.ca/p/1"
+        assert result[0]["Image"] == "https://img/1.jpg"
+
+    @patch("stockist.bestbuyca.BestbuyCA.scrape")
+    def test_bestbuyca_invalid_json_is_empty(self, mock_scrape):
+        """Test a body that is not JSON, or a blank response, gives no items."""
+        for content in (b"<html>", ""):
+            mock_scrape.return_value = Mock(content=content)
+
+            assert BestbuyCA(messengers=[]).get_amiibo() == []
+
+
+class TestCexUKSpecific:
+    """Test CeX UK-specific functionality."""
+
+    @patch("stockist.cexuk.CexUK.scrape")
+    def test_cexuk_paginates_each_category(self, mock_scrape):
+        """Test CeX UK stops each category at the first empty page."""
+
+        def fake_scrape(url, payload):
+            response = Mock()
+            if payload["firstRecord"] == 1:
+                box = {
+                    "boxName": payload["q"],
+                    "imageUrls": {"medium": "https://img"},
+                    "boxId": payload["categoryId"],
+                    "sellPrice": 5,
+                }
+                response.content = json.dumps(
+                    {"response": {"data": {"boxes": [box]}}}
+                ).encode()
+            else:
+                response.content = b'{"response": {"data": null}}'
+            return response
+
+        mock_scrape.side_effect = fake_scrape
+        cex = CexUK(messengers=["test_messenger"])
+
+        result = cex.get_amiibo()
+
+        assert [r["Title"] for r in result] == ["amiibo figures", "amiibo cards"]
+        assert cex.params["firstRecord"] == 1
+
 
 class TestStockistIntegration:
     """Integration tests for stockist module."""